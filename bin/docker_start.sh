@@ -13,6 +13,10 @@ uwsgi_port=${UWSGI_PORT:-8000}
 uwsgi_processes=${UWSGI_PROCESSES:-4}
 uwsgi_threads=${UWSGI_THREADS:-1}
 
+# "wsgi" (uwsgi) or "asgi" (uvicorn)
+server_mode=${SERVER_MODE:-wsgi}
+asgi_workers=${ASGI_WORKERS:-1}
+
 mountpoint=${SUBPATH:-/}
 
 until pg_isready; do
@@ -27,6 +31,20 @@ done
 python src/manage.py migrate
 
 # Start server
+if [ "$server_mode" = "asgi" ]; then
+    # The static and media files are served by the application (see sdg.asgi).
+    >&2 echo "Starting ASGI server"
+    exec uvicorn sdg.asgi:application \
+        --app-dir src \
+        --host 0.0.0.0 \
+        --port $uwsgi_port \
+        --workers $asgi_workers \
+        --root-path "${mountpoint%/}" \
+        --proxy-headers \
+        --forwarded-allow-ips "*" \
+        --no-server-header
+fi
+
 >&2 echo "Starting server"
 exec uwsgi \
     --http :$uwsgi_port \
@@ -0,0 +1,220 @@
+#!/usr/bin/env python
+"""
+Load test the read-only API, to compare the WSGI and ASGI deployment modes.
+
+Runs a number of clients that request the given URLs as fast as possible, next
+to a number of slow clients that read their responses at a limited rate, like
+the crawlers of the national portals. Reports the throughput, the latencies of
+the fast clients and (with ``--server-pid``) the memory of the server.
+
+Only uses the standard library, so it runs outside of the project environment.
+
+Example, with the server started by ``bin/docker_start.sh``::
+
+    python bin/load_test.py \\
+        --url http://localhost:8000/api/v1/producten \\
+        --url http://localhost:8000/api/v1/catalogi \\
+        --header "Authorization: Token <token>" \\
+        --clients 16 --slow-clients 8 --duration 30 --server-pid <pid>
+
+Anonymous requests are throttled, so use an API token.
+"""
+
+import argparse
+import asyncio
+import os
+import socket
+import statistics
+import time
+from urllib.parse import urlsplit
+
+
+class Client:
+    """
+    An HTTP/1.1 client with a single keep-alive connection to the server.
+    """
+
+    def __init__(self, host, port, headers, read_rate=None):
+        self.host = host
+        self.port = port
+        self.headers = headers
+        self.read_rate = read_rate
+        self.reader = self.writer = None
+
+    async def connect(self):
+        sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        if self.read_rate:
+            # A small receive buffer, so the server cannot send the response
+            # much faster than it is read.
+            sock.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, 4096)
+        sock.setblocking(False)
+        await asyncio.get_running_loop().sock_connect(sock, (self.host, self.port))
+        self.reader, self.writer = await asyncio.open_connection(sock=sock)
+
+    async def request(self, path: str) -> int:
+        reused = self.writer is not None
+        if not reused:
+            await self.connect()
+
+        lines = [
+            f"GET {path} HTTP/1.1",
+            f"Host: {self.host}:{self.port}",
+            "Accept: application/json",
+            *self.headers,
+        ]
+        self.writer.write(("\r\n".join(lines) + "\r\n\r\n").encode())
+        await self.writer.drain()
+
+        status_line = await self.reader.readline()
+        if not status_line and reused:
+            # The server closed the idle connection.
+            self.close()
+            return await self.request(path)
+        status = int(status_line.split()[1])
+
+        headers = {}
+        while line := (await self.reader.readline()).strip():
+            name, _, value = line.decode("latin-1").partition(":")
+            headers[name.strip().lower()] = value.strip()
+
+        if headers.get("transfer-encoding") == "chunked":
+            while size := int((await self.reader.readline()).strip(), 16):
+                await self.read(size)
+                await self.reader.readline()
+            await self.reader.readline()
+        else:
+            await self.read(int(headers.get("content-length", 0)))
+
+        if headers.get("connection") == "close":
+            self.close()
+        return status
+
+    async def read(self, size: int):
+        if not self.read_rate:
+            await self.reader.readexactly(size)
+            return
+
+        # Read a tenth of the rate, ten times per second.
+        chunk = max(1, self.read_rate // 10)
+        while size > 0:
+            size -= len(await self.reader.readexactly(min(chunk, size)))
+            await asyncio.sleep(0.1)
+
+    def close(self):
+        if self.writer is not None:
+            self.writer.close()
+            self.reader = self.writer = None
+
+
+async def run_client(urls, headers, index, deadline, results, read_rate=None):
+    url = urlsplit(urls[0])
+    client = Client(url.hostname, url.port or 80, headers, read_rate)
+    paths = [
+        url.path + (f"?{url.query}" if url.query else "") for url in map(urlsplit, urls)
+    ]
+
+    request_count = index
+    while time.monotonic() < deadline:
+        path = paths[request_count % len(paths)]
+        request_count += 1
+
+        start = time.monotonic()
+        try:
+            status = await client.request(path)
+        except (OSError, ValueError, IndexError, asyncio.IncompleteReadError):
+            client.close()
+            results["errors"] += 1
+            continue
+
+        if status != 200:
+            results["errors"] += 1
+        elif read_rate is None:
+            results["latencies"].append(time.monotonic() - start)
+        else:
+            results["slow"] += 1
+
+    client.close()
+
+
+def get_rss(pid: int) -> int:
+    """
+    :returns: The resident memory (in kB) of the process and its descendants.
+    """
+    children = []
+    for task in os.listdir(f"/proc/{pid}/task"):
+        with open(f"/proc/{pid}/task/{task}/children") as f:
+            children.extend(int(child) for child in f.read().split())
+
+    with open(f"/proc/{pid}/status") as f:
+        rss = next(int(line.split()[1]) for line in f if line.startswith("VmRSS:"))
+    return rss + sum(get_rss(child) for child in children)
+
+
+async def main(options):
+    results = {"latencies": [], "errors": 0, "slow": 0}
+    deadline = time.monotonic() + options.duration
+
+    clients = [
+        run_client(options.url, options.header, index, deadline, results)
+        for index in range(options.clients)
+    ] + [
+        run_client(
+            options.url, options.header, index, deadline, results, options.read_rate
+        )
+        for index in range(options.slow_clients)
+    ]
+    start = time.monotonic()
+    await asyncio.gather(*clients)
+    elapsed = time.monotonic() - start
+
+    latencies = sorted(results["latencies"])
+    print(f"duration:    {elapsed:.1f} s")
+    print(f"requests:    {len(latencies)} ({len(latencies) / elapsed:.1f}/s)")
+    print(f"slow:        {results['slow']}")
+    print(f"errors:      {results['errors']}")
+    if latencies:
+        quantiles = statistics.quantiles(latencies, n=100)
+        print(
+            f"latency:     p50 {quantiles[49] * 1000:.0f} ms, "
+            f"p95 {quantiles[94] * 1000:.0f} ms, "
+            f"p99 {quantiles[98] * 1000:.0f} ms"
+        )
+    if options.server_pid:
+        print(f"server RSS:  {get_rss(options.server_pid) / 1024:.0f} MB")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument(
+        "--url",
+        action="append",
+        required=True,
+        help="A URL to request, all on the same server.",
+    )
+    parser.add_argument(
+        "--header",
+        action="append",
+        default=[],
+        help="A header to send, for example an API token.",
+    )
+    parser.add_argument(
+        "--clients", type=int, default=16, help="The number of fast clients."
+    )
+    parser.add_argument(
+        "--slow-clients", type=int, default=0, help="The number of slow clients."
+    )
+    parser.add_argument(
+        "--read-rate",
+        type=int,
+        default=8192,
+        help="The number of bytes per second read by the slow clients.",
+    )
+    parser.add_argument(
+        "--duration", type=int, default=30, help="The duration in seconds."
+    )
+    parser.add_argument(
+        "--server-pid",
+        type=int,
+        help="The pid of the server, to report its memory (Linux only).",
+    )
+    asyncio.run(main(parser.parse_args()))
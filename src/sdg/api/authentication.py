@@ -11,20 +11,20 @@ class TokenAuthentication(_TokenAuthentication):
         """Authenticate credentials without user checking."""
         from django.contrib.auth.models import AnonymousUser
 
-        from sdg.api.models import Token
+        from sdg.api.tokens import get_token
 
         anon = AnonymousUser()
 
         if key:
-            try:
-                token = Token.objects.get(key=key)
-                # Authenticated token
-                return anon, token
-            except Token.DoesNotExist:
+            token = get_token(key)
+            if token is None:
                 # Invalid token
                 raise exceptions.AuthenticationFailed(
                     _("Ongeldig token. Controleer uw token en probeer het opnieuw.")
                 )
 
+            # Authenticated token
+            return anon, token
+
         # Anonymous usage
         return anon, None
@@ -0,0 +1,250 @@
+from django.db import transaction
+from django.utils.timezone import now
+
+from rest_framework import serializers
+from rest_framework.reverse import reverse
+
+from sdg.api.cache import bump_response_cache_generation, invalidate_product_documents
+from sdg.api.lookups import PrefetchedProductLookups
+from sdg.api.serializers import ProductSerializer
+from sdg.core.models.catalogus import ProductenCatalogus
+from sdg.producten.models import LocalizedProduct, Product, ProductVersie
+
+
+class ProductBatch:
+    """
+    Save a batch of product payloads, as accepted by ``ProductSerializer``.
+
+    All payloads are validated first. The referenced objects of the valid
+    payloads are then retrieved with a fixed number of queries and all changes
+    are saved with bulk queries, in a single transaction. A payload that is
+    invalid does not prevent the other payloads from being saved.
+    """
+
+    def __init__(self, payloads: list, context: dict, organisaties):
+        """
+        :param organisaties: The primary keys of the organizations of which the
+            products can be changed.
+        """
+        self.payloads = payloads
+        self.context = {**context, "lookups": None}
+        self.organisaties = set(organisaties)
+        self.errors = {}
+
+    def get_serializers(self) -> dict:
+        """
+        :returns: The serializers of the valid payloads, by their index.
+        """
+        valid = {}
+        for index, payload in enumerate(self.payloads):
+            if not isinstance(payload, dict):
+                self.errors[index] = {
+                    "non_field_errors": ["Ieder product dient een object te zijn."]
+                }
+                continue
+
+            serializer = ProductSerializer(data=payload, context=self.context)
+            if serializer.is_valid():
+                valid[index] = serializer
+            else:
+                self.errors[index] = serializer.errors
+
+        return valid
+
+    def get_lookups(self, valid) -> PrefetchedProductLookups:
+        owms_identifiers, catalogi, upn_uris = set(), set(), set()
+        locatie_uuids, locatie_namen = set(), set()
+
+        for serializer in valid:
+            data = serializer.validated_data
+
+            organisatie = serializer.initial_data.get("verantwoordelijke_organisatie")
+            if isinstance(organisatie, dict) and organisatie.get("owms_identifier"):
+                owms_identifiers.add(organisatie["owms_identifier"])
+
+            if isinstance(data.get("catalogus"), ProductenCatalogus):
+                catalogi.add(data["catalogus"])
+
+            upn_uris.add(data["generiek_product"].get("upn_uri"))
+            if data.get("product_valt_onder"):
+                upn_uris.add(
+                    data["product_valt_onder"]
+                    .get("generiek_product", {})
+                    .get("upn_uri")
+                )
+
+            for locatie in data.get("locaties") or []:
+                if "uuid" in locatie:
+                    locatie_uuids.add(locatie["uuid"])
+                if "naam" in locatie:
+                    locatie_namen.add(locatie["naam"])
+
+        return PrefetchedProductLookups(
+            owms_identifiers=owms_identifiers,
+            catalogi=catalogi,
+            upn_uris=upn_uris - {None},
+            locatie_uuids=locatie_uuids,
+            locatie_namen=locatie_namen,
+        )
+
+    def get_changes(self, valid: dict) -> dict:
+        """
+        :returns: The changes of the payloads that can be saved, by their index.
+        """
+        lookups = self.context["lookups"] = self.get_lookups(valid.values())
+
+        changes = {}
+        products = set()
+        for index, serializer in valid.items():
+            organisatie = serializer.initial_data.get("verantwoordelijke_organisatie")
+            lokale_overheid = (
+                lookups.get_lokale_overheid(organisatie.get("owms_identifier"))
+                if isinstance(organisatie, dict)
+                else None
+            )
+            if (
+                lokale_overheid
+                and lokale_overheid.organisatie_id not in self.organisaties
+            ):
+                self.errors[index] = {
+                    "verantwoordelijke_organisatie": [
+                        "U heeft geen rechten om producten van deze organisatie te wijzigen."
+                    ]
+                }
+                continue
+
+            try:
+                product_changes = serializer.get_changes(serializer.validated_data)
+            except serializers.ValidationError as exc:
+                self.errors[index] = exc.detail
+                continue
+
+            if product_changes.product.pk in products:
+                self.errors[index] = {
+                    "non_field_errors": [
+                        "Dit product komt meerdere keren voor in de lijst."
+                    ]
+                }
+                continue
+
+            products.add(product_changes.product.pk)
+            changes[index] = product_changes
+
+        return changes
+
+    @transaction.atomic
+    def save_changes(self, changes: list) -> None:
+        timestamp = now()
+
+        products = [product_changes.product for product_changes in changes]
+        for product in products:
+            product.gewijzigd_op = timestamp
+        Product.objects.bulk_update(
+            products,
+            [
+                "product_valt_onder",
+                "product_aanwezig",
+                "bevoegde_organisatie",
+                "gewijzigd_op",
+            ],
+        )
+
+        ProductLocatie = Product.locaties.through
+        ProductLocatie.objects.filter(product__in=products).delete()
+        ProductLocatie.objects.bulk_create(
+            [
+                ProductLocatie(product=product_changes.product, lokatie=locatie)
+                for product_changes in changes
+                for locatie in product_changes.locaties
+            ],
+            ignore_conflicts=True,
+        )
+
+        new_versions = [c for c in changes if c.creates_version]
+        existing_versions = [c for c in changes if not c.creates_version]
+
+        ProductVersie.objects.bulk_create(
+            [product_changes.product_versie for product_changes in new_versions]
+        )
+        for product_changes in existing_versions:
+            product_changes.product_versie.gewijzigd_op = timestamp
+        ProductVersie.objects.bulk_update(
+            [product_changes.product_versie for product_changes in existing_versions],
+            ["publicatie_datum", "gewijzigd_op"],
+        )
+
+        new_translations = []
+        for product_changes in new_versions:
+            for translation in product_changes.vertalingen:
+                localized_product = LocalizedProduct(
+                    **translation, product_versie=product_changes.product_versie
+                )
+                # See `LocalizedProduct.save`.
+                if product_changes.product.product_aanwezig is not False:
+                    localized_product.product_aanwezig_toelichting = ""
+                new_translations.append(localized_product)
+        LocalizedProduct.objects.bulk_create(new_translations)
+
+        updated_translations, updated_fields = [], set()
+        for product_changes in existing_versions:
+            localized_products = {
+                localized_product.taal: localized_product
+                for localized_product in product_changes.product_versie.vertalingen.all()
+            }
+            for translation in product_changes.vertalingen:
+                localized_product = localized_products.get(translation["taal"])
+                if localized_product is None:
+                    continue
+
+                for name, value in translation.items():
+                    setattr(localized_product, name, value)
+                updated_fields.update(translation)
+                updated_translations.append(localized_product)
+        if updated_translations:
+            LocalizedProduct.objects.bulk_update(
+                updated_translations, sorted(updated_fields)
+            )
+
+        # The bulk operations do not send signals, see ``sdg.api.signals``.
+        pks = [product.pk for product in products]
+        transaction.on_commit(lambda: invalidate_product_documents(pks))
+        transaction.on_commit(bump_response_cache_generation)
+
+    def save(self) -> list:
+        """
+        :returns: The result of each payload, in the same order: the saved
+            product or the errors of the payload.
+        """
+        changes = self.get_changes(self.get_serializers())
+        if changes:
+            self.save_changes(list(changes.values()))
+
+        request = self.context["request"]
+        results = []
+        for index in range(len(self.payloads)):
+            if index in changes:
+                product_changes = changes[index]
+                product = product_changes.product
+                results.append(
+                    {
+                        "url": reverse(
+                            "api:product-detail",
+                            kwargs={"uuid": product.uuid},
+                            request=request,
+                        ),
+                        "uuid": product.uuid,
+                        "versie": product_changes.product_versie.versie,
+                        "fouten": None,
+                    }
+                )
+            else:
+                results.append(
+                    {
+                        "url": None,
+                        "uuid": None,
+                        "versie": None,
+                        "fouten": self.errors[index],
+                    }
+                )
+
+        return results
@@ -0,0 +1,211 @@
+import datetime
+import hashlib
+import json
+import logging
+import time
+import uuid
+from urllib.parse import urlencode
+
+from django.conf import settings
+from django.core.cache import caches
+
+from rest_framework.utils.encoders import JSONEncoder
+
+logger = logging.getLogger(__name__)
+
+PRODUCT_TOKEN_KEY = "sdg:api:product-token:{pk}"
+PRODUCT_DOCUMENT_KEY = "sdg:api:product:{pk}:{token}:{variant}"
+PRODUCT_CACHE_HITS_KEY = "sdg:api:product-cache:hits"
+PRODUCT_CACHE_MISSES_KEY = "sdg:api:product-cache:misses"
+RESPONSE_KEY = "sdg:api:response:{generation}:{digest}"
+RESPONSE_CACHE_GENERATION_KEY = "sdg:api:response-cache:generation"
+
+
+def get_product_cache():
+    return caches[settings.SDG_API_PRODUCT_CACHE_ALIAS]
+
+
+def get_product_document_variant(request, version_property_name: str) -> str:
+    """
+    Return the variant of a product document for the given request.
+
+    A rendered product depends on the version that is shown, the language
+    filter and the host that is used to build the hyperlinks. The active
+    version can change at midnight without any object being saved, so the
+    current date is part of the variant as well.
+    """
+    parts = [
+        version_property_name,
+        request.query_params.get("taal") or "",
+        request.build_absolute_uri("/"),
+    ]
+    if version_property_name == "active_version":
+        parts.append(datetime.date.today().isoformat())
+
+    return "|".join(parts)
+
+
+class ProductDocumentCache:
+    """
+    Cache of the rendered ``ProductSerializer`` documents.
+
+    Each variant of a product is stored under its own key, which contains the
+    current token of the product. Invalidating a product deletes its token, so
+    every variant of the product is invalidated at once. A document that was
+    rendered before the invalidation is stored under the old token, which is
+    never read again.
+    """
+
+    def __init__(self, variant: str):
+        self.variant = hashlib.md5(variant.encode()).hexdigest()
+        self.cache = get_product_cache()
+        self._tokens = {}
+
+    @staticmethod
+    def make_key(pk) -> str:
+        return PRODUCT_TOKEN_KEY.format(pk=pk)
+
+    def make_document_key(self, pk, token: str) -> str:
+        return PRODUCT_DOCUMENT_KEY.format(pk=pk, token=token, variant=self.variant)
+
+    def get_tokens(self, pks) -> tuple[dict, dict]:
+        """
+        :returns: The current tokens of the products, and the new tokens of
+            the products without a token.
+        """
+        keys = {self.make_key(pk): pk for pk in pks}
+        tokens = {keys[key]: token for key, token in self.cache.get_many(keys).items()}
+
+        # A concurrent request may replace a new token with its own, the
+        # documents stored under the replaced token are then never used.
+        new_tokens = {pk: uuid.uuid4().hex for pk in keys.values() if pk not in tokens}
+        if new_tokens:
+            self.cache.set_many(
+                {self.make_key(pk): token for pk, token in new_tokens.items()},
+                timeout=settings.SDG_API_PRODUCT_CACHE_TIMEOUT,
+            )
+        return tokens, new_tokens
+
+    def get_many(self, pks) -> dict:
+        """
+        :returns: A mapping of product pk to the cached document, only
+            containing the products that are present in the cache.
+        """
+        pks = set(pks)
+        tokens, new_tokens = self.get_tokens(pks)
+        self._tokens = {**tokens, **new_tokens}
+
+        # There are no documents for the new tokens.
+        keys = {self.make_document_key(pk, token): pk for pk, token in tokens.items()}
+        documents = {
+            keys[key]: document for key, document in self.cache.get_many(keys).items()
+        }
+        record_product_cache_statistics(
+            hits=len(documents), misses=len(pks) - len(documents)
+        )
+        return documents
+
+    def set_many(self, documents: dict):
+        """
+        Store the ``documents``, rendered after ``get_many`` of their products.
+        """
+        # Store the plain JSON data, pickling the hyperlinks of a document
+        # queries the name of every linked product.
+        self.cache.set_many(
+            {
+                self.make_document_key(pk, self._tokens[pk]): json.loads(
+                    json.dumps(document, cls=JSONEncoder)
+                )
+                for pk, document in documents.items()
+                if pk in self._tokens
+            },
+            timeout=settings.SDG_API_PRODUCT_CACHE_TIMEOUT,
+        )
+
+
+def invalidate_product_documents(pks):
+    keys = [ProductDocumentCache.make_key(pk) for pk in set(pks)]
+    if keys:
+        logger.debug("Invalidating %d cached product documents", len(keys))
+        get_product_cache().delete_many(keys)
+
+
+def record_product_cache_statistics(hits: int = 0, misses: int = 0):
+    cache = get_product_cache()
+
+    for key, value in (
+        (PRODUCT_CACHE_HITS_KEY, hits),
+        (PRODUCT_CACHE_MISSES_KEY, misses),
+    ):
+        if not value:
+            continue
+        cache.add(key, 0, timeout=None)
+        try:
+            cache.incr(key, value)
+        except ValueError:
+            # The counter was evicted between ``add`` and ``incr``.
+            cache.set(key, value, timeout=None)
+
+
+def get_product_cache_statistics() -> dict:
+    counters = get_product_cache().get_many(
+        [PRODUCT_CACHE_HITS_KEY, PRODUCT_CACHE_MISSES_KEY]
+    )
+    hits = counters.get(PRODUCT_CACHE_HITS_KEY, 0)
+    misses = counters.get(PRODUCT_CACHE_MISSES_KEY, 0)
+    total = hits + misses
+
+    return {
+        "hits": hits,
+        "misses": misses,
+        "hit_ratio": hits / total if total else 0.0,
+    }
+
+
+def get_response_cache():
+    return caches[settings.SDG_API_RESPONSE_CACHE_ALIAS]
+
+
+def get_response_cache_generation() -> int:
+    """
+    Return the current generation of the cached responses.
+
+    The generation is part of the key of every cached response, bumping it
+    invalidates all cached responses at once.
+    """
+    cache = get_response_cache()
+    cache.add(RESPONSE_CACHE_GENERATION_KEY, 1, timeout=None)
+    return cache.get(RESPONSE_CACHE_GENERATION_KEY) or 1
+
+
+def bump_response_cache_generation():
+    cache = get_response_cache()
+    cache.add(RESPONSE_CACHE_GENERATION_KEY, 1, timeout=None)
+    try:
+        cache.incr(RESPONSE_CACHE_GENERATION_KEY)
+    except ValueError:
+        # The generation was evicted between ``add`` and ``incr``, any
+        # new value will do as long as it differs from the previous one.
+        cache.set(RESPONSE_CACHE_GENERATION_KEY, time.time_ns(), timeout=None)
+
+
+def make_response_cache_key(request, generation: int) -> str:
+    """
+    Return the key of the cached response to an (anonymous) request.
+
+    The query string is normalized, so the order of the parameters does not
+    matter. The host is included because the responses contain absolute URLs,
+    and the date because the active versions change at midnight.
+    """
+    query = urlencode(
+        sorted((key, value) for key, values in request.GET.lists() for value in values)
+    )
+    variant = "|".join(
+        [
+            request.build_absolute_uri(request.path),
+            query,
+            datetime.date.today().isoformat(),
+        ]
+    )
+    digest = hashlib.sha256(variant.encode()).hexdigest()
+    return RESPONSE_KEY.format(generation=generation, digest=digest)
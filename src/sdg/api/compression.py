@@ -0,0 +1,103 @@
+import gzip
+
+import brotli
+
+# The encodings of the precompressed responses, in order of preference.
+BROTLI = "br"
+GZIP = "gzip"
+ENCODINGS = (BROTLI, GZIP)
+
+# Smaller responses are not worth the overhead of compression.
+MIN_COMPRESS_SIZE = 1024
+
+ENCODING_ALIASES = {"x-gzip": GZIP}
+
+# The responses are compressed in the request that caches them, so moderate
+# levels are used. The highest levels compress only a few percent better, at
+# many times the cost.
+BROTLI_QUALITY = 5
+GZIP_COMPRESSLEVEL = 6
+
+
+def compress(content: bytes) -> dict:
+    """
+    Compress the ``content`` with every supported encoding.
+
+    :returns: A mapping of encoding to the compressed content, only containing
+        the encodings that make the content smaller.
+    """
+    if len(content) < MIN_COMPRESS_SIZE:
+        return {}
+
+    encodings = {
+        BROTLI: brotli.compress(content, mode=brotli.MODE_TEXT, quality=BROTLI_QUALITY),
+        GZIP: gzip.compress(content, compresslevel=GZIP_COMPRESSLEVEL, mtime=0),
+    }
+    return {
+        encoding: compressed
+        for encoding, compressed in encodings.items()
+        if len(compressed) < len(content)
+    }
+
+
+def parse_accept_encoding(header: str) -> dict:
+    """
+    :returns: A mapping of the content codings in an ``Accept-Encoding``
+        header to their quality value.
+    """
+    qvalues = {}
+    for item in header.split(","):
+        coding, *params = item.split(";")
+        coding = coding.strip().lower()
+        if not coding:
+            continue
+
+        qvalue = 1.0
+        for param in params:
+            name, _, value = param.partition("=")
+            if name.strip().lower() == "q":
+                try:
+                    qvalue = min(max(float(value), 0.0), 1.0)
+                except ValueError:
+                    qvalue = 0.0
+
+        qvalues[ENCODING_ALIASES.get(coding, coding)] = qvalue
+    return qvalues
+
+
+def negotiate_encoding(header: str, encodings) -> str | None:
+    """
+    Return the encoding of the response to a request with the ``Accept-Encoding``
+    ``header``, from the available ``encodings`` in order of preference.
+
+    An encoding that is not mentioned is only acceptable through ``*``, and an
+    encoding with a quality value of 0 is never acceptable. The uncompressed
+    content (``identity``) is always acceptable, and only preferred if it has a
+    higher quality value than the ``encodings``.
+
+    :returns: The encoding, or ``None`` for the uncompressed content.
+    """
+    qvalues = parse_accept_encoding(header or "")
+    wildcard = qvalues.get("*", 0.0)
+
+    best, best_qvalue = None, 0.0
+    for encoding in encodings:
+        qvalue = qvalues.get(encoding, wildcard)
+        if qvalue > best_qvalue:
+            best, best_qvalue = encoding, qvalue
+
+    if qvalues.get("identity", 0.0) > best_qvalue:
+        return None
+    return best
+
+
+def set_content_encoding(response, encoding: str):
+    """
+    Mark the ``response`` as encoded, like ``GZipMiddleware`` does.
+    """
+    response.headers["Content-Encoding"] = encoding
+    # The encoded content differs from the uncompressed content, so a strong
+    # ETag would be incorrect.
+    etag = response.get("ETag")
+    if etag and etag.startswith('"'):
+        response.headers["ETag"] = f"W/{etag}"
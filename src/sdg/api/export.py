@@ -0,0 +1,35 @@
+from itertools import islice
+
+from sdg.api.renderers import CamelCaseORJSONRenderer
+
+EXPORT_CHUNK_SIZE = 500
+
+
+def _chunked(iterable, size: int):
+    iterator = iter(iterable)
+    while chunk := list(islice(iterator, size)):
+        yield chunk
+
+
+def iter_product_export(view, queryset, chunk_size: int = EXPORT_CHUNK_SIZE):
+    """
+    Yield all products in the ``queryset`` as NDJSON, one line per product.
+
+    The primary keys are read with a server-side cursor. The products are
+    retrieved and rendered (like the API does) per chunk, so the memory usage
+    does not depend on the number of products.
+
+    :param view: The ``ProductViewSet`` that renders the products.
+    """
+    renderer = CamelCaseORJSONRenderer()
+    pks = (
+        queryset.select_related(None)
+        .prefetch_related(None)
+        .order_by("pk")
+        .values_list("pk", flat=True)
+        .iterator(chunk_size=chunk_size)
+    )
+
+    for chunk in _chunked(pks, chunk_size):
+        for document in view.get_representations(queryset, chunk):
+            yield renderer.render(document) + b"\n"
@@ -1,5 +1,4 @@
-from django.db import models
-from django.db.models import Q, Value
+from django.db.models import Q
 from django.utils.translation import gettext_lazy as _
 
 from django_filters.rest_framework import FilterSet, filters
@@ -9,7 +8,7 @@ from sdg.api.filters import ProductAanwezigChoices
 from sdg.core.constants import DoelgroepChoices, TaalChoices
 from sdg.core.models import ProductenCatalogus
 from sdg.organisaties.models import LokaleOverheid, Lokatie as Locatie
-from sdg.producten.models import GeneriekProduct, Product
+from sdg.producten.models import GeneriekProduct, Product, ProductVersie
 
 
 class ProductenCatalogusFilterSet(FilterSet):
@@ -94,6 +93,12 @@ class ProductFilterSet(FilterSet):
             "Toont producten die bij de opgegeven organisatie OWMS pref label horen."
         ),
     )
+    zoek = filters.CharFilter(
+        method="filter_zoek",
+        help_text=_(
+            "Toont producten waarvan de teksten de opgegeven zoektermen bevatten."
+        ),
+    )
 
     def filter_product_aanwezig(self, queryset, name, value):
         """:returns: filtered queryset based on `product_aanwezig`'s boolean value."""
@@ -110,16 +115,33 @@ class ProductFilterSet(FilterSet):
         return queryset.filter(versies__publicatie_datum=value)
 
     def filter_taal(self, queryset, name, value):
-        """:returns: all products for this queryset, annotate the filter value for the inner serializer."""
-        return queryset.annotate(
-            _filter_taal=Value(value, output_field=models.CharField())
-        )
+        """
+        :returns: all products for this queryset, only the translations in the
+            given language are prefetched by the view.
+        """
+        return queryset
 
     def filter_upn(self, queryset, name, value):
         """:returns: filtered upn for the given product's UPN."""
         parameter = camel_to_underscore(name)
         return queryset.all().filter(**{f"generiek_product__upn__{parameter}": value})
 
+    def filter_zoek(self, queryset, name, value):
+        """
+        :returns: the products of which the texts of the returned version
+            match the search query, in the language of the `taal` filter (if
+            given).
+        """
+        taal = self.form.cleaned_data.get("taal") or None
+
+        # Only search the texts of the version that is returned.
+        auth = getattr(self.request, "auth", None)
+        if auth and auth.api_default_most_recent:
+            versies = ProductVersie.objects.most_recent()
+        else:
+            versies = ProductVersie.objects.active()
+        return queryset.search(value, taal=taal, versies=versies)
+
     def filter_doelgroep(self, queryset, name, value):
         """:returns: filtered doelgroep for the given product's generic product."""
         return queryset.all().filter(**{f"generiek_product__{name}": value})
@@ -149,6 +171,26 @@ class ProductFilterSet(FilterSet):
         return new_filters
 
 
+class ProductWijzigingFilterSet(FilterSet):
+    """Filter for the changes of products. Requires the moment to start from."""
+
+    sinds = filters.IsoDateTimeFilter(
+        method="filter_sinds",
+        required=True,
+        help_text=_(
+            "Toont producten die na het opgegeven tijdstip (ISO 8601) gewijzigd zijn."
+        ),
+    )
+
+    def filter_sinds(self, queryset, name, value):
+        """:returns: products changed after the given moment, annotated with the change."""
+        return queryset.changed_since(value)
+
+    class Meta:
+        model = Product
+        fields = ("sinds",)
+
+
 class LocatieFilterSet(FilterSet):
     """Filter for locations. Allows filtering by municipality."""
 
@@ -0,0 +1,166 @@
+from django.conf import settings
+from django.db import IntegrityError, transaction
+from django.utils.timezone import now
+
+from rest_framework import serializers
+
+from sdg.api.cache import bump_response_cache_generation, invalidate_product_documents
+from sdg.api.serializers import LocatieSyncSerializer
+from sdg.organisaties.models import Lokatie as Locatie
+from sdg.producten.models import Product
+
+
+class LocatieSync:
+    """
+    Synchronise the locations of an organization with a list of location
+    payloads, as accepted by ``LocatieSyncSerializer``.
+
+    A payload matches the existing location with its ``uuid``, or otherwise the
+    existing location with the same name. The matched locations that differ
+    from their payload are updated and the other payloads are created. If the
+    locations are replaced, the existing locations without a payload are
+    deleted. Nothing is saved unless all payloads are valid, and all changes
+    are saved with bulk queries in a single transaction.
+    """
+
+    def __init__(self, lokale_overheid, payloads, context: dict, replace=True):
+        self.lokale_overheid = lokale_overheid
+        self.payloads = payloads
+        self.context = context
+        self.replace = replace
+
+        self.created, self.updated, self.unchanged, self.deleted = [], [], [], []
+        self.updated_fields = set()
+
+    def validate(self) -> list:
+        serializer = LocatieSyncSerializer(
+            data=self.payloads,
+            many=True,
+            max_length=settings.SDG_API_LOCATIE_SYNC_MAX_SIZE,
+            context=self.context,
+        )
+        if not serializer.is_valid():
+            errors = serializer.errors
+            # The errors of the payloads are a list, by index.
+            if isinstance(errors, list):
+                errors = {"locaties": errors}
+            raise serializers.ValidationError(errors)
+
+        return serializer.validated_data
+
+    def get_changes(self, items: list) -> None:
+        """
+        Determine the locations to create, update and delete.
+        """
+        existing = {
+            locatie.uuid: locatie
+            for locatie in Locatie.objects.filter(lokale_overheid=self.lokale_overheid)
+        }
+        by_naam = {locatie.naam: locatie for locatie in existing.values()}
+
+        matched, namen = set(), set()
+        errors = [{} for _ in items]
+        for index, data in enumerate(items):
+            if "uuid" in data:
+                locatie = existing.get(data["uuid"])
+                if locatie is None:
+                    errors[index] = {
+                        "uuid": [
+                            "Er bestaat geen locatie met deze UUID voor deze organisatie."
+                        ]
+                    }
+                    continue
+            else:
+                locatie = by_naam.get(data["naam"])
+
+            if data["naam"] in namen or (locatie and locatie.uuid in matched):
+                errors[index] = {
+                    "non_field_errors": [
+                        "Deze locatie komt meerdere keren voor in de lijst."
+                    ]
+                }
+                continue
+            namen.add(data["naam"])
+
+            if locatie is None:
+                self.created.append(
+                    Locatie(lokale_overheid=self.lokale_overheid, **data)
+                )
+                continue
+
+            matched.add(locatie.uuid)
+            changed = [
+                name
+                for name, value in data.items()
+                if name != "uuid" and getattr(locatie, name) != value
+            ]
+            for name in changed:
+                setattr(locatie, name, data[name])
+
+            if changed:
+                self.updated_fields.update(changed)
+                self.updated.append(locatie)
+            else:
+                self.unchanged.append(locatie)
+
+        if any(errors):
+            raise serializers.ValidationError({"locaties": errors})
+
+        if self.replace:
+            self.deleted = [
+                locatie for uuid, locatie in existing.items() if uuid not in matched
+            ]
+
+    @transaction.atomic
+    def save_changes(self) -> None:
+        # The locations are deleted first, so their names can be reused.
+        if self.deleted:
+            Locatie.objects.filter(
+                pk__in=[locatie.pk for locatie in self.deleted]
+            ).delete()
+
+        if self.updated:
+            timestamp = now()
+            for locatie in self.updated:
+                locatie.gewijzigd_op = timestamp
+            Locatie.objects.bulk_update(
+                self.updated, [*sorted(self.updated_fields), "gewijzigd_op"]
+            )
+
+            # The bulk update does not send signals, see ``sdg.api.signals``.
+            pks = list(
+                Product.objects.filter(locaties__in=self.updated)
+                .values_list("pk", flat=True)
+                .distinct()
+            )
+            transaction.on_commit(lambda: invalidate_product_documents(pks))
+
+        Locatie.objects.bulk_create(self.created)
+
+        if self.created or self.updated:
+            transaction.on_commit(bump_response_cache_generation)
+
+    def save(self) -> dict:
+        """
+        :returns: The UUIDs of the created, updated, unchanged and deleted
+            locations.
+        """
+        self.get_changes(self.validate())
+
+        try:
+            self.save_changes()
+        except IntegrityError:
+            raise serializers.ValidationError(
+                {
+                    "non_field_errors": [
+                        "Er bestaat al een andere locatie met dezelfde naam voor deze organisatie."
+                    ]
+                }
+            )
+
+        return {
+            "aangemaakt": [locatie.uuid for locatie in self.created],
+            "bijgewerkt": [locatie.uuid for locatie in self.updated],
+            "ongewijzigd": [locatie.uuid for locatie in self.unchanged],
+            "verwijderd": [locatie.uuid for locatie in self.deleted],
+        }
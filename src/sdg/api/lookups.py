@@ -0,0 +1,204 @@
+from collections import defaultdict
+
+from django.db.models import Q
+
+from sdg.core.models.catalogus import ProductenCatalogus
+from sdg.organisaties.models import BevoegdeOrganisatie, LokaleOverheid, Lokatie
+from sdg.producten.models import Product
+from sdg.producten.models.product import GeneriekProduct
+
+
+class ProductLookups:
+    """
+    Retrieve the objects that are referenced in a product payload.
+
+    Each lookup returns ``None`` if the object does not exist, the serializer
+    turns this into a validation error.
+    """
+
+    def get_generiek_product(self, upn_uri, doelgroep):
+        return GeneriekProduct.objects.filter(
+            upn__upn_uri=upn_uri, doelgroep=doelgroep
+        ).first()
+
+    def get_lokale_overheid(self, owms_identifier):
+        return LokaleOverheid.objects.filter(
+            organisatie__owms_identifier=owms_identifier
+        ).first()
+
+    def get_bevoegde_organisatie(
+        self, lokale_overheid, owms_identifier=None, naam=None, organisatie=None
+    ):
+        queryset = BevoegdeOrganisatie.objects.filter(lokale_overheid=lokale_overheid)
+        if owms_identifier:
+            queryset = queryset.filter(organisatie__owms_identifier=owms_identifier)
+        if naam:
+            queryset = queryset.filter(naam=naam)
+        if organisatie:
+            queryset = queryset.filter(organisatie=organisatie)
+
+        return queryset.first()
+
+    def get_default_catalogus(self, lokale_overheid):
+        return ProductenCatalogus.objects.filter(
+            lokale_overheid=lokale_overheid, is_default_catalogus=True
+        ).first()
+
+    def get_referentie_product(self, generiek_product):
+        return Product.objects.filter(
+            generiek_product=generiek_product, referentie_product=None
+        ).first()
+
+    def get_product(self, referentie_product, catalogus):
+        return Product.objects.filter(
+            referentie_product=referentie_product, catalogus=catalogus
+        ).first()
+
+    def get_product_valt_onder(self, upn_uri, doelgroep, catalogus):
+        return Product.objects.filter(
+            generiek_product__upn__upn_uri=upn_uri,
+            generiek_product__doelgroep=doelgroep,
+            catalogus=catalogus,
+        ).first()
+
+    def get_locatie(self, organisatie, uuid=None, naam=None):
+        queryset = Lokatie.objects.filter(lokale_overheid__organisatie=organisatie)
+        if uuid:
+            return queryset.filter(uuid=uuid).first()
+        return queryset.filter(naam=naam).first()
+
+
+class PrefetchedProductLookups(ProductLookups):
+    """
+    Answer the lookups from objects that are retrieved up front, with a fixed
+    number of queries for any number of product payloads.
+
+    Only the objects of the given organizations (and catalogs), UPNs and
+    locations are retrieved, all other lookups return ``None``.
+    """
+
+    def __init__(
+        self, owms_identifiers, catalogi, upn_uris, locatie_uuids, locatie_namen
+    ):
+        lokale_overheden = list(
+            LokaleOverheid.objects.filter(
+                organisatie__owms_identifier__in=owms_identifiers
+            ).select_related("organisatie")
+        )
+        self.lokale_overheden = {
+            lokale_overheid.organisatie.owms_identifier: lokale_overheid
+            for lokale_overheid in lokale_overheden
+        }
+
+        # The products and locations can be part of an explicitly given catalog
+        # of another organization.
+        scope = {lokale_overheid.pk for lokale_overheid in lokale_overheden} | {
+            catalogus.lokale_overheid_id for catalogus in catalogi
+        }
+
+        self.generieke_producten = {
+            (generiek_product.upn.upn_uri, generiek_product.doelgroep): generiek_product
+            for generiek_product in GeneriekProduct.objects.filter(
+                upn__upn_uri__in=upn_uris
+            ).select_related("upn")
+        }
+
+        self.bevoegde_organisaties = defaultdict(list)
+        for bevoegde_organisatie in (
+            BevoegdeOrganisatie.objects.filter(lokale_overheid__in=lokale_overheden)
+            .select_related("organisatie")
+            .order_by("pk")
+        ):
+            self.bevoegde_organisaties[bevoegde_organisatie.lokale_overheid_id].append(
+                bevoegde_organisatie
+            )
+
+        self.default_catalogi = {
+            catalogus.lokale_overheid_id: catalogus
+            for catalogus in ProductenCatalogus.objects.filter(
+                lokale_overheid__in=lokale_overheden, is_default_catalogus=True
+            )
+            .select_related("lokale_overheid__organisatie")
+            .order_by("-pk")
+        }
+
+        self.referentie_producten = {
+            product.generiek_product_id: product
+            for product in Product.objects.filter(
+                generiek_product__in=self.generieke_producten.values(),
+                referentie_product=None,
+            ).order_by("-pk")
+        }
+
+        # The products that are updated (and the products they fall under),
+        # with their most recent version and its translations.
+        products = list(
+            Product.objects.most_recent()
+            .filter(
+                catalogus__lokale_overheid__in=scope,
+                generiek_product__in=self.generieke_producten.values(),
+            )
+            .select_related("generiek_product__upn")
+            .order_by("-pk")
+        )
+        self.products = {
+            (product.referentie_product_id, product.catalogus_id): product
+            for product in products
+        }
+        self.products_by_upn = {
+            (
+                product.generiek_product.upn.upn_uri,
+                product.generiek_product.doelgroep,
+                product.catalogus_id,
+            ): product
+            for product in products
+        }
+
+        self.locaties = {}
+        for locatie in (
+            Lokatie.objects.filter(lokale_overheid__in=scope)
+            .filter(Q(uuid__in=locatie_uuids) | Q(naam__in=locatie_namen))
+            .select_related("lokale_overheid")
+            .order_by("-pk")
+        ):
+            organisatie_id = locatie.lokale_overheid.organisatie_id
+            self.locaties[(organisatie_id, str(locatie.uuid))] = locatie
+            self.locaties[(organisatie_id, locatie.naam)] = locatie
+
+    def get_generiek_product(self, upn_uri, doelgroep):
+        return self.generieke_producten.get((upn_uri, doelgroep))
+
+    def get_lokale_overheid(self, owms_identifier):
+        return self.lokale_overheden.get(owms_identifier)
+
+    def get_bevoegde_organisatie(
+        self, lokale_overheid, owms_identifier=None, naam=None, organisatie=None
+    ):
+        for bevoegde_organisatie in self.bevoegde_organisaties[lokale_overheid.pk]:
+            if owms_identifier and (
+                not bevoegde_organisatie.organisatie
+                or bevoegde_organisatie.organisatie.owms_identifier != owms_identifier
+            ):
+                continue
+            if naam and bevoegde_organisatie.naam != naam:
+                continue
+            if organisatie and bevoegde_organisatie.organisatie_id != organisatie.pk:
+                continue
+            return bevoegde_organisatie
+
+        return None
+
+    def get_default_catalogus(self, lokale_overheid):
+        return self.default_catalogi.get(lokale_overheid.pk)
+
+    def get_referentie_product(self, generiek_product):
+        return self.referentie_producten.get(generiek_product.pk)
+
+    def get_product(self, referentie_product, catalogus):
+        return self.products.get((referentie_product.pk, catalogus.pk))
+
+    def get_product_valt_onder(self, upn_uri, doelgroep, catalogus):
+        return self.products_by_upn.get((upn_uri, doelgroep, catalogus.pk))
+
+    def get_locatie(self, organisatie, uuid=None, naam=None):
+        return self.locaties.get((organisatie.pk, str(uuid) if uuid else naam))
@@ -1,5 +1,6 @@
 from django.core.validators import validate_ipv4_address
 from django.db import models
+from django.utils.functional import cached_property
 from django.utils.translation import gettext_lazy as _
 
 from django_better_admin_arrayfield.models.fields import ArrayField
@@ -80,6 +81,15 @@ class Token(models.Model):
     def __str__(self):
         return self.key
 
+    @cached_property
+    def organisaties(self) -> frozenset:
+        """The primary keys of the organizations this token is authorized for."""
+        return frozenset(
+            self.tokenauthorization_set.values_list(
+                "lokale_overheid__organisatie__pk", flat=True
+            )
+        )
+
     def save(self, *args, **kwargs):
         if not self.key:
             self.key = self.generate_key()
@@ -0,0 +1,147 @@
+import base64
+import binascii
+import json
+from functools import reduce
+
+from django.db.models import Q
+
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import PageNumberPagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import remove_query_param, replace_query_param
+
+
+class KeysetPagination(PageNumberPagination):
+    """
+    Page number pagination with an opt-in keyset (cursor) mode.
+
+    Providing the ``cursor`` query parameter (empty for the first page) switches
+    to keyset pagination on (``keyset_field``, pk). In this mode no ``COUNT`` and
+    no ``OFFSET`` are executed, so the last page is as cheap as the first one.
+    Without the parameter, the regular page number pagination is used.
+    """
+
+    cursor_query_param = "cursor"
+    keyset_field = None
+    invalid_cursor_message = "Ongeldige cursor."
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.keyset = self.use_keyset(request)
+        if not self.keyset:
+            return super().paginate_queryset(queryset, request, view)
+
+        self.request = request
+        page_size = self.get_page_size(request)
+        if not page_size:
+            return None
+
+        queryset = queryset.order_by(self.keyset_field, "pk")
+
+        position = self.decode_cursor(request)
+        if position is not None:
+            value, pk = position
+            queryset = queryset.filter(
+                Q(**{f"{self.keyset_field}__gt": value})
+                | Q(**{self.keyset_field: value, "pk__gt": pk})
+            )
+
+        # Fetch one additional item to determine if there is a next page.
+        results = list(queryset[: page_size + 1])
+        self.has_next = len(results) > page_size
+        self.page = results[:page_size]
+
+        return self.page
+
+    def use_keyset(self, request) -> bool:
+        return self.cursor_query_param in request.query_params
+
+    def get_paginated_response(self, data):
+        if not self.keyset:
+            return super().get_paginated_response(data)
+
+        return Response(
+            {
+                "next": self.get_next_cursor_link(),
+                "results": data,
+            }
+        )
+
+    def get_keyset_value(self, instance):
+        return reduce(getattr, self.keyset_field.split("__"), instance)
+
+    def get_next_cursor_link(self):
+        if not self.has_next:
+            return None
+
+        last = self.page[-1]
+        cursor = self.encode_cursor(self.get_keyset_value(last), last.pk)
+
+        url = self.request.build_absolute_uri()
+        url = remove_query_param(url, self.page_query_param)
+        return replace_query_param(url, self.cursor_query_param, cursor)
+
+    def encode_cursor(self, value, pk):
+        data = json.dumps([value, pk], separators=(",", ":")).encode()
+        return base64.urlsafe_b64encode(data).decode().rstrip("=")
+
+    def decode_cursor(self, request):
+        """
+        :returns: The (value, pk) position of the last item on the previous
+            page, or ``None`` for the first page.
+        """
+        encoded = request.query_params.get(self.cursor_query_param)
+        if not encoded:
+            return None
+
+        try:
+            padding = "=" * (-len(encoded) % 4)
+            value, pk = json.loads(base64.urlsafe_b64decode(encoded + padding))
+            if not isinstance(value, str) or not isinstance(pk, int):
+                raise ValueError
+        except (binascii.Error, UnicodeDecodeError, TypeError, ValueError):
+            raise NotFound(self.invalid_cursor_message)
+
+        return value, pk
+
+
+class ProductPagination(KeysetPagination):
+    keyset_field = "generiek_product__upn__upn_label"
+
+
+class ProductWijzigingPagination(KeysetPagination):
+    """Keyset pagination on the moment of the last change of the products."""
+
+    keyset_field = "wijziging_op"
+    page_size = 100
+
+    def use_keyset(self, request) -> bool:
+        return True
+
+    def get_schema_operation_parameters(self, view):
+        return [
+            {
+                "name": self.cursor_query_param,
+                "required": False,
+                "in": "query",
+                "description": "De cursor van de gewenste pagina. Volg de `next` URL om de volgende pagina op te halen.",
+                "schema": {"type": "string"},
+            }
+        ]
+
+    def get_paginated_response_schema(self, schema):
+        return {
+            "type": "object",
+            "required": ["results"],
+            "properties": {
+                "next": {
+                    "type": "string",
+                    "nullable": True,
+                    "format": "uri",
+                },
+                "results": schema,
+            },
+        }
+
+    def get_keyset_value(self, instance):
+        # Keep the full precision, to not skip or repeat changes.
+        return super().get_keyset_value(instance).isoformat()
@@ -0,0 +1,54 @@
+from functools import lru_cache
+
+from django.conf import settings
+
+import orjson
+from djangorestframework_camel_case.settings import api_settings
+from djangorestframework_camel_case.util import camel_to_underscore, underscoreize
+from rest_framework.exceptions import ParseError
+from rest_framework.parsers import JSONParser
+
+
+@lru_cache(maxsize=4096)
+def underscore_key(key: str) -> str:
+    return camel_to_underscore(key, **api_settings.JSON_UNDERSCOREIZE)
+
+
+def fast_underscoreize(data):
+    """
+    Underscore the keys of ``data``, like ``djangorestframework_camel_case``
+    does, with the conversion of every distinct key computed only once.
+    """
+    if isinstance(data, dict):
+        return {
+            underscore_key(key): fast_underscoreize(value)
+            for key, value in data.items()
+        }
+    if isinstance(data, list):
+        return [fast_underscoreize(item) for item in data]
+    return data
+
+
+class CamelCaseORJSONParser(JSONParser):
+    """
+    Drop-in replacement of ``CamelCaseJSONParser`` that decodes with orjson.
+    """
+
+    json_underscoreize = api_settings.JSON_UNDERSCOREIZE
+
+    def parse(self, stream, media_type=None, parser_context=None):
+        parser_context = parser_context or {}
+        encoding = parser_context.get("encoding", settings.DEFAULT_CHARSET)
+
+        try:
+            content = stream.read()
+            if encoding.lower().replace("-", "") != "utf8":
+                content = content.decode(encoding)
+            data = orjson.loads(content)
+        except ValueError as exc:
+            raise ParseError(f"JSON parse error - {exc}")
+
+        options = self.json_underscoreize
+        if options.get("ignore_fields") or options.get("ignore_keys"):
+            return underscoreize(data, **options)
+        return fast_underscoreize(data)
@@ -1,4 +1,3 @@
-import datetime
 import logging
 
 from django.conf import settings
@@ -6,7 +5,7 @@ from django.conf import settings
 from rest_framework.permissions import SAFE_METHODS, BasePermission
 from vng_api_common.permissions import bypass_permissions
 
-from sdg.api.models import Token
+from sdg.api.tokens import record_last_seen
 
 logger = logging.getLogger(__name__)
 
@@ -39,12 +38,10 @@ class OrganizationPermissions(BasePermission):
         if not organisatie:
             return False
 
-        if organisatie.pk not in request.auth.tokenauthorization_set.values_list(
-            "lokale_overheid__organisatie__pk", flat=True
-        ):
+        if organisatie.pk not in request.auth.organisaties:
             return False
 
-        Token.objects.filter(key=request.auth).update(last_seen=datetime.datetime.now())
+        record_last_seen(request.auth)
 
         return True
 
@@ -57,12 +54,10 @@ class OrganizationPermissions(BasePermission):
 
         organisatie = view.get_organisatie(request, view, obj)
 
-        if organisatie.pk not in request.auth.tokenauthorization_set.values_list(
-            "lokale_overheid__organisatie__pk", flat=True
-        ):
+        if organisatie.pk not in request.auth.organisaties:
             return False
 
-        Token.objects.filter(key=request.auth).update(last_seen=datetime.datetime.now())
+        record_last_seen(request.auth)
 
         return True
 
@@ -99,3 +94,10 @@ class WhitelistedPermission(BasePermission):
                 return False
 
         return True
+
+
+class TokenRequiredPermission(BasePermission):
+    """Only allow requests that are authenticated with an API token."""
+
+    def has_permission(self, request, view):
+        return bool(request.auth)
@@ -0,0 +1,110 @@
+from functools import lru_cache
+
+from django.utils.encoding import force_str
+from django.utils.functional import Promise
+
+import orjson
+from djangorestframework_camel_case.settings import api_settings
+from djangorestframework_camel_case.util import (
+    camelize,
+    camelize_re,
+    underscore_to_camel,
+)
+from rest_framework.renderers import BaseRenderer, JSONRenderer
+from rest_framework.utils.encoders import JSONEncoder
+
+
+class PrometheusRenderer(BaseRenderer):
+    """Render metrics in the Prometheus text exposition format."""
+
+    media_type = "text/plain"
+    format = "txt"
+    charset = "utf-8"
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if isinstance(data, dict):
+            # Error responses, like a missing token.
+            data = "".join(f"# {key}: {value}\n" for key, value in data.items())
+
+        return data.encode(self.charset)
+
+
+class NDJSONRenderer(JSONRenderer):
+    """
+    Render newline delimited JSON.
+
+    The (streamed) content is produced by the view itself, this renderer is
+    used for content negotiation and for error responses.
+    """
+
+    media_type = "application/x-ndjson"
+    format = "ndjson"
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        return super().render(data) + b"\n"
+
+
+@lru_cache(maxsize=4096)
+def camelize_key(key: str) -> str:
+    if "_" not in key:
+        return key
+    return camelize_re.sub(underscore_to_camel, key)
+
+
+def fast_camelize(data):
+    """
+    Camelize the keys of ``data``, like ``djangorestframework_camel_case``
+    does, with the conversion of every distinct key computed only once.
+    """
+    if isinstance(data, dict):
+        result = {}
+        for key, value in data.items():
+            if isinstance(key, Promise):
+                key = force_str(key)
+            if isinstance(key, str):
+                key = camelize_key(key)
+            result[key] = fast_camelize(value)
+        return result
+    if isinstance(data, (list, tuple)):
+        return [fast_camelize(item) for item in data]
+    return data
+
+
+class CamelCaseORJSONRenderer(JSONRenderer):
+    """
+    Drop-in replacement of ``CamelCaseJSONRenderer`` that encodes with orjson.
+
+    The output is identical, only ``indent`` is limited to two spaces. Values
+    that orjson does not support natively (like lazy translations, decimals
+    and datetimes) are encoded by the JSON encoder of DRF.
+    """
+
+    json_underscoreize = api_settings.JSON_UNDERSCOREIZE
+    encoder = JSONEncoder()
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b""
+
+        options = orjson.OPT_NON_STR_KEYS | orjson.OPT_PASSTHROUGH_DATETIME
+        if self.get_indent(accepted_media_type, renderer_context or {}):
+            options |= orjson.OPT_INDENT_2
+
+        ret = orjson.dumps(self.camelize(data), default=self.default, option=options)
+
+        # Like DRF, escape the line and paragraph separators (U+2028 and
+        # U+2029) to output JSON that is a strict JavaScript subset.
+        if b"\xe2\x80\xa8" in ret or b"\xe2\x80\xa9" in ret:
+            ret = ret.replace(b"\xe2\x80\xa8", b"\\u2028").replace(
+                b"\xe2\x80\xa9", b"\\u2029"
+            )
+        return ret
+
+    def camelize(self, data):
+        options = self.json_underscoreize
+        if options.get("ignore_fields") or options.get("ignore_keys"):
+            return camelize(data, **options)
+        return fast_camelize(data)
+
+    def default(self, obj):
+        return self.camelize(self.encoder.default(obj))
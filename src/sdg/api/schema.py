@@ -0,0 +1,165 @@
+import gzip
+import logging
+import os
+import threading
+from typing import NamedTuple
+
+from django.conf import settings
+from django.core.cache import caches
+
+from drf_spectacular.generators import SchemaGenerator
+from drf_spectacular.renderers import OpenApiJsonRenderer, OpenApiYamlRenderer
+from drf_spectacular.settings import spectacular_settings
+
+logger = logging.getLogger(__name__)
+
+SCHEMA_KEY = "sdg:api:schema:{version}"
+SCHEMA_VERSION_FILE = "VERSION"
+SCHEMA_RENDERERS = {
+    "json": OpenApiJsonRenderer,
+    "yaml": OpenApiYamlRenderer,
+}
+
+
+class SchemaDocument(NamedTuple):
+    content: bytes
+    compressed: bytes
+
+
+def get_schema_version():
+    """
+    Return the version the pre-generated schema is valid for, or ``None`` if
+    the schema can not be cached.
+
+    The schema only changes when the code changes, which is identified by the
+    release and the commit of the application. The release alone is not
+    enough, every build of master is released as ``latest``.
+    """
+    if not settings.SDG_API_SCHEMA_CACHE_ENABLED:
+        return None
+
+    parts = [settings.RELEASE, settings.GIT_SHA]
+    # The release defaults to the commit.
+    return "-".join(dict.fromkeys(part for part in parts if part)) or None
+
+
+def get_schema_path(schema_format: str, compressed: bool = False) -> str:
+    filename = f"openapi.{schema_format}{'.gz' if compressed else ''}"
+    return os.path.join(settings.SDG_API_SCHEMA_ROOT, filename)
+
+
+def generate_schema_documents() -> dict:
+    """
+    Generate the schema, rendered in every format and compressed with gzip.
+    """
+    generator = SchemaGenerator()
+    schema = generator.get_schema(
+        request=None, public=spectacular_settings.SERVE_PUBLIC
+    )
+
+    documents = {}
+    for schema_format, renderer_class in SCHEMA_RENDERERS.items():
+        content = renderer_class().render(schema, renderer_context={})
+        documents[schema_format] = SchemaDocument(
+            content=content, compressed=gzip.compress(content, mtime=0)
+        )
+    return documents
+
+
+def write_schema_documents(documents: dict, version: str = ""):
+    """
+    Write the schema documents to ``SDG_API_SCHEMA_ROOT``, along with the
+    version they were generated for.
+    """
+    os.makedirs(settings.SDG_API_SCHEMA_ROOT, exist_ok=True)
+
+    for schema_format, document in documents.items():
+        with open(get_schema_path(schema_format), "wb") as f:
+            f.write(document.content)
+        with open(get_schema_path(schema_format, compressed=True), "wb") as f:
+            f.write(document.compressed)
+
+    with open(
+        os.path.join(settings.SDG_API_SCHEMA_ROOT, SCHEMA_VERSION_FILE), "w"
+    ) as f:
+        f.write(version)
+
+
+def read_schema_documents(version: str):
+    """
+    Read the schema documents that were written by ``build_api_schema``.
+
+    :returns: The documents, or ``None`` if they are missing or were generated
+        for another version.
+    """
+    try:
+        with open(os.path.join(settings.SDG_API_SCHEMA_ROOT, SCHEMA_VERSION_FILE)) as f:
+            if f.read().strip() != version:
+                return None
+
+        documents = {}
+        for schema_format in SCHEMA_RENDERERS:
+            with open(get_schema_path(schema_format), "rb") as f:
+                content = f.read()
+            with open(get_schema_path(schema_format, compressed=True), "rb") as f:
+                compressed = f.read()
+            documents[schema_format] = SchemaDocument(content, compressed)
+    except OSError:
+        return None
+
+    return documents
+
+
+class SchemaStore:
+    """
+    Keep the schema documents of the current version in memory.
+
+    The documents are looked up in the files written by ``build_api_schema``,
+    then in the shared cache, and are only generated if neither has the
+    current version.
+    """
+
+    def __init__(self):
+        self._documents = {}
+        self._lock = threading.Lock()
+
+    def get(self, schema_format: str):
+        """
+        :returns: The ``SchemaDocument`` of the given format, or ``None`` if
+            the schema can not be cached.
+        """
+        version = get_schema_version()
+        if version is None:
+            return None
+
+        documents = self._documents.get(version)
+        if documents is None:
+            with self._lock:
+                documents = self._documents.get(version)
+                if documents is None:
+                    documents = self._load(version)
+                    self._documents = {version: documents}
+
+        return documents[schema_format]
+
+    def clear(self):
+        with self._lock:
+            self._documents = {}
+
+    def _load(self, version: str) -> dict:
+        documents = read_schema_documents(version)
+        if documents is not None:
+            return documents
+
+        cache = caches[settings.SDG_API_SCHEMA_CACHE_ALIAS]
+        key = SCHEMA_KEY.format(version=version)
+        documents = cache.get(key)
+        if documents is None:
+            logger.info("Generating the API schema for version %s.", version)
+            documents = generate_schema_documents()
+            cache.set(key, documents, timeout=settings.SDG_API_SCHEMA_CACHE_TIMEOUT)
+
+        return documents
+
+
+schema_store = SchemaStore()
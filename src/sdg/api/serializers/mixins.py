@@ -0,0 +1,28 @@
+from rest_framework import serializers
+
+
+class SparseFieldsetMixin:
+    """
+    Only include the fields that are requested with the ``velden`` query
+    parameter, as determined by the view and passed in ``context["velden"]``.
+
+    The fields of nested serializers are not affected.
+    """
+
+    def get_fields(self):
+        fields = super().get_fields()
+
+        velden = self.context.get("velden")
+        if not velden or not self.is_root_serializer():
+            return fields
+
+        return {name: field for name, field in fields.items() if name in velden}
+
+    def is_root_serializer(self) -> bool:
+        if self.parent is None:
+            return True
+
+        return (
+            isinstance(self.parent, serializers.ListSerializer)
+            and self.parent.parent is None
+        )
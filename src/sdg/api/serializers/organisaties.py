@@ -2,6 +2,7 @@ from django.db import IntegrityError, transaction
 
 from rest_framework import serializers
 
+from sdg.api.serializers.mixins import SparseFieldsetMixin
 from sdg.organisaties.models import (
     BevoegdeOrganisatie,
     LokaleOverheid,
@@ -152,7 +153,7 @@ class LocatieBaseSerializer(serializers.HyperlinkedModelSerializer):
         }
 
 
-class LocatieSerializer(LocatieBaseSerializer):
+class LocatieSerializer(SparseFieldsetMixin, LocatieBaseSerializer):
     organisatie = LokaleOverheidBaseSerializer(
         source="lokale_overheid",
         required=False,
@@ -226,7 +227,48 @@ class LocatieSerializer(LocatieBaseSerializer):
         return record
 
 
-class LokaleOverheidSerializer(LokaleOverheidBaseSerializer):
+class LocatieSyncSerializer(LocatieBaseSerializer):
+    """Serializer for a location in the synchronisation of the locations of an organization."""
+
+    openingstijden = OpeningstijdenSerializer(source="*")
+
+    class Meta(LocatieBaseSerializer.Meta):
+        fields = LocatieBaseSerializer.Meta.fields + ("openingstijden",)
+        extra_kwargs = {
+            **LocatieBaseSerializer.Meta.extra_kwargs,
+            "uuid": {
+                "read_only": False,
+                "required": False,
+                # The locations are matched in bulk, see ``LocatieSync``.
+                "validators": [],
+                "help_text": "De UUID van een bestaande locatie van de organisatie. Indien niet opgegeven dan wordt de bestaande locatie met dezelfde naam bijgewerkt, of een nieuwe locatie aangemaakt.",
+            },
+            "naam": {"required": True, "help_text": "De naam van de locatie."},
+        }
+
+
+class LocatieSyncResultSerializer(serializers.Serializer):
+    """Serializer for the result of the synchronisation of the locations of an organization."""
+
+    aangemaakt = serializers.ListField(
+        child=serializers.UUIDField(),
+        help_text="De UUID's van de aangemaakte locaties.",
+    )
+    bijgewerkt = serializers.ListField(
+        child=serializers.UUIDField(),
+        help_text="De UUID's van de bijgewerkte locaties.",
+    )
+    ongewijzigd = serializers.ListField(
+        child=serializers.UUIDField(),
+        help_text="De UUID's van de opgegeven locaties die niet gewijzigd zijn.",
+    )
+    verwijderd = serializers.ListField(
+        child=serializers.UUIDField(),
+        help_text="De UUID's van de verwijderde locaties.",
+    )
+
+
+class LokaleOverheidSerializer(SparseFieldsetMixin, LokaleOverheidBaseSerializer):
     owms_end_date = serializers.DateTimeField(
         source="organisatie.owms_end_date",
         help_text="De eind datum van de organisatie. Indien de waarde `null` is, dan is organisatie actief.",
@@ -1,4 +1,5 @@
 import datetime
+from dataclasses import dataclass
 
 from django.db import transaction
 from django.utils.dateparse import parse_date
@@ -8,13 +9,19 @@ from drf_spectacular.utils import extend_schema_field
 from rest_framework import serializers
 from rest_framework.reverse import reverse
 
+from sdg.api.lookups import ProductLookups
 from sdg.api.serializers.fields import LabeledUrlListField
+from sdg.api.serializers.mixins import SparseFieldsetMixin
 from sdg.api.serializers.organisaties import (
     BevoegdeOrganisatieSerializer,
     LocatieBaseSerializer,
     OpeningstijdenSerializer,
 )
-from sdg.core.constants.product import DoelgroepChoices, TaalChoices
+from sdg.core.constants.product import (
+    DoelgroepChoices,
+    ProductWijzigingChoices,
+    TaalChoices,
+)
 from sdg.core.models.catalogus import ProductenCatalogus
 from sdg.organisaties.models import (
     BevoegdeOrganisatie,
@@ -279,7 +286,21 @@ class ProductLokaleOverheidSerializer(serializers.HyperlinkedModelSerializer):
         )
 
 
-class ProductSerializer(ProductBaseSerializer):
+@dataclass
+class ProductChanges:
+    """The (unsaved) changes to a product, as determined from a product payload."""
+
+    product: Product
+    locaties: list
+    product_versie: ProductVersie
+    vertalingen: list
+
+    @property
+    def creates_version(self) -> bool:
+        return self.product_versie.pk is None
+
+
+class ProductSerializer(SparseFieldsetMixin, ProductBaseSerializer):
     """Serializer for a product, including UPN, availability, locations and latest version translations."""
 
     verantwoordelijke_organisatie = ProductLokaleOverheidSerializer(
@@ -384,7 +405,8 @@ class ProductSerializer(ProductBaseSerializer):
         fields = super().get_fields()
 
         for field in self.Meta.version_fields:
-            fields[field].source = f"{self.version_property_name}.{field}"
+            if field in fields:
+                fields[field].source = f"{self.version_property_name}.{field}"
 
         return fields
 
@@ -408,24 +430,6 @@ class ProductSerializer(ProductBaseSerializer):
     def get_talen(self, obj: Product) -> list:
         return TaalChoices.get_available_languages()
 
-    def to_representation(self, instance):
-        data = super(ProductBaseSerializer, self).to_representation(instance)
-        version = getattr(instance, self.version_property_name, None)
-
-        if version and getattr(instance, "_filter_taal", None):
-            translations = version.vertalingen.all()
-            filtered_translations = [
-                i for i in translations if i.taal == instance._filter_taal
-            ]
-
-            data.update(
-                vertalingen=LocalizedProductSerializer(
-                    filtered_translations, many=True
-                ).data
-            )
-
-        return data
-
     def validate(self, attrs):
         if "generiek_product" not in attrs:
             raise serializers.ValidationError(
@@ -469,117 +473,109 @@ class ProductSerializer(ProductBaseSerializer):
 
         return attrs
 
+    @property
+    def lookups(self) -> ProductLookups:
+        """
+        Return the lookups for the referenced objects, which are prefetched
+        when a batch of products is saved.
+        """
+        return self.context.get("lookups") or ProductLookups()
+
     def get_generiek_product(self, generiek_product, doelgroep):
         if "upn_uri" in generiek_product:
-            try:
-                return GeneriekProduct.objects.get(
-                    upn__upn_uri=generiek_product["upn_uri"], doelgroep=doelgroep
-                )
-            except GeneriekProduct.DoesNotExist:
+            instance = self.lookups.get_generiek_product(
+                generiek_product["upn_uri"], doelgroep
+            )
+            if instance is None:
                 raise serializers.ValidationError(
                     {
                         "": "De combinatie van waarden in de velden 'upnUri' en 'doelgroep' is ongeldig. Het object met deze waarden bestaat niet."
                     }
                 )
-            except KeyError:
-                raise serializers.ValidationError(
-                    {"upnUri": "Het veld 'upnUri' is verplicht.'"}
-                )
+            return instance
 
     def get_default_catalogus(self, verantwoordelijke_organisatie):
-        try:
-            return ProductenCatalogus.objects.get(
-                lokale_overheid=verantwoordelijke_organisatie,
-                is_default_catalogus=True,
-            )
-        except ProductenCatalogus.DoesNotExist:
+        catalogus = self.lookups.get_default_catalogus(verantwoordelijke_organisatie)
+        if catalogus is None:
             raise serializers.ValidationError(
                 {
                     "": "Het veld 'catalogus' is verplicht omdat er geen standaard catalogus beschikbaar is."
                 }
             )
+        return catalogus
 
     def get_referentie_product(self, generiek_product):
-        try:
-            referentie_product = Product.objects.get(
-                generiek_product=generiek_product,
-                referentie_product=None,
-            )
-
-            return referentie_product
-        except Product.DoesNotExist:
+        referentie_product = self.lookups.get_referentie_product(generiek_product)
+        if referentie_product is None:
             raise serializers.ValidationError(
                 {
                     "upnUri": "Het product is niet (meer) gekoppeld aan een referentie product."
                 }
             )
+        return referentie_product
 
     def get_product(self, product_valt_onder, catalogus, doelgroep):
-        try:
-            return Product.objects.get(
-                generiek_product__upn__upn_uri=product_valt_onder["upn_uri"],
-                generiek_product__doelgroep=doelgroep,
-                catalogus=catalogus,
+        if "upn_uri" not in product_valt_onder:
+            raise serializers.ValidationError(
+                {"upnUri": "Het veld 'upnUri' is verplicht."}
             )
-        except Product.DoesNotExist:
+
+        product = self.lookups.get_product_valt_onder(
+            product_valt_onder["upn_uri"], doelgroep, catalogus
+        )
+        if product is None:
             raise serializers.ValidationError(
                 {
                     "productValtOnder": "De waarde van het veld 'upnUri' is ongeldig binnen deze 'catalogus' en 'doelgroep'. Het object met deze waarde bestaat niet."
                 }
             )
-        except KeyError:
-            raise serializers.ValidationError(
-                {"upnUri": "Het veld 'upnUri' is verplicht."}
-            )
+        return product
 
     def get_lokale_overheid(self, organisatie):
-        try:
-            return LokaleOverheid.objects.get(
-                organisatie__owms_identifier=organisatie["owms_identifier"]
+        if "owms_identifier" not in organisatie:
+            raise serializers.ValidationError(
+                {"owmsIdentifier": "Het veld 'owmsIdentifier' is verplicht."}
             )
-        except LokaleOverheid.DoesNotExist:
+
+        lokale_overheid = self.lookups.get_lokale_overheid(
+            organisatie["owms_identifier"]
+        )
+        if lokale_overheid is None:
             raise serializers.ValidationError(
                 {
                     "owmsIdentifier": "De waarde van het veld 'owmsIdentifier' is ongeldig. Het object met deze waarde bestaat niet."
                 }
             )
-        except KeyError:
-            raise serializers.ValidationError(
-                {"owmsIdentifier": "Het veld 'owmsIdentifier' is verplicht."}
-            )
+        return lokale_overheid
 
     def get_bevoegde_organisatie(self, organisatie, verantwoordelijke_organisatie):
         if (
             "owms_identifier" in organisatie["organisatie"]
             and organisatie["organisatie"]["owms_identifier"]
         ):
-            try:
-                return BevoegdeOrganisatie.objects.get(
-                    organisatie__owms_identifier=organisatie["organisatie"][
-                        "owms_identifier"
-                    ],
-                    lokale_overheid=verantwoordelijke_organisatie,
-                )
-            except BevoegdeOrganisatie.DoesNotExist:
+            bevoegde_organisatie = self.lookups.get_bevoegde_organisatie(
+                verantwoordelijke_organisatie,
+                owms_identifier=organisatie["organisatie"]["owms_identifier"],
+            )
+            if bevoegde_organisatie is None:
                 raise serializers.ValidationError(
                     {
                         "verantwoordelijkeOrganisatie.owmsIdentifier": "De waarde van het veld 'owmsIdentifier' is ongeldig. Het object met deze waarde bestaat niet."
                     }
                 )
+            return bevoegde_organisatie
 
         if "naam" in organisatie and organisatie["naam"]:
-            try:
-                return BevoegdeOrganisatie.objects.get(
-                    naam=organisatie["naam"],
-                    lokale_overheid=verantwoordelijke_organisatie,
-                )
-            except BevoegdeOrganisatie.DoesNotExist:
-
+            bevoegde_organisatie = self.lookups.get_bevoegde_organisatie(
+                verantwoordelijke_organisatie, naam=organisatie["naam"]
+            )
+            if bevoegde_organisatie is None:
                 raise serializers.ValidationError(
                     {
                         "verantwoordelijkeOrganisatie.naam": "De waarde van het veld 'naam' is ongeldig. Het object met deze waarde bestaat niet."
                     }
                 )
+            return bevoegde_organisatie
 
         raise serializers.ValidationError(
             {
@@ -612,30 +608,26 @@ class ProductSerializer(ProductBaseSerializer):
         return False
 
     def get_locaties(self, locaties, catalogus):
+        organisatie = catalogus.lokale_overheid.organisatie
         organisatie_locaties = []
         for locatie in locaties:
             if "uuid" in locatie:
-                try:
-                    organisatie_locaties.append(
-                        Locatie.objects.get(
-                            uuid=locatie["uuid"],
-                            lokale_overheid__organisatie=catalogus.lokale_overheid.organisatie,
-                        )
-                    )
-                except Locatie.DoesNotExist:
+                overheid_locatie = self.lookups.get_locatie(
+                    organisatie, uuid=locatie["uuid"]
+                )
+                if overheid_locatie is None:
                     raise serializers.ValidationError(
-                        f"De 'locatie' die u meegegeven heeft bestaat niet in de catalogus: {catalogus.lokale_overheid.organisatie}."
+                        f"De 'locatie' die u meegegeven heeft bestaat niet in de catalogus: {organisatie}."
                     )
+                organisatie_locaties.append(overheid_locatie)
             if "naam" in locatie:
-                try:
-                    overheid_locatie = Locatie.objects.get(
-                        naam=locatie["naam"],
-                        lokale_overheid__organisatie=catalogus.lokale_overheid.organisatie,
-                    )
-                except Locatie.DoesNotExist:
+                overheid_locatie = self.lookups.get_locatie(
+                    organisatie, naam=locatie["naam"]
+                )
+                if overheid_locatie is None:
                     raise serializers.ValidationError(
                         {
-                            "locaties.naam": f"De 'locatie' die u meegegeven heeft bestaat niet in de catalogus: {catalogus.lokale_overheid.organisatie}."
+                            "locaties.naam": f"De 'locatie' die u meegegeven heeft bestaat niet in de catalogus: {organisatie}."
                         }
                     )
 
@@ -643,9 +635,12 @@ class ProductSerializer(ProductBaseSerializer):
 
         return organisatie_locaties
 
-    @transaction.atomic
-    def create(self, validated_data):
-        data = self.context["request"].data.copy()
+    def get_changes(self, validated_data) -> ProductChanges:
+        """
+        Resolve the referenced objects and determine the changes to the
+        product, without saving anything.
+        """
+        data = self.initial_data.copy()
         generiek_product = validated_data.pop("generiek_product")
         doelgroep = data.get("doelgroep")
         catalogus = validated_data.get("catalogus", [])
@@ -675,10 +670,18 @@ class ProductSerializer(ProductBaseSerializer):
             )
 
         else:
-            validated_data["bevoegde_organisatie"] = BevoegdeOrganisatie.objects.get(
-                lokale_overheid=verantwoordelijke_organisatie,
-                organisatie=verantwoordelijke_organisatie.organisatie,
+            validated_data["bevoegde_organisatie"] = (
+                self.lookups.get_bevoegde_organisatie(
+                    verantwoordelijke_organisatie,
+                    organisatie=verantwoordelijke_organisatie.organisatie,
+                )
             )
+            if validated_data["bevoegde_organisatie"] is None:
+                raise serializers.ValidationError(
+                    {
+                        "bevoegdeOrganisatie": "De verantwoordelijke organisatie heeft geen bevoegde organisatie. U dient een bevoegde organisatie op te geven."
+                    }
+                )
 
         if not catalogus:
             raise serializers.ValidationError(
@@ -709,43 +712,38 @@ class ProductSerializer(ProductBaseSerializer):
                     doelgroep,
                 )
 
-        product = Product.objects.get(
-            referentie_product=validated_data["referentie_product"],
-            catalogus=validated_data["catalogus"],
+        product = self.lookups.get_product(
+            validated_data["referentie_product"], validated_data["catalogus"]
         )
+        if product is None:
+            raise serializers.ValidationError(
+                {
+                    "upnUri": "Het product bestaat niet in deze 'catalogus'. Het object met deze waarde bestaat niet."
+                }
+            )
 
         product.product_valt_onder = validated_data.get("product_valt_onder", None)
         product.product_aanwezig = validated_data.get("product_aanwezig", None)
         product.bevoegde_organisatie = validated_data.get("bevoegde_organisatie", None)
 
-        product.save()
-
-        product.locaties.set(
-            self.get_locaties(
-                locaties,
-                validated_data["catalogus"],
-            )
-        )
+        organisatie_locaties = self.get_locaties(locaties, validated_data["catalogus"])
 
-        previous_publicatie_datum = product.most_recent_version.publicatie_datum
+        most_recent_version = product.most_recent_version
 
         if self.should_create_new_version(
-            previous_publicatie_datum,
+            most_recent_version.publicatie_datum,
             publicatie_datum,
         ):
-            product_versie = ProductVersie.objects.create(
+            product_versie = ProductVersie(
                 product=product,
-                versie=product.most_recent_version.versie + 1,
+                versie=most_recent_version.versie + 1,
                 publicatie_datum=publicatie_datum,
             )
-            product_versie_created = True
         else:
-            product_versie = product.most_recent_version
+            product_versie = most_recent_version
             product_versie.publicatie_datum = publicatie_datum
-            product_versie.save()
-
-            product_versie_created = False
 
+        vertalingen = []
         for translation in version.get("vertalingen", []):
             verwijzing_links = []
             if "verwijzing_links" in translation:
@@ -753,9 +751,29 @@ class ProductSerializer(ProductBaseSerializer):
                     verwijzing_links.append(list(verwijzing_link.values()))
 
             translation["verwijzing_links"] = verwijzing_links
+            vertalingen.append(translation)
 
-            if product_versie_created:
+        return ProductChanges(
+            product=product,
+            locaties=organisatie_locaties,
+            product_versie=product_versie,
+            vertalingen=vertalingen,
+        )
+
+    @transaction.atomic
+    def create(self, validated_data):
+        changes = self.get_changes(validated_data)
+        product = changes.product
+        product_versie = changes.product_versie
+
+        product.save()
+        product.locaties.set(changes.locaties)
+
+        product_versie_created = changes.creates_version
+        product_versie.save()
 
+        for translation in changes.vertalingen:
+            if product_versie_created:
                 LocalizedProduct.objects.create(
                     **translation,
                     product_versie=product_versie,
@@ -771,6 +789,70 @@ class ProductSerializer(ProductBaseSerializer):
         return product
 
 
+class ProductWijzigingSerializer(serializers.HyperlinkedModelSerializer):
+    """Serializer for the last change of a product."""
+
+    soort = serializers.ChoiceField(
+        source="wijziging_soort",
+        choices=ProductWijzigingChoices.choices,
+        help_text="De soort van de laatste wijziging van het product. Bij `verborgen` en `organisatie_opgeheven` is het product niet (meer) op te vragen.",
+    )
+    gewijzigd_op = serializers.DateTimeField(
+        source="wijziging_op",
+        help_text="Het tijdstip van de laatste wijziging van het product.",
+    )
+
+    class Meta:
+        model = Product
+        fields = (
+            "url",
+            "uuid",
+            "soort",
+            "gewijzigd_op",
+        )
+        extra_kwargs = {
+            "url": {
+                "view_name": "api:product-detail",
+                "lookup_field": "uuid",
+                "help_text": "De unieke URL van dit object binnen deze API.",
+            },
+        }
+
+
+class ProductBatchResultSerializer(serializers.Serializer):
+    """Serializer for the result of a single product in a batch."""
+
+    url = serializers.URLField(
+        allow_null=True,
+        help_text="De unieke URL van het opgeslagen product, of `null` als het product niet is opgeslagen.",
+    )
+    uuid = serializers.UUIDField(
+        allow_null=True,
+        help_text="De UUID van het opgeslagen product, of `null` als het product niet is opgeslagen.",
+    )
+    versie = serializers.IntegerField(
+        allow_null=True,
+        help_text="De versie van het product waarin de gegevens zijn opgeslagen.",
+    )
+    fouten = serializers.JSONField(
+        allow_null=True,
+        help_text="De fouten waardoor het product niet is opgeslagen, of `null` als het product is opgeslagen.",
+    )
+
+
+class ProductSleutelSerializer(serializers.Serializer):
+    """Serializer for the natural key of a product."""
+
+    upn_uri = serializers.URLField(help_text="De UPN URI van het product.")
+    organisatie_owms_identifier = serializers.URLField(
+        help_text="De OWMS Identifier van de verantwoordelijke organisatie van het product."
+    )
+    doelgroep = serializers.ChoiceField(
+        choices=DoelgroepChoices.choices,
+        help_text="De doelgroep van het product.",
+    )
+
+
 class GeneriekProductLinkSerializer(serializers.ModelSerializer):
     label = serializers.CharField(help_text="Linktekst")
     url = serializers.URLField(help_text="Link URL")
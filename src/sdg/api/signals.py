@@ -0,0 +1,172 @@
+from django.db import transaction
+from django.db.models import Q
+from django.db.models.signals import m2m_changed, post_delete, post_save, pre_delete
+from django.dispatch import receiver
+
+from sdg.api.cache import bump_response_cache_generation, invalidate_product_documents
+from sdg.api.models import Token, TokenAuthorization
+from sdg.api.tokens import invalidate_token_on_commit
+from sdg.core.models import (
+    Overheidsorganisatie,
+    ProductenCatalogus,
+    UniformeProductnaam,
+)
+from sdg.organisaties.models import BevoegdeOrganisatie, LokaleOverheid, Lokatie
+from sdg.producten.models import (
+    GeneriekProduct,
+    GeneriekProductOverheidsorganisatieRol,
+    LocalizedGeneriekProduct,
+    LocalizedProduct,
+    Product,
+    ProductVersie,
+)
+
+
+def _invalidate_on_commit(pks):
+    """
+    Invalidate the cached documents once the transaction is committed.
+
+    Invalidating earlier would allow a concurrent request to cache the old
+    state again before the new state is visible.
+    """
+    pks = list(pks)
+    if pks:
+        transaction.on_commit(lambda: invalidate_product_documents(pks))
+
+
+@receiver(post_save, sender=Product)
+@receiver(post_delete, sender=Product)
+def invalidate_product(sender, instance, **kwargs):
+    _invalidate_on_commit([instance.pk])
+
+
+@receiver(m2m_changed, sender=Product.locaties.through)
+def invalidate_product_locaties(sender, instance, action, reverse, pk_set, **kwargs):
+    if not action.startswith("post_"):
+        return
+
+    if not reverse:
+        _invalidate_on_commit([instance.pk])
+    elif pk_set:
+        _invalidate_on_commit(pk_set)
+    else:
+        # ``clear()`` from the location side does not provide the products.
+        _invalidate_on_commit(
+            Product.objects.filter(locaties=instance).values_list("pk", flat=True)
+        )
+
+
+@receiver(post_save, sender=ProductVersie)
+@receiver(post_delete, sender=ProductVersie)
+def invalidate_product_versie(sender, instance, **kwargs):
+    _invalidate_on_commit([instance.product_id])
+
+
+@receiver(post_save, sender=LocalizedProduct)
+@receiver(post_delete, sender=LocalizedProduct)
+def invalidate_localized_product(sender, instance, **kwargs):
+    _invalidate_on_commit(
+        ProductVersie.objects.filter(pk=instance.product_versie_id).values_list(
+            "product_id", flat=True
+        )
+    )
+
+
+@receiver(post_save, sender=Lokatie)
+@receiver(pre_delete, sender=Lokatie)
+def invalidate_lokatie(sender, instance, **kwargs):
+    # The relation to the products is removed during the deletion, so the
+    # products are determined before the location is deleted.
+    _invalidate_on_commit(
+        Product.objects.filter(locaties=instance).values_list("pk", flat=True)
+    )
+
+
+@receiver(post_save, sender=BevoegdeOrganisatie)
+def invalidate_bevoegde_organisatie(sender, instance, **kwargs):
+    _invalidate_on_commit(
+        Product.objects.filter(bevoegde_organisatie=instance).values_list(
+            "pk", flat=True
+        )
+    )
+
+
+@receiver(post_save, sender=LokaleOverheid)
+def invalidate_lokale_overheid(sender, instance, **kwargs):
+    _invalidate_on_commit(
+        Product.objects.filter(catalogus__lokale_overheid=instance).values_list(
+            "pk", flat=True
+        )
+    )
+
+
+@receiver(post_save, sender=GeneriekProduct)
+def invalidate_generiek_product(sender, instance, **kwargs):
+    _invalidate_on_commit(
+        Product.objects.filter(
+            Q(generiek_product=instance)
+            | Q(product_valt_onder__generiek_product=instance)
+        ).values_list("pk", flat=True)
+    )
+
+
+@receiver(post_save, sender=Overheidsorganisatie)
+def invalidate_overheidsorganisatie(sender, instance, **kwargs):
+    _invalidate_on_commit(
+        Product.objects.filter(
+            Q(catalogus__lokale_overheid__organisatie=instance)
+            | Q(bevoegde_organisatie__organisatie=instance)
+        ).values_list("pk", flat=True)
+    )
+
+
+@receiver(post_save, sender=UniformeProductnaam)
+def invalidate_uniforme_productnaam(sender, instance, **kwargs):
+    _invalidate_on_commit(
+        Product.objects.filter(
+            Q(generiek_product__upn=instance)
+            | Q(product_valt_onder__generiek_product__upn=instance)
+        ).values_list("pk", flat=True)
+    )
+
+
+# The models with the data that is part of the responses of the API. Only
+# these models are connected, so the internal tables (like the results of the
+# broken link checker) do not invalidate the responses and keep their fast
+# deletes.
+RESPONSE_CACHE_MODELS = [
+    Overheidsorganisatie,
+    UniformeProductnaam,
+    ProductenCatalogus,
+    LokaleOverheid,
+    BevoegdeOrganisatie,
+    Lokatie,
+    GeneriekProduct,
+    GeneriekProductOverheidsorganisatieRol,
+    LocalizedGeneriekProduct,
+    Product,
+    ProductVersie,
+    LocalizedProduct,
+]
+
+
+def invalidate_cached_responses(sender, **kwargs):
+    transaction.on_commit(bump_response_cache_generation)
+
+
+for model in RESPONSE_CACHE_MODELS:
+    post_save.connect(invalidate_cached_responses, sender=model)
+    post_delete.connect(invalidate_cached_responses, sender=model)
+m2m_changed.connect(invalidate_cached_responses, sender=Product.locaties.through)
+
+
+@receiver(post_save, sender=Token)
+@receiver(post_delete, sender=Token)
+def invalidate_cached_token(sender, instance, **kwargs):
+    invalidate_token_on_commit(instance.key)
+
+
+@receiver(post_save, sender=TokenAuthorization)
+@receiver(post_delete, sender=TokenAuthorization)
+def invalidate_cached_token_authorization(sender, instance, **kwargs):
+    invalidate_token_on_commit(instance.token_id)
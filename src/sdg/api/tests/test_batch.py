@@ -0,0 +1,268 @@
+from django.db import connection
+from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
+
+from rest_framework import status
+from rest_framework.reverse import reverse
+from rest_framework.test import APITestCase
+
+from sdg.api.cache import get_response_cache
+from sdg.api.tests.factories.token import TokenAuthorizationFactory
+from sdg.core.tests.factories.catalogus import ProductenCatalogusFactory
+from sdg.organisaties.tests.factories.overheid import (
+    BevoegdeOrganisatieFactory,
+    LocatieFactory,
+    LokaleOverheidFactory,
+)
+from sdg.producten.models import Product
+from sdg.producten.tests.constants import NOW_DATE
+from sdg.producten.tests.factories.localized import LocalizedProductFactory
+from sdg.producten.tests.factories.product import (
+    ProductVersieFactory,
+    ReferentieProductFactory,
+    SpecifiekProductFactory,
+)
+
+
+def get_vertaling(taal, **overrides):
+    return {
+        "taal": taal,
+        "titel": "",
+        "tekst": "",
+        "links": [],
+        "procedureBeschrijving": "",
+        "bewijs": "",
+        "vereisten": "",
+        "bezwaarEnBeroep": "",
+        "kostenEnBetaalmethoden": "",
+        "uitersteTermijn": "",
+        "wtdBijGeenReactie": "",
+        "procedureLink": {"label": "", "url": ""},
+        "productAanwezigToelichting": "",
+        "productValtOnderToelichting": "",
+        **overrides,
+    }
+
+
+@override_settings(SDG_API_WHITELISTING_ENABLED=False)
+class ProductBatchTests(APITestCase):
+    url = reverse("api:product-batch")
+
+    def setUp(self):
+        self.lokale_overheid = LokaleOverheidFactory.create(
+            automatisch_catalogus_aanmaken=False,
+            organisatie__owms_identifier="https://www.example.com/gemeente",
+        )
+        self.organisatie = self.lokale_overheid.organisatie
+        self.bevoegde_organisatie = BevoegdeOrganisatieFactory.create(
+            lokale_overheid=self.lokale_overheid, organisatie=self.organisatie
+        )
+        self.catalogus = ProductenCatalogusFactory.create(
+            lokale_overheid=self.lokale_overheid,
+            is_referentie_catalogus=False,
+            is_default_catalogus=True,
+        )
+        self.referentie_catalogus = ProductenCatalogusFactory.create(
+            is_referentie_catalogus=True
+        )
+        self.referentie_bevoegde_organisatie = BevoegdeOrganisatieFactory.create(
+            lokale_overheid=self.referentie_catalogus.lokale_overheid
+        )
+        self.locatie = LocatieFactory.create(lokale_overheid=self.lokale_overheid)
+
+        self.token_authorization = TokenAuthorizationFactory.create(
+            lokale_overheid=self.lokale_overheid,
+            token__api_default_most_recent=True,
+        )
+        self.client.credentials(
+            HTTP_AUTHORIZATION=f"Token {self.token_authorization.token}"
+        )
+
+    def create_product(self):
+        referentie_product = ReferentieProductFactory.create(
+            catalogus=self.referentie_catalogus,
+            bevoegde_organisatie=self.referentie_bevoegde_organisatie,
+            generiek_product__doelgroep="eu-burger",
+        )
+        product = SpecifiekProductFactory.create(
+            generiek_product=referentie_product.generiek_product,
+            referentie_product=referentie_product,
+            catalogus=self.catalogus,
+            bevoegde_organisatie=self.bevoegde_organisatie,
+        )
+        product_versie = ProductVersieFactory.create(
+            product=product, versie=1, publicatie_datum=None
+        )
+        LocalizedProductFactory.create_batch(2, product_versie=product_versie)
+        return product
+
+    def get_payload(self, product, **overrides):
+        return {
+            "upnUri": product.generiek_product.upn.upn_uri,
+            "publicatieDatum": None,
+            "productAanwezig": True,
+            "productValtOnder": None,
+            "doelgroep": "eu-burger",
+            "verantwoordelijkeOrganisatie": {
+                "owmsIdentifier": self.organisatie.owms_identifier,
+            },
+            "bevoegdeOrganisatie": None,
+            "locaties": [{"naam": self.locatie.naam}],
+            "vertalingen": [
+                get_vertaling("nl", tekst=f"Tekst van {product.pk}"),
+                get_vertaling("en", tekst=f"Text of {product.pk}"),
+            ],
+            **overrides,
+        }
+
+    def test_batch(self):
+        products = [self.create_product() for _ in range(3)]
+
+        response = self.client.post(
+            self.url,
+            [self.get_payload(product) for product in products],
+            format="json",
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        data = response.json()
+        self.assertEqual(
+            [result["uuid"] for result in data],
+            [str(product.uuid) for product in products],
+        )
+        self.assertEqual([result["fouten"] for result in data], [None, None, None])
+
+        for product in products:
+            product_versie = Product.objects.get(pk=product.pk).most_recent_version
+            self.assertEqual(product_versie.versie, 1)
+            self.assertEqual(
+                {
+                    vertaling.taal: vertaling.specifieke_tekst
+                    for vertaling in product_versie.vertalingen.all()
+                },
+                {"nl": f"Tekst van {product.pk}", "en": f"Text of {product.pk}"},
+            )
+            self.assertEqual(list(product.locaties.all()), [self.locatie])
+
+    def test_batch_creates_new_versions(self):
+        products = [self.create_product() for _ in range(2)]
+        payloads = [
+            self.get_payload(product, publicatieDatum=str(NOW_DATE))
+            for product in products
+        ]
+
+        self.client.post(self.url, payloads, format="json")
+        response = self.client.post(self.url, payloads, format="json")
+
+        self.assertEqual([result["versie"] for result in response.json()], [2, 2])
+        for product in products:
+            product_versie = Product.objects.get(pk=product.pk).most_recent_version
+            self.assertEqual(product_versie.versie, 2)
+            self.assertEqual(product_versie.publicatie_datum, NOW_DATE)
+            self.assertEqual(product_versie.vertalingen.count(), 2)
+
+    @override_settings(SDG_API_RESPONSE_CACHE_ENABLED=True)
+    def test_batch_invalidates_cached_responses(self):
+        get_response_cache().clear()
+        product = self.create_product()
+        list_url = reverse("api:product-list")
+
+        self.client.credentials()
+        self.assertEqual(self.client.get(list_url).json()["results"], [])
+
+        self.client.credentials(
+            HTTP_AUTHORIZATION=f"Token {self.token_authorization.token}"
+        )
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.post(
+                self.url,
+                [self.get_payload(product, publicatieDatum=str(NOW_DATE), locaties=[])],
+                format="json",
+            )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+        self.client.credentials()
+        self.assertEqual(
+            [result["uuid"] for result in self.client.get(list_url).json()["results"]],
+            [str(product.uuid)],
+        )
+
+    @override_settings(SDG_API_TOKEN_LAST_SEEN_INTERVAL=0)
+    def test_number_of_queries_does_not_depend_on_batch_size(self):
+        products = [self.create_product() for _ in range(6)]
+
+        def count_queries(products):
+            with CaptureQueriesContext(connection) as context:
+                response = self.client.post(
+                    self.url,
+                    [
+                        self.get_payload(product, publicatieDatum=str(NOW_DATE))
+                        for product in products
+                    ],
+                    format="json",
+                )
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            return len(context.captured_queries)
+
+        # Cache the token.
+        count_queries([])
+        self.assertEqual(count_queries(products[:2]), count_queries(products[2:]))
+
+    def test_invalid_products_are_reported(self):
+        product = self.create_product()
+        other_lokale_overheid = LokaleOverheidFactory.create(
+            automatisch_catalogus_aanmaken=False,
+            organisatie__owms_identifier="https://www.example.com/andere-gemeente",
+        )
+
+        response = self.client.post(
+            self.url,
+            [
+                self.get_payload(product, upnUri="https://example.com/onbekend"),
+                self.get_payload(product),
+                self.get_payload(product),
+                self.get_payload(
+                    product,
+                    verantwoordelijkeOrganisatie={
+                        "owmsIdentifier": other_lokale_overheid.organisatie.owms_identifier
+                    },
+                ),
+                self.get_payload(product, vertalingen=[]),
+            ],
+            format="json",
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        data = response.json()
+
+        self.assertEqual(data[0]["uuid"], None)
+        self.assertIn("", data[0]["fouten"])
+        self.assertEqual(data[1]["uuid"], str(product.uuid))
+        self.assertEqual(data[1]["fouten"], None)
+        self.assertIn("nonFieldErrors", data[2]["fouten"])
+        self.assertIn("verantwoordelijkeOrganisatie", data[3]["fouten"])
+        self.assertIn("vertalingen", data[4]["fouten"])
+
+    def test_batch_requires_list(self):
+        response = self.client.post(
+            self.url, {"upnUri": "https://example.com"}, format="json"
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    @override_settings(SDG_API_PRODUCT_BATCH_MAX_SIZE=1)
+    def test_batch_max_size(self):
+        product = self.create_product()
+
+        response = self.client.post(
+            self.url, [self.get_payload(product)] * 2, format="json"
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_batch_requires_token(self):
+        self.client.credentials()
+
+        response = self.client.post(self.url, [], format="json")
+
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
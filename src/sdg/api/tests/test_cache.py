@@ -0,0 +1,427 @@
+import gzip
+import uuid
+from unittest.mock import patch
+from urllib.parse import urlencode
+
+from django.test import override_settings
+from django.utils.timezone import now
+
+import brotli
+from rest_framework import status
+from rest_framework.reverse import reverse
+from rest_framework.test import APITestCase
+
+from sdg.api.cache import (
+    ProductDocumentCache,
+    bump_response_cache_generation,
+    get_product_cache,
+    get_response_cache,
+    invalidate_product_documents,
+)
+from sdg.api.tests.factories.token import TokenAuthorizationFactory
+from sdg.core.db.routers import ReplicaRouter, replica_reads_enabled
+from sdg.core.metrics import get_metrics_cache, metrics_recorder
+from sdg.organisaties.models import Lokatie as Locatie
+from sdg.organisaties.tests.factories.overheid import (
+    LocatieFactory,
+    LokaleOverheidFactory,
+)
+from sdg.producten.models import (
+    CheckedUrl,
+    LocalizedProduct,
+    Product,
+    ProductUrl,
+    ProductUrlIndex,
+)
+from sdg.producten.tests.constants import PAST_DATE
+from sdg.producten.tests.factories.localized import LocalizedProductFactory
+from sdg.producten.tests.factories.product import (
+    BrokenLinksFactory,
+    ReferentieProductVersieFactory,
+)
+
+
+@override_settings(
+    SDG_API_WHITELISTING_ENABLED=False, SDG_API_PRODUCT_CACHE_ENABLED=True
+)
+class ProductDocumentCacheTests(APITestCase):
+    list_url = reverse("api:product-list")
+
+    def setUp(self):
+        get_product_cache().clear()
+
+        self.product_versie = ReferentieProductVersieFactory.create(
+            publicatie_datum=PAST_DATE
+        )
+        self.product = self.product_versie.product
+        self.nl, self.en = LocalizedProductFactory.create_batch(
+            2, product_versie=self.product_versie
+        )
+        self.detail_url = reverse(
+            "api:product-detail", kwargs={"uuid": self.product.uuid}
+        )
+
+    def test_list_is_served_from_cache(self):
+        with override_settings(SDG_API_PRODUCT_CACHE_ENABLED=False):
+            expected = self.client.get(self.list_url).json()
+
+        response = self.client.get(self.list_url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.json(), expected)
+
+        # Only the count, the page of products and the validators remain.
+        with self.assertNumQueries(3):
+            response = self.client.get(self.list_url)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.json(), expected)
+
+    def test_retrieve_is_served_from_cache(self):
+        with override_settings(SDG_API_PRODUCT_CACHE_ENABLED=False):
+            expected = self.client.get(self.detail_url).json()
+
+        self.client.get(self.detail_url)
+
+        with self.assertNumQueries(2):
+            response = self.client.get(self.detail_url)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.json(), expected)
+
+    def test_documents_are_rendered_from_primary(self):
+        reads = []
+
+        def db_for_read(router, model, **hints):
+            reads.append((model, replica_reads_enabled()))
+            return "default"
+
+        with override_settings(DB_REPLICAS=["replica"]), patch.object(
+            ReplicaRouter, "db_for_read", db_for_read
+        ):
+            self.client.get(self.list_url)
+
+        # The page is read from a replica, the documents from the primary.
+        self.assertIn((Product, True), reads)
+        self.assertIn((LocalizedProduct, False), reads)
+        self.assertNotIn((LocalizedProduct, True), reads)
+
+    def test_variants_are_cached_separately(self):
+        self.client.get(self.detail_url)
+
+        response = self.client.get(self.detail_url, {"taal": "en"})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+        vertalingen = response.json()["vertalingen"]
+        self.assertEqual([vertaling["taal"] for vertaling in vertalingen], ["en"])
+
+        response = self.client.get(self.detail_url)
+        self.assertEqual(len(response.json()["vertalingen"]), 2)
+
+    def test_localized_product_invalidates_cache(self):
+        self.client.get(self.detail_url)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.nl.specifieke_tekst = "Nieuwe tekst"
+            self.nl.save()
+
+        response = self.client.get(self.detail_url)
+
+        vertaling = next(
+            vertaling
+            for vertaling in response.json()["vertalingen"]
+            if vertaling["taal"] == "nl"
+        )
+        self.assertEqual(vertaling["tekst"], "Nieuwe tekst")
+
+    def test_organisatie_invalidates_cache(self):
+        self.client.get(self.detail_url)
+        organisatie = self.product.catalogus.lokale_overheid.organisatie
+
+        with self.captureOnCommitCallbacks(execute=True):
+            organisatie.owms_pref_label = "Nieuwe gemeente"
+            organisatie.save()
+
+        response = self.client.get(self.detail_url)
+
+        self.assertEqual(
+            response.json()["verantwoordelijkeOrganisatie"]["owmsPrefLabel"],
+            "Nieuwe gemeente",
+        )
+
+    def test_upn_invalidates_cache(self):
+        self.client.get(self.detail_url)
+        upn = self.product.generiek_product.upn
+
+        with self.captureOnCommitCallbacks(execute=True):
+            upn.upn_label = "Nieuw product"
+            upn.save()
+
+        response = self.client.get(self.detail_url)
+
+        self.assertEqual(response.json()["upnLabel"], "Nieuw product")
+
+    def test_documents_rendered_before_invalidation_are_not_used(self):
+        cache = ProductDocumentCache("variant")
+        self.assertEqual(cache.get_many([self.product.pk]), {})
+
+        invalidate_product_documents([self.product.pk])
+        cache.set_many({self.product.pk: {"stale": True}})
+
+        self.assertEqual(
+            ProductDocumentCache("variant").get_many([self.product.pk]), {}
+        )
+
+    def test_variants_do_not_overwrite_each_other(self):
+        nl, en = ProductDocumentCache("nl"), ProductDocumentCache("en")
+        nl.get_many([self.product.pk])
+        en.get_many([self.product.pk])
+
+        nl.set_many({self.product.pk: {"taal": "nl"}})
+        en.set_many({self.product.pk: {"taal": "en"}})
+
+        self.assertEqual(
+            ProductDocumentCache("nl").get_many([self.product.pk]),
+            {self.product.pk: {"taal": "nl"}},
+        )
+
+    def test_lokatie_invalidates_cache(self):
+        locatie = LocatieFactory.create(
+            lokale_overheid=self.product.catalogus.lokale_overheid
+        )
+        with self.captureOnCommitCallbacks(execute=True):
+            self.product.locaties.add(locatie)
+
+        self.client.get(self.detail_url)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            locatie.naam = "Stadskantoor"
+            locatie.save()
+
+        response = self.client.get(self.detail_url)
+
+        self.assertEqual(response.json()["locaties"][0]["naam"], "Stadskantoor")
+
+    def test_product_versie_invalidates_cache(self):
+        self.client.get(self.detail_url)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            new_versie = ReferentieProductVersieFactory.create(
+                product=self.product,
+                versie=self.product_versie.versie + 1,
+                publicatie_datum=PAST_DATE,
+            )
+
+        response = self.client.get(self.detail_url)
+
+        self.assertEqual(response.json()["versie"], new_versie.versie)
+
+    @override_settings(SDG_METRICS_FLUSH_INTERVAL=0)
+    def test_metrics(self):
+        # Discard the metrics of the other tests.
+        metrics_recorder.flush()
+        get_metrics_cache().clear()
+
+        self.client.get(self.detail_url)
+        self.client.get(self.detail_url)
+        self.client.get(self.detail_url)
+
+        token_authorization = TokenAuthorizationFactory.create()
+        response = self.client.get(
+            reverse("api:metrics"),
+            HTTP_AUTHORIZATION=f"Token {token_authorization.token}",
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response["Content-Type"], "text/plain; charset=utf-8")
+
+        content = response.content.decode()
+        self.assertIn("sdg_api_product_cache_hits_total 2\n", content)
+        self.assertIn("sdg_api_product_cache_misses_total 1\n", content)
+        self.assertIn("sdg_api_product_cache_hit_ratio 0.6666666666666666\n", content)
+        self.assertIn(
+            'sdg_runs_total{kind="http",name="api:product-detail"} 3\n', content
+        )
+        self.assertIn(
+            'sdg_queries_total{kind="http",name="api:product-detail"} ', content
+        )
+
+    def test_metrics_requires_token(self):
+        response = self.client.get(reverse("api:metrics"))
+
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+
+@override_settings(
+    SDG_API_WHITELISTING_ENABLED=False, SDG_API_RESPONSE_CACHE_ENABLED=True
+)
+class ResponseCacheTests(APITestCase):
+    def setUp(self):
+        get_response_cache().clear()
+
+        self.lokale_overheid = LokaleOverheidFactory.create()
+        self.locatie = LocatieFactory.create(lokale_overheid=self.lokale_overheid)
+        self.list_url = reverse("api:locatie-list")
+        self.detail_url = reverse(
+            "api:locatie-detail", kwargs={"uuid": self.locatie.uuid}
+        )
+
+    def test_anonymous_responses_are_cached(self):
+        expected = self.client.get(self.detail_url)
+
+        with self.assertNumQueries(0):
+            response = self.client.get(self.detail_url)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.content, expected.content)
+        self.assertEqual(response["Content-Type"], expected["Content-Type"])
+
+    def test_cached_responses_are_rendered_from_primary(self):
+        reads = []
+
+        def db_for_read(router, model, **hints):
+            reads.append(replica_reads_enabled())
+            return "default"
+
+        with override_settings(DB_REPLICAS=["replica"]), patch.object(
+            ReplicaRouter, "db_for_read", db_for_read
+        ):
+            self.client.get(self.detail_url)
+
+        self.assertTrue(reads)
+        self.assertNotIn(True, reads)
+
+    def test_query_string_is_normalized(self):
+        params = {"organisatie": str(self.lokale_overheid.uuid), "page": "1"}
+        expected = self.client.get(f"{self.list_url}?{urlencode(params)}")
+
+        with self.assertNumQueries(0):
+            response = self.client.get(
+                f"{self.list_url}?{urlencode(dict(reversed(params.items())))}"
+            )
+
+        self.assertEqual(response.content, expected.content)
+
+        response = self.client.get(self.list_url, {"organisatie": str(uuid.uuid4())})
+        self.assertEqual(response.json()["results"], [])
+
+    def test_conditional_requests(self):
+        etag = self.client.get(reverse("api:productencatalogus-list"))["ETag"]
+
+        with self.assertNumQueries(0):
+            response = self.client.get(
+                reverse("api:productencatalogus-list"), HTTP_IF_NONE_MATCH=etag
+            )
+
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+        self.assertEqual(response["ETag"], etag)
+
+    def test_authenticated_responses_are_not_cached(self):
+        token_authorization = TokenAuthorizationFactory.create(
+            lokale_overheid=self.lokale_overheid
+        )
+        self.client.credentials(HTTP_AUTHORIZATION=f"Token {token_authorization.token}")
+        self.client.get(self.detail_url)
+
+        with self.captureOnCommitCallbacks(execute=False):
+            self.locatie.naam = "Stadskantoor"
+            self.locatie.save()
+
+        response = self.client.get(self.detail_url)
+
+        self.assertEqual(response.json()["naam"], "Stadskantoor")
+
+    def test_changes_invalidate_cache(self):
+        self.client.get(self.detail_url)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.locatie.naam = "Stadskantoor"
+            self.locatie.save()
+
+        response = self.client.get(self.detail_url)
+
+        self.assertEqual(response.json()["naam"], "Stadskantoor")
+
+    def test_internal_changes_do_not_invalidate_cache(self):
+        self.client.get(self.detail_url)
+        product = ReferentieProductVersieFactory.create().product
+        ProductUrl.objects.create(
+            index=ProductUrlIndex.objects.create(product=product, geindexeerd_op=now()),
+            field_name="specifieke_tekst",
+            taal="nl",
+            url="https://example.com",
+        )
+
+        with self.captureOnCommitCallbacks(execute=True) as callbacks:
+            CheckedUrl.objects.create(
+                url_hash=CheckedUrl.hash_url("https://example.com"),
+                url="https://example.com",
+                status_code=200,
+                checked_at=now(),
+                expires_at=now(),
+            )
+            BrokenLinksFactory.create(product=product)
+            ProductUrlIndex.objects.all().delete()
+
+        self.assertEqual(callbacks, [])
+        with self.assertNumQueries(0):
+            self.client.get(self.detail_url)
+
+    def test_bumped_generation_invalidates_cache(self):
+        self.client.get(self.detail_url)
+        Locatie.objects.filter(pk=self.locatie.pk).update(naam="Stadskantoor")
+
+        self.assertNotEqual(
+            self.client.get(self.detail_url).json()["naam"], "Stadskantoor"
+        )
+
+        bump_response_cache_generation()
+
+        self.assertEqual(
+            self.client.get(self.detail_url).json()["naam"], "Stadskantoor"
+        )
+
+    def test_responses_are_compressed(self):
+        for _ in range(3):
+            product_versie = ReferentieProductVersieFactory.create(
+                publicatie_datum=PAST_DATE
+            )
+            LocalizedProductFactory.create_batch(2, product_versie=product_versie)
+        list_url = reverse("api:product-list")
+
+        # The first response is compressed when it is cached.
+        response = self.client.get(list_url, HTTP_ACCEPT_ENCODING="gzip, br")
+        expected = self.client.get(list_url)
+
+        self.assertEqual(response["Content-Encoding"], "br")
+        self.assertEqual(brotli.decompress(response.content), expected.content)
+        self.assertNotIn("Content-Encoding", expected)
+        self.assertIn("Accept-Encoding", expected["Vary"])
+
+        with self.assertNumQueries(0):
+            response = self.client.get(
+                list_url, HTTP_ACCEPT_ENCODING="br;q=0, gzip;q=0.8"
+            )
+
+        self.assertEqual(response["Content-Encoding"], "gzip")
+        self.assertEqual(gzip.decompress(response.content), expected.content)
+        self.assertEqual(response["ETag"], f"W/{expected['ETag']}")
+        self.assertIn("Accept-Encoding", response["Vary"])
+
+        response = self.client.get(list_url, HTTP_ACCEPT_ENCODING="gzip;q=0")
+
+        self.assertNotIn("Content-Encoding", response)
+        self.assertEqual(response.content, expected.content)
+
+        response = self.client.get(
+            list_url,
+            HTTP_ACCEPT_ENCODING="gzip",
+            HTTP_IF_NONE_MATCH=f"W/{expected['ETag']}",
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+
+    def test_small_responses_are_not_compressed(self):
+        response = self.client.get(self.detail_url, HTTP_ACCEPT_ENCODING="gzip")
+
+        self.assertNotIn("Content-Encoding", response)
+        self.assertEqual(response.json()["naam"], self.locatie.naam)
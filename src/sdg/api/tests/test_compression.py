@@ -0,0 +1,30 @@
+from django.test import SimpleTestCase
+
+from sdg.api.compression import BROTLI, ENCODINGS, GZIP, negotiate_encoding
+
+
+class NegotiateEncodingTests(SimpleTestCase):
+    def test_preferred_encoding(self):
+        self.assertEqual(negotiate_encoding("gzip, deflate, br", ENCODINGS), BROTLI)
+        self.assertEqual(negotiate_encoding("gzip, deflate", ENCODINGS), GZIP)
+        self.assertEqual(negotiate_encoding("x-gzip", ENCODINGS), GZIP)
+        self.assertEqual(negotiate_encoding("*", ENCODINGS), BROTLI)
+
+    def test_quality_values(self):
+        self.assertEqual(negotiate_encoding("br;q=0.5, gzip", ENCODINGS), GZIP)
+        self.assertEqual(negotiate_encoding("br; q=0, *", ENCODINGS), GZIP)
+        self.assertEqual(negotiate_encoding("gzip;q=0.1", ENCODINGS), GZIP)
+        self.assertEqual(negotiate_encoding("GZIP;Q=1.0", ENCODINGS), GZIP)
+
+    def test_not_acceptable(self):
+        self.assertIsNone(negotiate_encoding(None, ENCODINGS))
+        self.assertIsNone(negotiate_encoding("", ENCODINGS))
+        self.assertIsNone(negotiate_encoding("deflate", ENCODINGS))
+        self.assertIsNone(negotiate_encoding("gzip;q=0, br;q=0", ENCODINGS))
+        self.assertIsNone(negotiate_encoding("*;q=0", ENCODINGS))
+        self.assertIsNone(negotiate_encoding("gzip;q=invalid", ENCODINGS))
+        self.assertIsNone(negotiate_encoding("br", [GZIP]))
+
+    def test_identity_preferred(self):
+        self.assertIsNone(negotiate_encoding("identity, gzip;q=0.5", ENCODINGS))
+        self.assertEqual(negotiate_encoding("identity;q=0.5, gzip", ENCODINGS), GZIP)
@@ -0,0 +1,283 @@
+import time
+from datetime import timedelta
+
+from django.test import override_settings
+from django.utils.http import http_date, parse_http_date
+from django.utils.timezone import now
+
+from freezegun import freeze_time
+from rest_framework import status
+from rest_framework.reverse import reverse
+from rest_framework.test import APITestCase
+
+from sdg.core.constants import GenericProductStatus
+from sdg.core.tests.factories.catalogus import ProductenCatalogusFactory
+from sdg.core.tests.factories.logius import OverheidsorganisatieFactory
+from sdg.organisaties.tests.factories.overheid import LocatieFactory
+from sdg.producten.models import GeneriekProduct, Product
+from sdg.producten.tests.constants import PAST_DATE
+from sdg.producten.tests.factories.localized import (
+    LocalizedGeneriekProductFactory,
+    LocalizedProductFactory,
+)
+from sdg.producten.tests.factories.product import ReferentieProductVersieFactory
+
+
+@override_settings(SDG_API_WHITELISTING_ENABLED=False)
+class ProductConditionalGetTests(APITestCase):
+    list_url = reverse("api:product-list")
+
+    def setUp(self):
+        self.product_versie = ReferentieProductVersieFactory.create(
+            publicatie_datum=PAST_DATE
+        )
+        self.product = self.product_versie.product
+        self.nl, self.en = LocalizedProductFactory.create_batch(
+            2, product_versie=self.product_versie
+        )
+        self.detail_url = reverse(
+            "api:product-detail", kwargs={"uuid": self.product.uuid}
+        )
+
+    def test_list_not_modified(self):
+        response = self.client.get(self.list_url)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertIn("ETag", response)
+        self.assertNotIn("Last-Modified", response)
+
+        # The count, the page of products and the validators, the products are
+        # not serialized.
+        with self.assertNumQueries(3):
+            not_modified = self.client.get(
+                self.list_url, HTTP_IF_NONE_MATCH=response["ETag"]
+            )
+
+        self.assertEqual(not_modified.status_code, status.HTTP_304_NOT_MODIFIED)
+        self.assertEqual(not_modified["ETag"], response["ETag"])
+        self.assertEqual(not_modified.content, b"")
+
+    def test_retrieve_not_modified(self):
+        response = self.client.get(self.detail_url)
+
+        not_modified = self.client.get(
+            self.detail_url, HTTP_IF_NONE_MATCH=response["ETag"]
+        )
+        self.assertEqual(not_modified.status_code, status.HTTP_304_NOT_MODIFIED)
+
+        not_modified = self.client.get(
+            self.detail_url, HTTP_IF_MODIFIED_SINCE=response["Last-Modified"]
+        )
+        self.assertEqual(not_modified.status_code, status.HTTP_304_NOT_MODIFIED)
+
+    def test_list_ignores_if_modified_since(self):
+        other_versie = ReferentieProductVersieFactory.create(publicatie_datum=PAST_DATE)
+        LocalizedProductFactory.create_batch(2, product_versie=other_versie)
+        response = self.client.get(self.list_url)
+
+        self.product.api_verborgen = True
+        self.product.save()
+
+        modified = self.client.get(
+            self.list_url, HTTP_IF_MODIFIED_SINCE=http_date(time.time() + 24 * 60 * 60)
+        )
+        self.assertEqual(modified.status_code, status.HTTP_200_OK)
+        self.assertNotEqual(modified["ETag"], response["ETag"])
+
+    def test_last_modified_is_in_gmt(self):
+        before = int(time.time())
+        self.nl.save()
+
+        response = self.client.get(self.detail_url)
+
+        self.assertTrue(
+            before <= parse_http_date(response["Last-Modified"]) <= time.time()
+        )
+
+    def test_etag_depends_on_query_parameters(self):
+        response = self.client.get(self.list_url)
+        filtered = self.client.get(self.list_url, {"taal": "nl"})
+
+        self.assertNotEqual(response["ETag"], filtered["ETag"])
+
+        modified = self.client.get(
+            self.list_url, {"taal": "nl"}, HTTP_IF_NONE_MATCH=response["ETag"]
+        )
+        self.assertEqual(modified.status_code, status.HTTP_200_OK)
+
+    def test_modified_translation(self):
+        response = self.client.get(self.detail_url)
+
+        self.nl.specifieke_tekst = "Nieuwe tekst"
+        self.nl.save()
+
+        modified = self.client.get(self.detail_url, HTTP_IF_NONE_MATCH=response["ETag"])
+        self.assertEqual(modified.status_code, status.HTTP_200_OK)
+        self.assertNotEqual(modified["ETag"], response["ETag"])
+
+    def test_modified_location(self):
+        locatie = LocatieFactory.create(
+            lokale_overheid=self.product.catalogus.lokale_overheid
+        )
+        self.product.locaties.add(locatie)
+        response = self.client.get(self.detail_url)
+
+        locatie.naam = "Stadskantoor"
+        locatie.save()
+
+        modified = self.client.get(self.detail_url, HTTP_IF_NONE_MATCH=response["ETag"])
+        self.assertEqual(modified.status_code, status.HTTP_200_OK)
+
+    def test_removed_location(self):
+        locatie = LocatieFactory.create(
+            lokale_overheid=self.product.catalogus.lokale_overheid
+        )
+        self.product.locaties.add(locatie)
+        response = self.client.get(self.detail_url)
+
+        self.product.locaties.remove(locatie)
+
+        modified = self.client.get(self.detail_url, HTTP_IF_NONE_MATCH=response["ETag"])
+        self.assertEqual(modified.status_code, status.HTTP_200_OK)
+        self.assertEqual(modified.json()["locaties"], [])
+
+    def test_hidden_product(self):
+        response = self.client.get(self.list_url)
+
+        self.product.api_verborgen = True
+        self.product.save()
+
+        modified = self.client.get(self.list_url, HTTP_IF_NONE_MATCH=response["ETag"])
+        self.assertEqual(modified.status_code, status.HTTP_200_OK)
+        self.assertEqual(modified.json()["count"], 0)
+
+    def test_renamed_organisation(self):
+        response = self.client.get(self.detail_url)
+
+        organisatie = self.product.catalogus.lokale_overheid.organisatie
+        organisatie.owms_pref_label = "Nieuwe naam"
+        organisatie.save()
+
+        modified = self.client.get(self.detail_url, HTTP_IF_NONE_MATCH=response["ETag"])
+        self.assertEqual(modified.status_code, status.HTTP_200_OK)
+
+    def test_renamed_upn(self):
+        response = self.client.get(self.detail_url)
+
+        upn = self.product.generiek_product.upn
+        upn.upn_label = "Nieuw label"
+        upn.save()
+
+        modified = self.client.get(self.detail_url, HTTP_IF_NONE_MATCH=response["ETag"])
+        self.assertEqual(modified.status_code, status.HTTP_200_OK)
+        self.assertEqual(modified.json()["upnLabel"], "Nieuw label")
+
+    def test_version_becomes_active(self):
+        ReferentieProductVersieFactory.create(
+            product=self.product,
+            versie=self.product_versie.versie + 1,
+            publicatie_datum=now().date() + timedelta(days=1),
+        )
+        response = self.client.get(self.detail_url)
+
+        with freeze_time(now() + timedelta(days=1)):
+            modified = self.client.get(
+                self.detail_url, HTTP_IF_NONE_MATCH=response["ETag"]
+            )
+
+        self.assertEqual(modified.status_code, status.HTTP_200_OK)
+        self.assertEqual(modified.json()["versie"], self.product_versie.versie + 1)
+
+
+@override_settings(SDG_API_WHITELISTING_ENABLED=False)
+class CatalogusConditionalGetTests(APITestCase):
+    def test_retrieve_not_modified(self):
+        catalogus = ProductenCatalogusFactory.create()
+        url = reverse("api:productencatalogus-detail", kwargs={"uuid": catalogus.uuid})
+
+        response = self.client.get(url)
+        not_modified = self.client.get(url, HTTP_IF_NONE_MATCH=response["ETag"])
+        self.assertEqual(not_modified.status_code, status.HTTP_304_NOT_MODIFIED)
+
+        catalogus.toelichting = "Nieuwe toelichting"
+        catalogus.save()
+
+        modified = self.client.get(url, HTTP_IF_NONE_MATCH=response["ETag"])
+        self.assertEqual(modified.status_code, status.HTTP_200_OK)
+
+    def test_product_is_hidden(self):
+        product_versie = ReferentieProductVersieFactory.create(
+            publicatie_datum=PAST_DATE
+        )
+        product = product_versie.product
+        url = reverse(
+            "api:productencatalogus-detail", kwargs={"uuid": product.catalogus.uuid}
+        )
+
+        response = self.client.get(url)
+        self.assertEqual(len(response.json()["producten"]), 1)
+
+        # The generic product status is updated in bulk as well.
+        GeneriekProduct.objects.filter(pk=product.generiek_product_id).update(
+            product_status=GenericProductStatus.DELETED
+        )
+
+        modified = self.client.get(url, HTTP_IF_NONE_MATCH=response["ETag"])
+        self.assertEqual(modified.status_code, status.HTTP_200_OK)
+        self.assertEqual(modified.json()["producten"], [])
+
+    def test_product_is_removed(self):
+        product_versie = ReferentieProductVersieFactory.create(
+            publicatie_datum=PAST_DATE
+        )
+        other_versie = ReferentieProductVersieFactory.create(
+            publicatie_datum=PAST_DATE,
+            product__catalogus=product_versie.product.catalogus,
+        )
+        url = reverse(
+            "api:productencatalogus-detail",
+            kwargs={"uuid": product_versie.product.catalogus.uuid},
+        )
+
+        response = self.client.get(url)
+
+        Product.objects.filter(pk=other_versie.product_id).delete()
+
+        modified = self.client.get(url, HTTP_IF_NONE_MATCH=response["ETag"])
+        self.assertEqual(modified.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(modified.json()["producten"]), 1)
+
+
+@override_settings(SDG_API_WHITELISTING_ENABLED=False)
+class GeneriekProductConditionalGetTests(APITestCase):
+    url = reverse("api:generic-product-list")
+
+    def test_list_not_modified(self):
+        LocalizedGeneriekProductFactory.create()
+
+        response = self.client.get(self.url)
+        not_modified = self.client.get(self.url, HTTP_IF_NONE_MATCH=response["ETag"])
+        self.assertEqual(not_modified.status_code, status.HTTP_304_NOT_MODIFIED)
+
+    def test_modified_without_import_dates(self):
+        product = LocalizedGeneriekProductFactory.create(
+            datum_check=None, laatst_gewijzigd=None
+        )
+        response = self.client.get(self.url)
+
+        product.generieke_tekst = "Nieuwe tekst"
+        product.save()
+
+        modified = self.client.get(self.url, HTTP_IF_NONE_MATCH=response["ETag"])
+        self.assertEqual(modified.status_code, status.HTTP_200_OK)
+
+    def test_removed_role(self):
+        product = LocalizedGeneriekProductFactory.create()
+        organisaties = OverheidsorganisatieFactory.create_batch(2)
+        product.generiek_product.verantwoordelijke_organisaties.set(organisaties)
+        response = self.client.get(self.url)
+
+        product.generiek_product.verantwoordelijke_organisaties.remove(organisaties[0])
+
+        modified = self.client.get(self.url, HTTP_IF_NONE_MATCH=response["ETag"])
+        self.assertEqual(modified.status_code, status.HTTP_200_OK)
@@ -0,0 +1,107 @@
+import gzip
+import json
+import os
+import tempfile
+from io import StringIO
+
+from django.core.management import call_command
+from django.test import override_settings
+
+from rest_framework import status
+from rest_framework.reverse import reverse
+from rest_framework.test import APITestCase
+
+from sdg.api.tests.factories.token import TokenAuthorizationFactory
+from sdg.producten.tests.constants import PAST_DATE
+from sdg.producten.tests.factories.localized import LocalizedProductFactory
+from sdg.producten.tests.factories.product import ReferentieProductVersieFactory
+
+
+def read_ndjson(content: bytes) -> list:
+    lines = content.decode().splitlines()
+    return [json.loads(line) for line in lines]
+
+
+@override_settings(SDG_API_WHITELISTING_ENABLED=False)
+class ProductExportTests(APITestCase):
+    url = reverse("api:product-export")
+
+    def setUp(self):
+        self.product_versies = ReferentieProductVersieFactory.create_batch(
+            3, publicatie_datum=PAST_DATE
+        )
+        for product_versie in self.product_versies:
+            LocalizedProductFactory.create_batch(2, product_versie=product_versie)
+
+        token_authorization = TokenAuthorizationFactory.create()
+        self.client.credentials(HTTP_AUTHORIZATION=f"Token {token_authorization.token}")
+
+    def test_export(self):
+        expected = self.client.get(reverse("api:product-list")).json()["results"]
+
+        response = self.client.get(self.url)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response["Content-Type"], "application/x-ndjson")
+        self.assertTrue(response.streaming)
+        self.assertNotIn("Content-Encoding", response)
+
+        products = read_ndjson(b"".join(response.streaming_content))
+        self.assertEqual(
+            sorted(products, key=lambda product: product["uuid"]),
+            sorted(expected, key=lambda product: product["uuid"]),
+        )
+
+    def test_export_gzip(self):
+        response = self.client.get(self.url, HTTP_ACCEPT_ENCODING="gzip, deflate")
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response["Content-Encoding"], "gzip")
+        self.assertIn("Accept-Encoding", response["Vary"])
+
+        content = gzip.decompress(b"".join(response.streaming_content))
+        self.assertEqual(len(read_ndjson(content)), 3)
+
+    def test_export_filters(self):
+        product = self.product_versies[0].product
+        response = self.client.get(
+            self.url,
+            {"catalogus": str(product.catalogus.uuid)},
+        )
+
+        products = read_ndjson(b"".join(response.streaming_content))
+        self.assertEqual([p["uuid"] for p in products], [str(product.uuid)])
+
+    def test_export_requires_token(self):
+        self.client.credentials()
+
+        response = self.client.get(self.url)
+
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+
+@override_settings(ALLOWED_HOSTS=["localhost"])
+class ExportProductsCommandTests(APITestCase):
+    def test_export_products(self):
+        product_versies = ReferentieProductVersieFactory.create_batch(
+            3, publicatie_datum=PAST_DATE
+        )
+
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "producten.ndjson.gz")
+            call_command(
+                "export_products",
+                output=path,
+                gzip=True,
+                chunk_size=2,
+                stderr=StringIO(),
+            )
+
+            with gzip.open(path) as f:
+                products = read_ndjson(f.read())
+
+        self.assertEqual(
+            sorted(product["uuid"] for product in products),
+            sorted(str(versie.product.uuid) for versie in product_versies),
+        )
+        self.assertTrue(products[0]["url"].startswith("http://localhost/api/v1/"))
@@ -1,3 +1,6 @@
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
 from freezegun import freeze_time
 from rest_framework import status
 from rest_framework.reverse import reverse
@@ -404,6 +407,87 @@ class ProductFilterTests(APITestCase):
 
         self.assertEqual("nl", first_result["vertalingen"][0]["taal"])
 
+    def test_filter_zoek(self):
+        product_versie = ReferentieProductVersieFactory.create(
+            publicatie_datum=PAST_DATE
+        )
+        LocalizedProductFactory.create(
+            product_versie=product_versie,
+            taal=TaalChoices.nl,
+            vereisten="Een uittreksel uit de basisregistratie personen.",
+        )
+        LocalizedProductFactory.create(
+            product_versie=product_versie,
+            taal=TaalChoices.en,
+            vereisten="An extract from the personal records database.",
+        )
+        other_versie = ReferentieProductVersieFactory.create(publicatie_datum=PAST_DATE)
+        LocalizedProductFactory.create_batch(2, product_versie=other_versie)
+
+        response = self.client.get(self.url, {"zoek": "uittreksels"})
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        data = response.json()["results"]
+        self.assertEqual(
+            [product["uuid"] for product in data], [str(product_versie.product.uuid)]
+        )
+
+        response = self.client.get(self.url, {"zoek": "uittreksels", "taal": "en"})
+        self.assertEqual(response.json()["results"], [])
+
+        response = self.client.get(self.url, {"zoek": "extract", "taal": "en"})
+        self.assertEqual(len(response.json()["results"]), 1)
+
+    def test_filter_zoek_only_searches_the_returned_version(self):
+        product_versie = ReferentieProductVersieFactory.create(
+            versie=1, publicatie_datum=PAST_DATE
+        )
+        LocalizedProductFactory.create(
+            product_versie=product_versie,
+            taal=TaalChoices.nl,
+            vereisten="Een geldig paspoort.",
+        )
+        concept_versie = ReferentieProductVersieFactory.create(
+            product=product_versie.product, versie=2, publicatie_datum=None
+        )
+        LocalizedProductFactory.create(
+            product_versie=concept_versie,
+            taal=TaalChoices.nl,
+            vereisten="Een uittreksel uit de basisregistratie personen.",
+        )
+
+        response = self.client.get(self.url, {"zoek": "uittreksel"})
+        self.assertEqual(len(response.json()["results"]), 1)
+
+        self.client.defaults.pop("HTTP_AUTHORIZATION")
+
+        response = self.client.get(self.url, {"zoek": "uittreksel"})
+        self.assertEqual(response.json()["results"], [])
+
+        response = self.client.get(self.url, {"zoek": "paspoort"})
+        self.assertEqual(len(response.json()["results"]), 1)
+
+    def test_filter_taal_only_retrieves_requested_translations(self):
+        product_versie = ReferentieProductVersieFactory.create(
+            publicatie_datum=PAST_DATE
+        )
+        LocalizedProductFactory.create_batch(2, product_versie=product_versie)
+
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.get(self.url, {"taal": "en"})
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        vertalingen = response.json()["results"][0]["vertalingen"]
+        self.assertEqual([vertaling["taal"] for vertaling in vertalingen], ["en"])
+
+        queries = [
+            query["sql"]
+            for query in context.captured_queries
+            if query["sql"].startswith('SELECT "producten_localizedproduct"')
+        ]
+        self.assertEqual(len(queries), 1)
+        self.assertIn(""""producten_localizedproduct"."taal" = 'en'""", queries[0])
+
     def test_filter_organisatie_owms_identifier(self):
         organisatie = OverheidsorganisatieFactory.create(
             owms_identifier="https://www.test_filter_organisatie_owms_identifier.com",
@@ -1,17 +1,23 @@
 import json
 
+from django.db import connection
 from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
 
 from rest_framework import status
 from rest_framework.reverse import reverse
 from rest_framework.test import APITestCase
 
+from sdg.api.cache import get_product_cache
 from sdg.api.tests.factories.token import TokenAuthorizationFactory
 from sdg.core.tests.factories.logius import OverheidsorganisatieFactory
+from sdg.organisaties.models import Lokatie as Locatie
 from sdg.organisaties.tests.factories.overheid import (
     LocatieFactory,
     LokaleOverheidFactory,
 )
+from sdg.producten.tests.constants import PAST_DATE
+from sdg.producten.tests.factories.product import ReferentieProductVersieFactory
 
 
 @override_settings(SDG_API_WHITELISTING_ENABLED=False)
@@ -404,3 +410,204 @@ class LocatiesTests(APITestCase):
         deleted_url = self.client.get(detail_url)
 
         self.assertEqual(deleted_url.status_code, status.HTTP_404_NOT_FOUND)
+
+
+def get_locatie_payload(locatie, **overrides):
+    return {
+        "uuid": str(locatie.uuid),
+        "naam": locatie.naam,
+        "straat": locatie.straat,
+        "nummer": locatie.nummer,
+        "postcode": locatie.postcode,
+        "plaats": locatie.plaats,
+        "land": locatie.land,
+        "openingstijden": {
+            "maandag": locatie.maandag,
+            "dinsdag": locatie.dinsdag,
+            "woensdag": locatie.woensdag,
+            "donderdag": locatie.donderdag,
+            "vrijdag": locatie.vrijdag,
+            "zaterdag": locatie.zaterdag,
+            "zondag": locatie.zondag,
+        },
+        "openingstijdenOpmerking": locatie.openingstijden_opmerking,
+        **overrides,
+    }
+
+
+@override_settings(SDG_API_WHITELISTING_ENABLED=False)
+class LocatieSyncTests(APITestCase):
+    def setUp(self):
+        self.lokale_overheid = LokaleOverheidFactory.create()
+        self.ongewijzigd, self.gewijzigd, self.verwijderd = LocatieFactory.create_batch(
+            3, lokale_overheid=self.lokale_overheid, postcode="1234AB"
+        )
+        self.url = reverse(
+            "api:lokaleoverheid-locaties", kwargs={"uuid": self.lokale_overheid.uuid}
+        )
+
+        token_authorization = TokenAuthorizationFactory.create(
+            lokale_overheid=self.lokale_overheid
+        )
+        self.client.credentials(HTTP_AUTHORIZATION=f"Token {token_authorization.token}")
+
+    def get_payloads(self):
+        return [
+            get_locatie_payload(self.ongewijzigd),
+            # Matched by name.
+            get_locatie_payload(
+                self.gewijzigd,
+                uuid=None,
+                openingstijden={"zaterdag": ["10:00 - 12:00"]},
+            ),
+            {
+                "naam": "Stadskantoor",
+                "straat": "Markt",
+                "nummer": "1",
+                "postcode": "1234AB",
+                "plaats": "Amsterdam",
+                "land": "Nederland",
+                "openingstijden": {"maandag": ["09:00 - 17:00"]},
+            },
+        ]
+
+    def test_replace_locations(self):
+        payloads = self.get_payloads()
+        del payloads[1]["uuid"]
+
+        response = self.client.put(self.url, payloads, format="json")
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        stadskantoor = Locatie.objects.get(naam="Stadskantoor")
+        self.assertEqual(
+            response.json(),
+            {
+                "aangemaakt": [str(stadskantoor.uuid)],
+                "bijgewerkt": [str(self.gewijzigd.uuid)],
+                "ongewijzigd": [str(self.ongewijzigd.uuid)],
+                "verwijderd": [str(self.verwijderd.uuid)],
+            },
+        )
+
+        self.assertEqual(stadskantoor.lokale_overheid, self.lokale_overheid)
+        self.assertEqual(stadskantoor.maandag, ["09:00 - 17:00"])
+        self.gewijzigd.refresh_from_db()
+        self.assertEqual(self.gewijzigd.zaterdag, ["10:00 - 12:00"])
+        self.assertEqual(self.gewijzigd.maandag, ["09:00 - 17:00"])
+        self.assertFalse(Locatie.objects.filter(pk=self.verwijderd.pk).exists())
+
+    def test_update_locations(self):
+        payloads = self.get_payloads()
+        del payloads[1]["uuid"]
+
+        response = self.client.patch(self.url, payloads, format="json")
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.json()["verwijderd"], [])
+        self.assertEqual(self.lokale_overheid.locaties.count(), 4)
+
+    def test_rename_location(self):
+        payloads = [get_locatie_payload(self.gewijzigd, naam=self.verwijderd.naam)]
+
+        response = self.client.put(self.url, payloads, format="json")
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.gewijzigd.refresh_from_db()
+        self.assertEqual(self.gewijzigd.naam, self.verwijderd.naam)
+        self.assertEqual(self.lokale_overheid.locaties.count(), 1)
+
+    def test_number_of_queries_does_not_depend_on_locations(self):
+        payloads = self.get_payloads()
+        del payloads[1]["uuid"]
+        payloads[0]["straat"] = "Dorpsstraat"
+        self.client.patch(self.url, [], format="json")
+
+        with CaptureQueriesContext(connection) as queries:
+            self.client.patch(self.url, payloads, format="json")
+
+        more_payloads = [
+            get_locatie_payload(locatie, straat="Dorpsstraat")
+            for locatie in LocatieFactory.create_batch(
+                5, lokale_overheid=self.lokale_overheid, postcode="1234AB"
+            )
+        ] + [{**payloads[2], "naam": f"Stadskantoor {i}"} for i in range(5)]
+
+        with self.assertNumQueries(len(queries)):
+            response = self.client.patch(self.url, more_payloads, format="json")
+
+        self.assertEqual(len(response.json()["aangemaakt"]), 5)
+        self.assertEqual(len(response.json()["bijgewerkt"]), 5)
+
+    def test_invalid_location_saves_nothing(self):
+        payloads = self.get_payloads()
+        del payloads[1]["uuid"]
+        payloads[2]["postcode"] = "invalid"
+
+        response = self.client.put(self.url, payloads, format="json")
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(
+            {param["name"] for param in response.json()["invalidParams"]},
+            {"locaties.2.postcode"},
+        )
+        self.assertEqual(self.lokale_overheid.locaties.count(), 3)
+
+    def test_unknown_and_duplicate_locations(self):
+        other = LocatieFactory.create(postcode="1234AB")
+        payloads = [
+            get_locatie_payload(other),
+            get_locatie_payload(self.ongewijzigd),
+            get_locatie_payload(self.ongewijzigd, uuid=None),
+        ]
+        del payloads[2]["uuid"]
+
+        response = self.client.put(self.url, payloads, format="json")
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(
+            [param["name"] for param in response.json()["invalidParams"]],
+            ["locaties.0.uuid", "locaties.2.nonFieldErrors"],
+        )
+        self.assertEqual(self.lokale_overheid.locaties.count(), 3)
+
+    def test_other_organization(self):
+        url = reverse(
+            "api:lokaleoverheid-locaties",
+            kwargs={"uuid": LokaleOverheidFactory.create().uuid},
+        )
+
+        response = self.client.put(url, [], format="json")
+
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+
+    def test_anonymous(self):
+        self.client.credentials()
+
+        response = self.client.put(self.url, [], format="json")
+
+        self.assertIn(
+            response.status_code,
+            [status.HTTP_401_UNAUTHORIZED, status.HTTP_403_FORBIDDEN],
+        )
+        self.assertEqual(self.lokale_overheid.locaties.count(), 3)
+
+    @override_settings(SDG_API_PRODUCT_CACHE_ENABLED=True)
+    def test_cached_products_are_invalidated(self):
+        get_product_cache().clear()
+        product = ReferentieProductVersieFactory.create(
+            publicatie_datum=PAST_DATE
+        ).product
+        product.locaties.add(self.gewijzigd)
+        detail_url = reverse("api:product-detail", kwargs={"uuid": product.uuid})
+        self.client.get(detail_url)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.patch(
+                self.url,
+                [get_locatie_payload(self.gewijzigd, straat="Dorpsstraat")],
+                format="json",
+            )
+
+        response = self.client.get(detail_url)
+
+        self.assertEqual(response.json()["locaties"][0]["straat"], "Dorpsstraat")
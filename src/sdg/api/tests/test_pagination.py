@@ -0,0 +1,93 @@
+from unittest.mock import patch
+
+from django.test import override_settings
+
+from rest_framework import status
+from rest_framework.reverse import reverse
+from rest_framework.test import APITestCase
+
+from sdg.api.pagination import ProductPagination
+from sdg.api.tests.factories.token import TokenAuthorizationFactory
+from sdg.core.tests.factories.logius import UniformeProductnaamFactory
+from sdg.producten.tests.factories.localized import LocalizedProductFactory
+from sdg.producten.tests.factories.product import (
+    GeneriekProductFactory,
+    ReferentieProductFactory,
+    ReferentieProductVersieFactory,
+)
+
+
+@override_settings(SDG_API_WHITELISTING_ENABLED=False)
+@patch.object(ProductPagination, "page_size", 2)
+class ProductPaginationTests(APITestCase):
+    url = reverse("api:product-list")
+
+    def setUp(self):
+        token_authorization = TokenAuthorizationFactory.create(
+            token__api_default_most_recent=True,
+        )
+        self.client.defaults.update(
+            {"HTTP_AUTHORIZATION": f"Token {token_authorization.token}"}
+        )
+
+        self.products = []
+        # Two products share the same label, to make sure the cursor also
+        # takes the primary key into account.
+        for label in ["a", "b", "b", "c", "d"]:
+            product = ReferentieProductFactory.create(
+                generiek_product=GeneriekProductFactory.create(
+                    upn=UniformeProductnaamFactory.create(upn_label=label)
+                )
+            )
+            product_versie = ReferentieProductVersieFactory.create(product=product)
+            LocalizedProductFactory.create_batch(2, product_versie=product_versie)
+            self.products.append(product)
+
+    def test_page_number_pagination_is_default(self):
+        response = self.client.get(self.url)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+        data = response.json()
+        self.assertEqual(data["count"], 5)
+        self.assertEqual(len(data["results"]), 2)
+
+    def test_cursor_pagination(self):
+        response = self.client.get(self.url, {"cursor": ""})
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+        uuids = []
+        pages = 0
+        data = response.json()
+        while True:
+            pages += 1
+            self.assertNotIn("count", data)
+            uuids += [product["uuid"] for product in data["results"]]
+
+            if not data["next"]:
+                break
+
+            response = self.client.get(data["next"])
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            data = response.json()
+
+        self.assertEqual(pages, 3)
+        self.assertEqual(uuids, [str(product.uuid) for product in self.products])
+
+    def test_cursor_pagination_removes_page_parameter(self):
+        response = self.client.get(self.url, {"cursor": "", "page": 2})
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+        data = response.json()
+        self.assertEqual(
+            [product["uuid"] for product in data["results"]],
+            [str(product.uuid) for product in self.products[:2]],
+        )
+        self.assertNotIn("page=", data["next"])
+
+    def test_invalid_cursor(self):
+        response = self.client.get(self.url, {"cursor": "invalid"})
+
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
@@ -0,0 +1,79 @@
+import datetime
+import decimal
+import io
+import uuid
+
+from django.test import SimpleTestCase
+from django.utils.translation import gettext_lazy as _
+
+from djangorestframework_camel_case.parser import CamelCaseJSONParser
+from djangorestframework_camel_case.render import CamelCaseJSONRenderer
+from rest_framework.exceptions import ParseError
+from rest_framework.utils.serializer_helpers import ReturnDict, ReturnList
+
+from sdg.api.parsers import CamelCaseORJSONParser
+from sdg.api.renderers import CamelCaseORJSONRenderer
+
+DATA = ReturnList(
+    [
+        {
+            "upn_uri": "https://example.com/upn",
+            "product_aanwezig": True,
+            "vertalingen": [
+                {
+                    "product_titel_decentraal": "Paspoort aanvragen",
+                    "verwijzing_links": [["label", "https://example.com"]],
+                    "versie_2_tekst": None,
+                    "_private_key": 1,
+                    "datum_wijziging": datetime.datetime(2024, 1, 2, 3, 4, 5, 678901),
+                }
+            ],
+            "publicatie_datum": datetime.date(2024, 1, 2),
+            "uuid": uuid.UUID("7a0c8b64-1f4f-4b39-a43b-9e5b0b0a8b41"),
+            "kosten": decimal.Decimal("1.50"),
+            "status": _("Actief"),
+            "locaties": ({"open_maandag": ["09:00"]},),
+            1: "getal",
+        }
+    ],
+    serializer=None,
+)
+
+
+class CamelCaseORJSONRendererTests(SimpleTestCase):
+    def test_output_is_identical(self):
+        self.assertEqual(
+            CamelCaseORJSONRenderer().render(DATA),
+            CamelCaseJSONRenderer().render(DATA),
+        )
+
+    def test_error_responses(self):
+        data = ReturnDict(
+            {"invalid_params": [{"name": "upn_uri", "reason": _("Ongeldig")}]},
+            serializer=None,
+        )
+
+        self.assertEqual(
+            CamelCaseORJSONRenderer().render(data),
+            b'{"invalidParams":[{"name":"upn_uri","reason":"Ongeldig"}]}',
+        )
+
+    def test_empty(self):
+        self.assertEqual(CamelCaseORJSONRenderer().render(None), b"")
+
+
+class CamelCaseORJSONParserTests(SimpleTestCase):
+    def parse(self, parser, content: bytes):
+        return parser.parse(io.BytesIO(content), parser_context={})
+
+    def test_output_is_identical(self):
+        content = CamelCaseJSONRenderer().render(DATA)
+
+        self.assertEqual(
+            self.parse(CamelCaseORJSONParser(), content),
+            self.parse(CamelCaseJSONParser(), content),
+        )
+
+    def test_invalid_json(self):
+        with self.assertRaises(ParseError):
+            self.parse(CamelCaseORJSONParser(), b'{"upnUri": ')
@@ -0,0 +1,121 @@
+import gzip
+import json
+import tempfile
+from io import StringIO
+from unittest.mock import patch
+
+from django.core.cache import caches
+from django.core.management import call_command
+from django.test import override_settings
+
+from rest_framework import status
+from rest_framework.reverse import reverse
+from rest_framework.test import APITestCase
+
+from sdg.api.schema import SchemaDocument, schema_store
+
+
+class SchemaTests(APITestCase):
+    def setUp(self):
+        super().setUp()
+
+        self.schema_root = tempfile.TemporaryDirectory()
+        self.addCleanup(self.schema_root.cleanup)
+
+        overrides = override_settings(
+            RELEASE="1.0.0",
+            GIT_SHA="a1b2c3",
+            SDG_API_WHITELISTING_ENABLED=False,
+            SDG_API_SCHEMA_CACHE_ENABLED=True,
+            SDG_API_SCHEMA_ROOT=self.schema_root.name,
+        )
+        overrides.enable()
+        self.addCleanup(overrides.disable)
+
+        schema_store.clear()
+        self.addCleanup(schema_store.clear)
+        caches["default"].clear()
+
+    def test_schema_is_generated_once(self):
+        with patch(
+            "sdg.api.schema.SchemaGenerator.get_schema",
+            return_value={"openapi": "3.0.3"},
+        ) as get_schema:
+            yaml = self.client.get(reverse("api:schema-yaml"))
+            json_response = self.client.get(reverse("api:schema-json"))
+            self.client.get(reverse("api:schema-yaml"))
+
+        self.assertEqual(get_schema.call_count, 1)
+        self.assertEqual(yaml.status_code, status.HTTP_200_OK)
+        self.assertEqual(yaml.content, b"openapi: 3.0.3\n")
+        self.assertEqual(json.loads(json_response.content), {"openapi": "3.0.3"})
+
+    def test_schema_is_compressed(self):
+        response = self.client.get(
+            reverse("api:schema-json"), HTTP_ACCEPT_ENCODING="gzip, deflate"
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response["Content-Encoding"], "gzip")
+        self.assertIn("Accept-Encoding", response["Vary"])
+        schema = json.loads(gzip.decompress(response.content))
+        self.assertIn("/api/v1/producten", schema["paths"])
+
+    def test_prebuilt_schema_is_used(self):
+        call_command("build_api_schema", stdout=StringIO())
+        schema_store.clear()
+
+        with patch("sdg.api.schema.SchemaGenerator.get_schema") as get_schema:
+            response = self.client.get(reverse("api:schema-yaml"))
+
+        get_schema.assert_not_called()
+        with open(f"{self.schema_root.name}/openapi.yaml", "rb") as f:
+            self.assertEqual(response.content, f.read())
+
+    def test_prebuilt_schema_of_another_release_is_ignored(self):
+        call_command("build_api_schema", stdout=StringIO())
+        schema_store.clear()
+
+        with override_settings(RELEASE="1.0.1"), patch(
+            "sdg.api.schema.generate_schema_documents",
+            return_value={"yaml": SchemaDocument(b"nieuw", b"")},
+        ):
+            response = self.client.get(reverse("api:schema-yaml"))
+
+        self.assertEqual(response.content, b"nieuw")
+
+    def test_schema_of_another_commit_is_generated(self):
+        with patch(
+            "sdg.api.schema.generate_schema_documents",
+            return_value={"yaml": SchemaDocument(b"oud", b"")},
+        ):
+            self.client.get(reverse("api:schema-yaml"))
+        schema_store.clear()
+
+        with override_settings(GIT_SHA="d4e5f6"), patch(
+            "sdg.api.schema.generate_schema_documents",
+            return_value={"yaml": SchemaDocument(b"nieuw", b"")},
+        ):
+            response = self.client.get(reverse("api:schema-yaml"))
+
+        self.assertEqual(response.content, b"nieuw")
+
+    @override_settings(SDG_API_SCHEMA_CACHE_TIMEOUT=60)
+    def test_cached_schema_expires(self):
+        with patch("sdg.api.schema.caches") as caches_mock:
+            caches_mock.__getitem__.return_value.get.return_value = None
+            self.client.get(reverse("api:schema-yaml"))
+
+        cache = caches_mock.__getitem__.return_value
+        self.assertEqual(cache.set.call_args.kwargs["timeout"], 60)
+
+    @override_settings(RELEASE=None, GIT_SHA=None)
+    def test_schema_without_release_is_not_cached(self):
+        with patch(
+            "sdg.api.schema.SchemaGenerator.get_schema",
+            return_value={"openapi": "3.0.3"},
+        ) as get_schema:
+            self.client.get(reverse("api:schema-yaml"))
+            self.client.get(reverse("api:schema-yaml"))
+
+        self.assertEqual(get_schema.call_count, 2)
@@ -0,0 +1,149 @@
+from unittest.mock import patch
+
+from django.test import TestCase, override_settings
+
+from rest_framework.exceptions import AuthenticationFailed
+
+from sdg.api.authentication import TokenAuthentication
+from sdg.api.models import Token
+from sdg.api.tests.factories.token import TokenAuthorizationFactory
+from sdg.api.tokens import LastSeenRecorder, get_token_cache, local_token_cache
+from sdg.core.db.routers import ReplicaRouter, read_from_replica, replica_reads_enabled
+from sdg.organisaties.tests.factories.overheid import LokaleOverheidFactory
+
+
+class TokenCacheTests(TestCase):
+    def setUp(self):
+        super().setUp()
+
+        local_token_cache.clear()
+        get_token_cache().clear()
+
+        self.token_authorization = TokenAuthorizationFactory.create()
+        self.token = self.token_authorization.token
+
+    def authenticate(self):
+        return TokenAuthentication().authenticate_credentials(self.token.key)[1]
+
+    def test_token_is_cached(self):
+        with self.assertNumQueries(2):
+            token = self.authenticate()
+            self.assertEqual(
+                token.organisaties,
+                {self.token_authorization.lokale_overheid.organisatie.pk},
+            )
+
+        with self.assertNumQueries(0):
+            token = self.authenticate()
+            self.assertEqual(token, self.token)
+
+    def test_shared_cache_is_used_by_other_processes(self):
+        self.authenticate()
+        local_token_cache.clear()
+
+        with self.assertNumQueries(0):
+            token = self.authenticate()
+            self.assertEqual(len(token.organisaties), 1)
+
+    def test_cache_is_invalidated_when_authorizations_change(self):
+        self.authenticate()
+
+        other = TokenAuthorizationFactory.create(
+            token=self.token, lokale_overheid=LokaleOverheidFactory.create()
+        )
+        self.assertEqual(
+            self.authenticate().organisaties,
+            {
+                self.token_authorization.lokale_overheid.organisatie.pk,
+                other.lokale_overheid.organisatie.pk,
+            },
+        )
+
+        self.token_authorization.delete()
+        self.assertEqual(
+            self.authenticate().organisaties, {other.lokale_overheid.organisatie.pk}
+        )
+
+    def test_cache_is_invalidated_when_token_changes(self):
+        self.authenticate()
+
+        self.token.api_default_most_recent = True
+        self.token.save()
+        self.assertTrue(self.authenticate().api_default_most_recent)
+
+        Token.objects.filter(pk=self.token.pk).delete()
+        with self.assertRaises(AuthenticationFailed):
+            self.authenticate()
+
+    @override_settings(DB_REPLICAS=["replica"])
+    def test_token_is_read_from_primary(self):
+        reads = []
+
+        def db_for_read(router, model, **hints):
+            reads.append(replica_reads_enabled())
+            return "default"
+
+        with patch.object(ReplicaRouter, "db_for_read", db_for_read):
+            with read_from_replica():
+                token = self.authenticate()
+                self.assertEqual(len(token.organisaties), 1)
+
+        self.assertEqual(reads, [False, False])
+
+    @override_settings(SDG_API_TOKEN_CACHE_ENABLED=False)
+    def test_cache_disabled(self):
+        self.authenticate()
+
+        with self.assertNumQueries(1):
+            self.authenticate()
+
+
+class LastSeenRecorderTests(TestCase):
+    def setUp(self):
+        super().setUp()
+
+        self.token = TokenAuthorizationFactory.create().token
+
+    def get_last_seen(self):
+        return Token.objects.get(pk=self.token.pk).last_seen
+
+    def test_last_seen_is_coalesced(self):
+        recorder = LastSeenRecorder()
+
+        with self.assertNumQueries(1):
+            recorder.record(self.token)
+        first = self.get_last_seen()
+        self.assertIsNotNone(first)
+
+        with self.assertNumQueries(0):
+            recorder.record(self.token)
+            recorder.record(self.token)
+        self.assertEqual(self.get_last_seen(), first)
+
+        with self.assertNumQueries(1):
+            recorder.flush()
+        self.assertGreater(self.get_last_seen(), first)
+
+    @override_settings(SDG_API_TOKEN_LAST_SEEN_INTERVAL=0)
+    def test_last_seen_without_interval(self):
+        recorder = LastSeenRecorder()
+
+        with self.assertNumQueries(2):
+            recorder.record(self.token)
+            recorder.record(self.token)
+
+    def test_pending_last_seen_is_flushed_by_a_timer(self):
+        recorder = LastSeenRecorder()
+        recorder.record(self.token)
+
+        recorder.record(self.token)
+        timer = recorder._timer
+        self.assertTrue(timer.daemon)
+        self.assertTrue(timer.is_alive())
+        self.assertLessEqual(timer.interval, 60)
+
+        with self.assertNumQueries(1):
+            recorder.flush()
+        self.assertIsNone(recorder._timer)
+        timer.join(1)
+        self.assertFalse(timer.is_alive())
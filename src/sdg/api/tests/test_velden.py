@@ -0,0 +1,142 @@
+from django.db import connection
+from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
+
+from rest_framework import status
+from rest_framework.reverse import reverse
+from rest_framework.test import APITestCase
+
+from sdg.core.tests.factories.catalogus import ProductenCatalogusFactory
+from sdg.organisaties.tests.factories.overheid import (
+    BevoegdeOrganisatieFactory,
+    LocatieFactory,
+    LokaleOverheidFactory,
+)
+from sdg.producten.tests.constants import NOW_DATE
+from sdg.producten.tests.factories.localized import LocalizedProductFactory
+from sdg.producten.tests.factories.product import (
+    ProductVersieFactory,
+    ReferentieProductFactory,
+    SpecifiekProductFactory,
+)
+
+
+@override_settings(SDG_API_WHITELISTING_ENABLED=False)
+class SparseFieldsetTests(APITestCase):
+    def setUp(self):
+        self.lokale_overheid = LokaleOverheidFactory.create(
+            automatisch_catalogus_aanmaken=False,
+            organisatie__owms_identifier="https://www.example.com/gemeente",
+        )
+        self.locatie = LocatieFactory.create(lokale_overheid=self.lokale_overheid)
+        self.catalogus = ProductenCatalogusFactory.create(
+            lokale_overheid=self.lokale_overheid, is_referentie_catalogus=False
+        )
+        bevoegde_organisatie = BevoegdeOrganisatieFactory.create(
+            lokale_overheid=self.lokale_overheid,
+            organisatie=self.lokale_overheid.organisatie,
+        )
+
+        for _ in range(2):
+            referentie_product = ReferentieProductFactory.create(
+                bevoegde_organisatie=bevoegde_organisatie
+            )
+            product = SpecifiekProductFactory.create(
+                generiek_product=referentie_product.generiek_product,
+                referentie_product=referentie_product,
+                catalogus=self.catalogus,
+                bevoegde_organisatie=bevoegde_organisatie,
+            )
+            product.locaties.add(self.locatie)
+            product_versie = ProductVersieFactory.create(
+                product=product, versie=1, publicatie_datum=NOW_DATE
+            )
+            LocalizedProductFactory.create_batch(2, product_versie=product_versie)
+
+    def get(self, url, velden=None, **params):
+        if velden:
+            params["velden"] = velden
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.get(url, params)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return response.json(), len(context.captured_queries)
+
+    def test_product_velden(self):
+        url = reverse("api:product-list")
+        data, queries = self.get(url)
+
+        slim_data, slim_queries = self.get(
+            url, "upnUri,verantwoordelijkeOrganisatie,publicatieDatum"
+        )
+
+        self.assertEqual(len(slim_data["results"]), 2)
+        for product in slim_data["results"]:
+            self.assertEqual(
+                set(product),
+                {"upnUri", "verantwoordelijkeOrganisatie", "publicatieDatum"},
+            )
+            self.assertEqual(
+                product["verantwoordelijkeOrganisatie"]["owmsIdentifier"],
+                "https://www.example.com/gemeente",
+            )
+            self.assertEqual(product["publicatieDatum"], str(NOW_DATE))
+        # No locations and translations are retrieved.
+        self.assertLess(slim_queries, queries - 1)
+
+    def test_product_detail_velden(self):
+        product = self.get(reverse("api:product-list"))[0]["results"][0]
+
+        data, _ = self.get(product["url"], "uuid,vertalingen")
+
+        self.assertEqual(data["uuid"], product["uuid"])
+        self.assertEqual(data["vertalingen"], product["vertalingen"])
+        self.assertNotIn("locaties", data)
+
+    def test_unknown_velden(self):
+        response = self.client.get(
+            reverse("api:product-list"), {"velden": "upnUri,onbekend"}
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(
+            response.json()["invalidParams"],
+            [
+                {
+                    "name": "velden",
+                    "code": "invalid",
+                    "reason": "Onbekende velden: onbekend.",
+                }
+            ],
+        )
+
+    def test_organisatie_velden(self):
+        url = reverse("api:lokaleoverheid-list")
+        owms_identifier = self.lokale_overheid.organisatie.owms_identifier
+        _, queries = self.get(url, owmsIdentifier=owms_identifier)
+
+        data, slim_queries = self.get(
+            url, "uuid,owmsIdentifier", owmsIdentifier=owms_identifier
+        )
+
+        self.assertEqual(
+            data["results"],
+            [
+                {
+                    "uuid": str(self.lokale_overheid.uuid),
+                    "owmsIdentifier": "https://www.example.com/gemeente",
+                }
+            ],
+        )
+        # No locations, catalogs and authorized organizations are retrieved.
+        self.assertEqual(slim_queries, queries - 4)
+
+    def test_locatie_velden(self):
+        data, _ = self.get(
+            reverse("api:locatie-list"),
+            "naam",
+            organisatie=str(self.lokale_overheid.uuid),
+        )
+
+        self.assertIn({"naam": self.locatie.naam}, data["results"])
+        self.assertEqual({len(locatie) for locatie in data["results"]}, {1})
@@ -0,0 +1,157 @@
+from datetime import date, datetime, timedelta
+from unittest.mock import patch
+
+from django.test import override_settings
+
+from freezegun import freeze_time
+from rest_framework import status
+from rest_framework.reverse import reverse
+from rest_framework.test import APITestCase
+
+from sdg.api.pagination import ProductWijzigingPagination
+from sdg.core.constants import GenericProductStatus, ProductWijzigingChoices
+from sdg.organisaties.tests.factories.overheid import LocatieFactory
+from sdg.producten.tests.factories.product import ReferentieProductVersieFactory
+
+SINDS = datetime(2024, 1, 1, 12)
+
+
+@override_settings(SDG_API_WHITELISTING_ENABLED=False)
+@freeze_time("2024-01-02")
+class ProductWijzigingenTests(APITestCase):
+    url = reverse("api:product-wijzigingen")
+
+    def setUp(self):
+        with freeze_time(SINDS - timedelta(days=1)):
+            self.product_versie = ReferentieProductVersieFactory.create(
+                publicatie_datum=date(2023, 1, 1)
+            )
+        self.product = self.product_versie.product
+
+    def get_wijzigingen(self, sinds=SINDS):
+        response = self.client.get(self.url, {"sinds": sinds.isoformat()})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+        return {
+            wijziging["uuid"]: wijziging["soort"]
+            for wijziging in response.json()["results"]
+        }
+
+    def test_unchanged(self):
+        self.assertEqual(self.get_wijzigingen(), {})
+        self.assertEqual(
+            self.get_wijzigingen(SINDS - timedelta(days=2)),
+            {str(self.product.uuid): ProductWijzigingChoices.nieuwe_versie},
+        )
+
+    def test_nieuwe_versie(self):
+        ReferentieProductVersieFactory.create(
+            product=self.product, publicatie_datum=date(2024, 1, 1)
+        )
+
+        self.assertEqual(
+            self.get_wijzigingen(),
+            {str(self.product.uuid): ProductWijzigingChoices.nieuwe_versie},
+        )
+
+    def test_concept_versie(self):
+        ReferentieProductVersieFactory.create(
+            product=self.product, publicatie_datum=None
+        )
+
+        self.assertEqual(self.get_wijzigingen(), {})
+
+    def test_excluded_generic_status(self):
+        generiek_product = self.product.generiek_product
+        generiek_product.product_status = GenericProductStatus.DELETED
+        generiek_product.save()
+        self.product.save()
+
+        self.assertEqual(self.get_wijzigingen(), {})
+
+    def test_publicatie(self):
+        with freeze_time(SINDS - timedelta(days=1)):
+            ReferentieProductVersieFactory.create(
+                product=self.product, publicatie_datum=date(2024, 1, 2)
+            )
+
+        self.assertEqual(
+            self.get_wijzigingen(),
+            {str(self.product.uuid): ProductWijzigingChoices.publicatie},
+        )
+
+    def test_verborgen(self):
+        self.product.api_verborgen = True
+        self.product.save()
+
+        self.assertEqual(
+            self.get_wijzigingen(),
+            {str(self.product.uuid): ProductWijzigingChoices.verborgen},
+        )
+
+    def test_organisatie_opgeheven(self):
+        organisatie = self.product.catalogus.lokale_overheid.organisatie
+        organisatie.owms_end_date = date(2024, 1, 2)
+        organisatie.save()
+
+        self.assertEqual(
+            self.get_wijzigingen(),
+            {str(self.product.uuid): ProductWijzigingChoices.organisatie_opgeheven},
+        )
+
+    @freeze_time("2024-01-02 15:00")
+    def test_organisatie_opgeheven_during_the_day(self):
+        organisatie = self.product.catalogus.lokale_overheid.organisatie
+        organisatie.owms_end_date = datetime(2024, 1, 2, 10)
+        organisatie.save()
+
+        self.assertEqual(
+            self.get_wijzigingen(datetime(2024, 1, 2, 9)),
+            {str(self.product.uuid): ProductWijzigingChoices.organisatie_opgeheven},
+        )
+        self.assertEqual(self.get_wijzigingen(datetime(2024, 1, 2, 11)), {})
+
+    def test_gewijzigde_locatie(self):
+        with freeze_time(SINDS - timedelta(days=1)):
+            locatie = LocatieFactory.create(
+                lokale_overheid=self.product.catalogus.lokale_overheid
+            )
+            self.product.locaties.add(locatie)
+
+        locatie.naam = "Stadskantoor"
+        locatie.save()
+
+        self.assertEqual(
+            self.get_wijzigingen(),
+            {str(self.product.uuid): ProductWijzigingChoices.gewijzigd},
+        )
+
+    @patch.object(ProductWijzigingPagination, "page_size", 1)
+    def test_pagination(self):
+        products = [self.product]
+        for hour in range(1, 4):
+            with freeze_time(SINDS + timedelta(hours=hour)):
+                products.append(ReferentieProductVersieFactory.create().product)
+
+        response = self.client.get(self.url, {"sinds": SINDS.isoformat()})
+
+        uuids = []
+        while True:
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            data = response.json()
+            uuids += [wijziging["uuid"] for wijziging in data["results"]]
+
+            if not data["next"]:
+                break
+            response = self.client.get(data["next"])
+
+        self.assertEqual(uuids, [str(product.uuid) for product in products[1:]])
+
+    def test_sinds_is_required(self):
+        response = self.client.get(self.url)
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+        response = self.client.get(self.url, {"sinds": "gisteren"})
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
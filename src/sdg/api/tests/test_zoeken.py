@@ -0,0 +1,134 @@
+from django.db import connection
+from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
+
+from rest_framework import status
+from rest_framework.reverse import reverse
+from rest_framework.test import APITestCase
+
+from sdg.core.tests.factories.catalogus import ProductenCatalogusFactory
+from sdg.organisaties.tests.factories.overheid import (
+    BevoegdeOrganisatieFactory,
+    LokaleOverheidFactory,
+)
+from sdg.producten.tests.constants import NOW_DATE
+from sdg.producten.tests.factories.localized import LocalizedProductFactory
+from sdg.producten.tests.factories.product import (
+    ProductVersieFactory,
+    ReferentieProductFactory,
+    SpecifiekProductFactory,
+)
+
+
+@override_settings(SDG_API_WHITELISTING_ENABLED=False)
+class ProductZoekenTests(APITestCase):
+    url = reverse("api:product-zoeken")
+
+    def setUp(self):
+        self.lokale_overheid = LokaleOverheidFactory.create(
+            automatisch_catalogus_aanmaken=False,
+            organisatie__owms_identifier="https://www.example.com/gemeente",
+        )
+        self.catalogus = ProductenCatalogusFactory.create(
+            lokale_overheid=self.lokale_overheid,
+            is_referentie_catalogus=False,
+            is_default_catalogus=True,
+        )
+        self.bevoegde_organisatie = BevoegdeOrganisatieFactory.create(
+            lokale_overheid=self.lokale_overheid,
+            organisatie=self.lokale_overheid.organisatie,
+        )
+
+    def create_product(self, **kwargs):
+        referentie_product = ReferentieProductFactory.create(
+            bevoegde_organisatie=self.bevoegde_organisatie
+        )
+        product = SpecifiekProductFactory.create(
+            generiek_product=referentie_product.generiek_product,
+            referentie_product=referentie_product,
+            catalogus=self.catalogus,
+            bevoegde_organisatie=self.bevoegde_organisatie,
+            **kwargs,
+        )
+        product_versie = ProductVersieFactory.create(
+            product=product, versie=1, publicatie_datum=NOW_DATE
+        )
+        LocalizedProductFactory.create_batch(2, product_versie=product_versie)
+        return product
+
+    def get_key(self, product, **overrides):
+        return {
+            "upnUri": product.generiek_product.upn.upn_uri,
+            "organisatieOwmsIdentifier": self.lokale_overheid.organisatie.owms_identifier,
+            "doelgroep": product.generiek_product.doelgroep,
+            **overrides,
+        }
+
+    def test_zoeken(self):
+        products = [self.create_product() for _ in range(3)]
+        keys = [
+            self.get_key(products[2]),
+            self.get_key(products[0]),
+            self.get_key(products[1], upnUri="https://example.com/onbekend"),
+            self.get_key(products[0]),
+        ]
+
+        response = self.client.post(self.url, keys, format="json")
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        data = response.json()
+        self.assertEqual(data[0]["uuid"], str(products[2].uuid))
+        self.assertEqual(data[1]["uuid"], str(products[0].uuid))
+        self.assertIsNone(data[2])
+        self.assertEqual(data[3], data[1])
+
+        detail = self.client.get(data[0]["url"]).json()
+        self.assertEqual(data[0], detail)
+
+    def test_number_of_queries_does_not_depend_on_number_of_keys(self):
+        products = [self.create_product() for _ in range(6)]
+
+        def count_queries(products):
+            with CaptureQueriesContext(connection) as context:
+                response = self.client.post(
+                    self.url,
+                    [self.get_key(product) for product in products],
+                    format="json",
+                )
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            return len(context.captured_queries)
+
+        self.assertEqual(count_queries(products[:2]), count_queries(products[2:]))
+
+    def test_inactive_products_are_not_found(self):
+        product = self.create_product()
+        product.versies.update(publicatie_datum=None)
+
+        response = self.client.post(self.url, [self.get_key(product)], format="json")
+
+        self.assertEqual(response.json(), [None])
+
+    def test_invalid_key(self):
+        product = self.create_product()
+
+        response = self.client.post(
+            self.url,
+            [self.get_key(product), {"upnUri": "https://example.com"}],
+            format="json",
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(
+            {param["name"] for param in response.json()["invalidParams"]},
+            {"1.organisatieOwmsIdentifier", "1.doelgroep"},
+        )
+
+    @override_settings(SDG_API_PRODUCT_LOOKUP_MAX_SIZE=1)
+    def test_max_size(self):
+        product = self.create_product()
+
+        response = self.client.post(
+            self.url, [self.get_key(product)] * 2, format="json"
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
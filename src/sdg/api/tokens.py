@@ -0,0 +1,188 @@
+import atexit
+import datetime
+import logging
+import threading
+import time
+from collections import OrderedDict
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db import DatabaseError, connection, transaction
+
+from sdg.api.models import Token
+from sdg.core.db.routers import read_from_replica
+
+logger = logging.getLogger(__name__)
+
+TOKEN_KEY = "sdg:api:token:{key}"
+
+
+class LocalTokenCache:
+    """
+    In-process LRU cache of the tokens.
+
+    The entries expire after ``SDG_API_TOKEN_CACHE_LOCAL_TIMEOUT`` seconds,
+    this bounds the time another process uses a token that has been changed.
+    """
+
+    def __init__(self):
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+
+            expires, token = entry
+            if expires <= time.monotonic():
+                del self._entries[key]
+                return None
+
+            self._entries.move_to_end(key)
+            return token
+
+    def set(self, key, token):
+        expires = time.monotonic() + settings.SDG_API_TOKEN_CACHE_LOCAL_TIMEOUT
+        with self._lock:
+            self._entries[key] = (expires, token)
+            self._entries.move_to_end(key)
+            while len(self._entries) > settings.SDG_API_TOKEN_CACHE_LOCAL_SIZE:
+                self._entries.popitem(last=False)
+
+    def delete(self, key):
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+local_token_cache = LocalTokenCache()
+
+
+def get_token_cache():
+    return caches[settings.SDG_API_TOKEN_CACHE_ALIAS]
+
+
+def make_token_key(key: str) -> str:
+    return TOKEN_KEY.format(key=key)
+
+
+def get_token(key: str):
+    """
+    Return the token with the given key, or ``None`` if it does not exist.
+
+    The token is looked up in the in-process cache, then in the shared cache
+    and finally in the database. The organizations the token is authorized for
+    are cached along with the token.
+    """
+    if not settings.SDG_API_TOKEN_CACHE_ENABLED:
+        return Token.objects.filter(key=key).first()
+
+    token = local_token_cache.get(key)
+    if token is not None:
+        return token
+
+    cache = get_token_cache()
+    token = cache.get(make_token_key(key))
+    if token is None:
+        # The token is cached for the writes as well, it is never read from a
+        # (lagging) replica.
+        with read_from_replica(enabled=False):
+            token = Token.objects.filter(key=key).first()
+            if token is None:
+                return None
+
+            # Evaluate the authorizations, so they are cached as well.
+            token.organisaties
+        cache.set(
+            make_token_key(key), token, timeout=settings.SDG_API_TOKEN_CACHE_TIMEOUT
+        )
+
+    local_token_cache.set(key, token)
+    return token
+
+
+def invalidate_token(key: str):
+    local_token_cache.delete(key)
+    get_token_cache().delete(make_token_key(key))
+
+
+class LastSeenRecorder:
+    """
+    Collect the last use of the tokens and save them at most once per
+    ``SDG_API_TOKEN_LAST_SEEN_INTERVAL`` seconds, instead of on every request.
+
+    The collected uses are saved by the first request after the interval has
+    passed, or by a timer at the end of the interval if no request comes in.
+    The remaining uses are saved when the process exits.
+    """
+
+    def __init__(self):
+        self._pending = {}
+        self._flushed = None
+        self._timer = None
+        self._lock = threading.Lock()
+
+    def record(self, token, timestamp=None):
+        timestamp = timestamp or datetime.datetime.now()
+
+        with self._lock:
+            self._pending[str(token)] = timestamp
+            remaining = (
+                0
+                if self._flushed is None
+                else settings.SDG_API_TOKEN_LAST_SEEN_INTERVAL
+                - (time.monotonic() - self._flushed)
+            )
+            if remaining > 0 and self._timer is None:
+                self._timer = threading.Timer(remaining, self._flush_in_background)
+                self._timer.daemon = True
+                self._timer.start()
+
+        if remaining <= 0:
+            self.flush()
+
+    def _flush_in_background(self):
+        try:
+            self.flush()
+        finally:
+            # The timer thread has its own database connection.
+            connection.close()
+
+    def flush(self):
+        with self._lock:
+            pending, self._pending = self._pending, {}
+            self._flushed = time.monotonic()
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
+
+        if not pending:
+            return
+
+        try:
+            for key, timestamp in pending.items():
+                Token.objects.filter(key=key).update(last_seen=timestamp)
+        except DatabaseError:
+            logger.exception("Could not save the last use of the API tokens.")
+
+
+last_seen_recorder = LastSeenRecorder()
+atexit.register(last_seen_recorder.flush)
+
+
+def record_last_seen(token):
+    last_seen_recorder.record(token)
+
+
+def invalidate_token_on_commit(key: str):
+    """
+    Invalidate the token now, and again once the transaction is committed, so
+    a concurrent request can not cache the old state in the meantime.
+    """
+    invalidate_token(key)
+    transaction.on_commit(lambda: invalidate_token(key))
@@ -1,11 +1,7 @@
 from django.urls import include, path
 from django.views.generic.base import TemplateView
 
-from drf_spectacular.views import (
-    SpectacularJSONAPIView,
-    SpectacularRedocView,
-    SpectacularYAMLAPIView,
-)
+from drf_spectacular.views import SpectacularRedocView
 from rest_framework.settings import api_settings
 from vng_api_common import routers
 
@@ -14,8 +10,11 @@ from sdg.api.views import (
     GeneriekProductViewSet,
     LocatieViewSet,
     LokaleOverheidViewSet,
+    MetricsView,
     ProductHistoryViewSet,
     ProductViewSet,
+    SchemaJSONView,
+    SchemaYAMLView,
 )
 
 app_name = "api"
@@ -55,14 +54,15 @@ urlpatterns = [
         "v1/",
         include(
             [
+                path("metrics", MetricsView.as_view(), name="metrics"),
                 path(
                     "openapi.yaml",
-                    SpectacularYAMLAPIView.as_view(),
+                    SchemaYAMLView.as_view(),
                     name="schema-yaml",
                 ),
                 path(
                     "openapi.json",
-                    SpectacularJSONAPIView.as_view(),
+                    SchemaJSONView.as_view(),
                     name="schema-json",
                 ),
                 path(
@@ -1,3 +1,5 @@
 from .core import *  # noqa
+from .metrics import *  # noqa
 from .organisaties import *  # noqa
 from .producten import *  # noqa
+from .schema import *  # noqa
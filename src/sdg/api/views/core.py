@@ -1,4 +1,8 @@
-from django.db.models import Prefetch
+import datetime
+
+from django.contrib.postgres.expressions import ArraySubquery
+from django.db.models import DateTimeField, OuterRef, Prefetch
+from django.db.models.functions import Cast, Greatest
 
 from drf_spectacular.types import OpenApiTypes
 from drf_spectacular.utils import OpenApiParameter, extend_schema, extend_schema_view
@@ -6,8 +10,10 @@ from rest_framework import viewsets
 
 from sdg.api.filters import ProductenCatalogusFilterSet
 from sdg.api.serializers import ProductenCatalogusSerializer
+from sdg.api.views.mixins import ConditionalGetMixin, ResponseCacheMixin
+from sdg.core.db.expressions import max_subquery
 from sdg.core.models import ProductenCatalogus
-from sdg.producten.models import Product
+from sdg.producten.models import Product, ProductVersie
 
 
 @extend_schema_view(
@@ -59,7 +65,9 @@ from sdg.producten.models import Product
         ],
     ),
 )
-class CatalogusViewSet(viewsets.ReadOnlyModelViewSet):
+class CatalogusViewSet(
+    ResponseCacheMixin, ConditionalGetMixin, viewsets.ReadOnlyModelViewSet
+):
     """Viewset for a municipality catalog, retrieved by UUID"""
 
     serializer_class = ProductenCatalogusSerializer
@@ -74,3 +82,49 @@ class CatalogusViewSet(viewsets.ReadOnlyModelViewSet):
         )
         .distinct()
     )
+
+    def get_last_modified_expression(self):
+        return Greatest(
+            "gewijzigd_op",
+            "lokale_overheid__gewijzigd_op",
+            "lokale_overheid__organisatie__gewijzigd_op",
+            max_subquery(
+                Product.objects.filter(catalogus=OuterRef("pk")), "gewijzigd_op"
+            ),
+            max_subquery(
+                Product.objects.filter(catalogus=OuterRef("pk")),
+                "generiek_product__upn__gewijzigd_op",
+            ),
+            max_subquery(
+                ProductVersie.objects.filter(product__catalogus=OuterRef("pk")),
+                "gewijzigd_op",
+            ),
+            # A product is only listed once a version is published.
+            Cast(
+                max_subquery(
+                    ProductVersie.objects.filter(
+                        product__catalogus=OuterRef("pk"),
+                        publicatie_datum__lte=datetime.date.today(),
+                    ),
+                    "publicatie_datum",
+                ),
+                output_field=DateTimeField(),
+            ),
+        )
+
+    def get_etag_expressions(self):
+        # Removing or hiding a product does not change the last modification of
+        # the remaining products.
+        return {
+            "_producten": ArraySubquery(
+                Product.objects.filter(catalogus=OuterRef("pk"), api_verborgen=False)
+                .exclude_generic_status(api=True)
+                .order_by("pk")
+                .values("pk")
+            )
+        }
+
+    def get_etag_variant(self):
+        if self.request.auth and self.request.auth.api_default_most_recent:
+            return "most_recent_version"
+        return "active_version"
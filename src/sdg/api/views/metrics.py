@@ -0,0 +1,113 @@
+from drf_spectacular.utils import extend_schema
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+from sdg.api.cache import get_product_cache_statistics
+from sdg.api.permissions import TokenRequiredPermission
+from sdg.api.renderers import PrometheusRenderer
+from sdg.core.metrics import UNCACHED, get_metrics
+
+
+def format_labels(labels: dict) -> str:
+    def escape(value: str) -> str:
+        return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+    return ",".join(f'{label}="{escape(value)}"' for label, value in labels.items())
+
+
+def format_metric(name: str, metric_type: str, description: str, value) -> str:
+    """
+    :param value: The value, or a list of ``(labels, value)`` samples.
+    """
+    samples = value if isinstance(value, list) else [({}, value)]
+    lines = [
+        f"{name}{{{format_labels(labels)}}} {value}" if labels else f"{name} {value}"
+        for labels, value in samples
+    ]
+    return f"# HELP {name} {description}\n" f"# TYPE {name} {metric_type}\n" + "".join(
+        f"{line}\n" for line in lines
+    )
+
+
+@extend_schema(exclude=True)
+class MetricsView(APIView):
+    """Operational metrics of the API, in the Prometheus text format."""
+
+    permission_classes = [TokenRequiredPermission]
+    renderer_classes = [PrometheusRenderer]
+
+    def get(self, request, *args, **kwargs):
+        statistics = get_product_cache_statistics()
+        metrics = get_metrics()
+
+        def samples(field: str) -> list:
+            return [
+                ({"kind": kind, "name": name}, values[field])
+                for (kind, name), values in metrics.items()
+                if kind != UNCACHED
+            ]
+
+        return Response(
+            "".join(
+                [
+                    format_metric(
+                        "sdg_api_product_cache_hits_total",
+                        "counter",
+                        "Number of product documents served from the cache.",
+                        statistics["hits"],
+                    ),
+                    format_metric(
+                        "sdg_api_product_cache_misses_total",
+                        "counter",
+                        "Number of product documents that had to be serialized.",
+                        statistics["misses"],
+                    ),
+                    format_metric(
+                        "sdg_api_product_cache_hit_ratio",
+                        "gauge",
+                        "Ratio of product documents served from the cache.",
+                        statistics["hit_ratio"],
+                    ),
+                    format_metric(
+                        "sdg_runs_total",
+                        "counter",
+                        "Number of requests, tasks and management commands.",
+                        samples("count"),
+                    ),
+                    format_metric(
+                        "sdg_queries_total",
+                        "counter",
+                        "Number of database queries of the requests, tasks and "
+                        "management commands.",
+                        samples("queries"),
+                    ),
+                    format_metric(
+                        "sdg_query_duration_seconds_total",
+                        "counter",
+                        "Time spent in the database by the requests, tasks and "
+                        "management commands.",
+                        samples("sql_time"),
+                    ),
+                    format_metric(
+                        "sdg_duration_seconds_total",
+                        "counter",
+                        "Total time of the requests, tasks and management commands.",
+                        samples("total_time"),
+                    ),
+                    format_metric(
+                        "sdg_uncached_queries_total",
+                        "counter",
+                        "Number of queries for values that were not prefetched or "
+                        "annotated.",
+                        [
+                            (
+                                dict(zip(("model", "field"), name.split(".", 1))),
+                                values["count"],
+                            )
+                            for (kind, name), values in metrics.items()
+                            if kind == UNCACHED
+                        ],
+                    ),
+                ]
+            )
+        )
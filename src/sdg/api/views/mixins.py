@@ -0,0 +1,383 @@
+import hashlib
+import json
+from calendar import timegm
+from contextlib import nullcontext
+
+from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
+from django.http import Http404, HttpResponse
+from django.shortcuts import get_object_or_404
+from django.utils.cache import get_conditional_response, patch_vary_headers
+from django.utils.http import http_date, parse_http_date_safe, quote_etag
+from django.utils.timezone import get_default_timezone, is_naive, make_aware
+
+from djangorestframework_camel_case.util import camel_to_underscore
+from rest_framework.exceptions import ValidationError
+from rest_framework.permissions import SAFE_METHODS
+from rest_framework.response import Response
+
+from sdg.api.cache import (
+    get_response_cache,
+    get_response_cache_generation,
+    make_response_cache_key,
+)
+from sdg.api.compression import compress, negotiate_encoding, set_content_encoding
+from sdg.core.db.routers import read_from_replica
+
+
+def get_timestamp(value) -> int:
+    """
+    Return the UNIX timestamp of a datetime of the database, which is naive
+    and in the local time zone (``USE_TZ = False``).
+    """
+    if is_naive(value):
+        value = make_aware(value, get_default_timezone())
+    return timegm(value.utctimetuple())
+
+
+class ConditionalGetMixin:
+    """
+    Answer conditional requests (``If-None-Match``/``If-Modified-Since``) on
+    the ``list`` and ``retrieve`` actions. The ``list`` action only has an
+    ETag, ``If-Modified-Since`` is only answered by the ``retrieve`` action.
+
+    The page is determined without prefetching any related objects. The
+    validators are computed from the objects on the page, with a single query,
+    so a ``304 Not Modified`` response is returned without fetching the related
+    objects or running the serializer.
+    """
+
+    def get_last_modified_expression(self):
+        """
+        Return the expression for the last modification of an object, including
+        the related objects that are part of its representation.
+        """
+        raise NotImplementedError
+
+    def get_etag_variant(self):
+        """
+        Return the (JSON serializable) values, other than the URL and the
+        objects, that the representation depends on.
+        """
+        return None
+
+    def get_etag_expressions(self) -> dict:
+        """
+        Return the expressions, by name, for the (JSON serializable) state of an
+        object that its last modification does not reflect, like the related
+        objects that were removed or hidden. The state is part of the ETag.
+        """
+        return {}
+
+    def get_representations(self, queryset, pks) -> list:
+        """
+        Return the serialized objects with the given ``pks``, retrieved (with
+        all related objects) from the ``queryset``.
+        """
+        instances = {instance.pk: instance for instance in queryset.filter(pk__in=pks)}
+
+        return self.get_serializer(
+            [instances[pk] for pk in pks if pk in instances], many=True
+        ).data
+
+    def list(self, request, *args, **kwargs):
+        queryset = self.filter_queryset(self.get_queryset())
+
+        page = self.paginate_queryset(queryset.prefetch_related(None))
+        if page is not None:
+            objects = page
+            # The pagination metadata (count and links) is part of the
+            # representation of the page as well.
+            metadata = self.get_paginated_response([]).data
+        else:
+            objects = list(queryset.prefetch_related(None))
+            metadata = None
+
+        # The last modification of the objects on the page does not change
+        # when an object is removed from the page, only the ETag (which
+        # includes the objects) is used as validator.
+        etag, _ = self.get_validators(objects, metadata)
+        response = self.get_not_modified_response(request, etag, None)
+
+        if response is None:
+            data = self.get_representations(queryset, [obj.pk for obj in objects])
+            if page is not None:
+                response = self.get_paginated_response(data)
+            else:
+                response = Response(data)
+
+        return self.set_validators(response, etag, None)
+
+    def retrieve(self, request, *args, **kwargs):
+        queryset = self.filter_queryset(self.get_queryset())
+
+        lookup_url_kwarg = self.lookup_url_kwarg or self.lookup_field
+        instance = get_object_or_404(
+            queryset.prefetch_related(None),
+            **{self.lookup_field: self.kwargs[lookup_url_kwarg]},
+        )
+        self.check_object_permissions(request, instance)
+
+        etag, last_modified = self.get_validators([instance])
+        response = self.get_not_modified_response(request, etag, last_modified)
+
+        if response is None:
+            representations = self.get_representations(queryset, [instance.pk])
+            if not representations:
+                raise Http404
+            response = Response(representations[0])
+
+        return self.set_validators(response, etag, last_modified)
+
+    def get_validators(self, objects, metadata=None) -> tuple:
+        """
+        :returns: The ETag and the last modification (or ``None``) of the
+            representation of the ``objects``.
+        """
+        pks = [obj.pk for obj in objects]
+
+        states = []
+        if pks:
+            states = list(self.get_state_queryset(pks))
+
+        return self.make_validators(pks, metadata, states)
+
+    def get_state_queryset(self, pks):
+        """
+        Return the last modification and the other state (see
+        ``get_etag_expressions``) of each of the objects with the given
+        ``pks``.
+        """
+        model = self.get_queryset().model
+        expressions = self.get_etag_expressions()
+        return (
+            model._default_manager.filter(pk__in=pks)
+            .annotate(_last_modified=self.get_last_modified_expression(), **expressions)
+            .order_by("pk")
+            .values_list("_last_modified", *expressions)
+        )
+
+    def make_validators(self, pks, metadata, states) -> tuple:
+        last_modified = max(
+            (state[0] for state in states if state[0] is not None), default=None
+        )
+        state = json.dumps(
+            [
+                self.request.build_absolute_uri(),
+                self.get_etag_variant(),
+                pks,
+                metadata,
+                last_modified,
+                [state[1:] for state in states],
+            ],
+            cls=DjangoJSONEncoder,
+        )
+        etag = quote_etag(hashlib.md5(state.encode()).hexdigest())
+        return etag, last_modified
+
+    def get_not_modified_response(self, request, etag, last_modified):
+        return get_conditional_response(
+            request,
+            etag=etag,
+            last_modified=get_timestamp(last_modified) if last_modified else None,
+        )
+
+    def set_validators(self, response, etag, last_modified):
+        if response.status_code in (200, 304):
+            response["ETag"] = etag
+            if last_modified:
+                response["Last-Modified"] = http_date(get_timestamp(last_modified))
+
+        # The representation depends on the kind of API token.
+        patch_vary_headers(response, ["Authorization"])
+        return response
+
+
+class ResponseCacheMixin:
+    """
+    Cache the complete responses to anonymous ``list`` and ``retrieve``
+    requests.
+
+    The responses are cached per generation, which is bumped whenever the
+    data of the API changes (see ``bump_response_cache_generation``).
+    Authentication, permissions and throttling still apply to cached
+    responses, and conditional requests are answered from the cached
+    validators.
+
+    The responses are compressed once, when they are cached, and served
+    compressed to the clients that accept it.
+    """
+
+    response_cache_headers = ("ETag", "Last-Modified", "Vary")
+    _response_cache_key = None
+
+    def list(self, request, *args, **kwargs):
+        response = self.get_cached_response(request)
+        if response is None:
+            with self.render_for_cache():
+                response = super().list(request, *args, **kwargs)
+        return response
+
+    def retrieve(self, request, *args, **kwargs):
+        response = self.get_cached_response(request)
+        if response is None:
+            with self.render_for_cache():
+                response = super().retrieve(request, *args, **kwargs)
+        return response
+
+    def render_for_cache(self):
+        """
+        Return the context to produce a response that is not cached yet in.
+
+        A response that will be cached is read from the primary database. Read
+        from a lagging replica, it would keep the old data under the current
+        generation.
+        """
+        if self._response_cache_key is None:
+            return nullcontext()
+        return read_from_replica(enabled=False)
+
+    def get_cached_response(self, request):
+        if not settings.SDG_API_RESPONSE_CACHE_ENABLED or request.auth is not None:
+            return None
+
+        self._response_cache_key = make_response_cache_key(
+            request, get_response_cache_generation()
+        )
+        entry = get_response_cache().get(self._response_cache_key)
+        if entry is None:
+            return None
+
+        encodings = entry.get("encodings", {})
+        encoding = negotiate_encoding(
+            request.META.get("HTTP_ACCEPT_ENCODING"), encodings
+        )
+
+        response = HttpResponse(
+            encodings[encoding] if encoding else entry["content"],
+            content_type=entry["content_type"],
+        )
+        for header, value in entry["headers"].items():
+            response[header] = value
+        if encoding:
+            set_content_encoding(response, encoding)
+
+        return get_conditional_response(
+            request,
+            etag=response.get("ETag"),
+            last_modified=parse_http_date_safe(response.get("Last-Modified")),
+            response=response,
+        )
+
+    def finalize_response(self, request, response, *args, **kwargs):
+        response = super().finalize_response(request, response, *args, **kwargs)
+
+        key = self._response_cache_key
+        if key and isinstance(response, Response) and response.status_code == 200:
+            # The cached responses are served compressed if accepted.
+            patch_vary_headers(response, ["Accept-Encoding"])
+            response.add_post_render_callback(
+                lambda rendered: self.cache_response(request, key, rendered)
+            )
+        return response
+
+    def cache_response(self, request, key, response):
+        """
+        Cache the rendered ``response``, next to its compressed content, and
+        compress the ``response`` itself if the client accepts it.
+        """
+        encodings = compress(response.content)
+        get_response_cache().set(
+            key,
+            {
+                "content": response.content,
+                "content_type": response["Content-Type"],
+                "headers": {
+                    header: response[header]
+                    for header in self.response_cache_headers
+                    if header in response
+                },
+                "encodings": encodings,
+            },
+            timeout=settings.SDG_API_RESPONSE_CACHE_TIMEOUT,
+        )
+
+        encoding = negotiate_encoding(
+            request.META.get("HTTP_ACCEPT_ENCODING"), encodings
+        )
+        if encoding:
+            response.content = encodings[encoding]
+            set_content_encoding(response, encoding)
+
+
+class SparseFieldsetMixin:
+    """
+    Support the ``velden`` query parameter on read requests: only the requested
+    fields of the serializer are returned, and only the related objects of
+    those fields are retrieved.
+
+    The serializer should use ``sdg.api.serializers.mixins.SparseFieldsetMixin``.
+    """
+
+    #: The ``select_related`` lookups that are needed for each serializer field.
+    velden_select_related = {}
+    #: The ``prefetch_related`` lookups that are needed for each serializer field.
+    velden_prefetch_related = {}
+
+    def get_velden(self):
+        """
+        :returns: The names of the requested serializer fields, or ``None`` if
+            all fields should be returned.
+        """
+        request = getattr(self, "request", None)
+        if request is None or request.method not in SAFE_METHODS:
+            return None
+
+        value = request.query_params.get("velden")
+        if not value:
+            return None
+
+        velden = {
+            camel_to_underscore(veld.strip()): veld.strip()
+            for veld in value.split(",")
+            if veld.strip()
+        }
+        unknown = set(velden) - set(self.get_serializer_class().Meta.fields)
+        if unknown:
+            raise ValidationError(
+                {
+                    "velden": [
+                        "Onbekende velden: {velden}.".format(
+                            velden=", ".join(sorted(velden[veld] for veld in unknown))
+                        )
+                    ]
+                }
+            )
+
+        return set(velden)
+
+    def get_serializer_context(self):
+        return {**super().get_serializer_context(), "velden": self.get_velden()}
+
+    def select_velden_related(self, queryset):
+        """
+        Add the ``select_related`` and ``prefetch_related`` lookups of the
+        requested fields to the ``queryset``.
+        """
+        velden = self.get_velden()
+
+        def get_lookups(lookups_per_veld):
+            return list(
+                dict.fromkeys(
+                    lookup
+                    for veld, lookups in lookups_per_veld.items()
+                    if velden is None or veld in velden
+                    for lookup in lookups
+                )
+            )
+
+        select_related = get_lookups(self.velden_select_related)
+        if select_related:
+            queryset = queryset.select_related(*select_related)
+
+        return queryset.prefetch_related(*get_lookups(self.velden_prefetch_related))
@@ -1,15 +1,29 @@
+from django.conf import settings
+
 from drf_spectacular.types import OpenApiTypes
 from drf_spectacular.utils import OpenApiParameter, extend_schema, extend_schema_view
 from rest_framework import mixins, viewsets
+from rest_framework.decorators import action
+from rest_framework.exceptions import PermissionDenied
+from rest_framework.response import Response
 from rest_framework.viewsets import GenericViewSet
 
 from sdg.api.filters import LocatieFilterSet, LokaleOverheidFilterSet
-from sdg.api.permissions import OrganizationPermissions, WhitelistedPermission
+from sdg.api.locaties import LocatieSync
+from sdg.api.permissions import (
+    OrganizationPermissions,
+    TokenRequiredPermission,
+    WhitelistedPermission,
+)
 from sdg.api.serializers import LokaleOverheidSerializer
 from sdg.api.serializers.organisaties import (
     LocatieSerializer,
+    LocatieSyncResultSerializer,
+    LocatieSyncSerializer,
     LokaleOverheidUpdateSerializer,
 )
+from sdg.api.tokens import record_last_seen
+from sdg.api.views.mixins import ResponseCacheMixin, SparseFieldsetMixin
 from sdg.core.models.logius import Overheidsorganisatie
 from sdg.organisaties.models import LokaleOverheid, Lokatie as Locatie
 
@@ -40,6 +54,13 @@ from sdg.organisaties.models import LokaleOverheid, Lokatie as Locatie
                 type=int,
                 location=OpenApiParameter.QUERY,
             ),
+            OpenApiParameter(
+                name="velden",
+                description="Een komma-gescheiden lijst van de velden van de organisatie die u wilt zien, bijvoorbeeld `url,owmsIdentifier,owmsPrefLabel`. Indien niet opgegeven dan worden alle velden getoond.",
+                required=False,
+                type=str,
+                location=OpenApiParameter.QUERY,
+            ),
         ],
     ),
     retrieve=extend_schema(
@@ -52,7 +73,14 @@ from sdg.organisaties.models import LokaleOverheid, Lokatie as Locatie
                 required=False,
                 type=OpenApiTypes.UUID,
                 location=OpenApiParameter.PATH,
-            )
+            ),
+            OpenApiParameter(
+                name="velden",
+                description="Een komma-gescheiden lijst van de velden van de organisatie die u wilt zien, bijvoorbeeld `url,owmsIdentifier,owmsPrefLabel`. Indien niet opgegeven dan worden alle velden getoond.",
+                required=False,
+                type=str,
+                location=OpenApiParameter.QUERY,
+            ),
         ],
     ),
     update=extend_schema(
@@ -79,8 +107,32 @@ from sdg.organisaties.models import LokaleOverheid, Lokatie as Locatie
             )
         ],
     ),
+    locaties=extend_schema(
+        description=f"""Synchroniseer alle locaties van een organisatie in één verzoek. U geeft de volledige lijst van locaties op, iedere locatie met dezelfde gegevens als bij het bijwerken van een enkele locatie. Er kunnen maximaal {settings.SDG_API_LOCATIE_SYNC_MAX_SIZE} locaties per verzoek worden opgegeven.
+
+Een opgegeven locatie wordt vergeleken met de bestaande locatie met dezelfde `uuid`, of indien geen `uuid` is opgegeven met de bestaande locatie met dezelfde `naam`:
+
+* Een bestaande locatie die afwijkt wordt bijgewerkt.
+* Een locatie die nog niet bestaat wordt aangemaakt.
+* Bij `PUT` worden de bestaande locaties die niet zijn opgegeven verwijderd. Bij `PATCH` blijven deze ongewijzigd.
+
+Alle wijzigingen worden in één keer opgeslagen. Indien een van de locaties fouten bevat, dan wordt niets opgeslagen. Het antwoord bevat de UUID's van de aangemaakte, bijgewerkte, ongewijzigde en verwijderde locaties.""",
+        parameters=[
+            OpenApiParameter(
+                name="uuid",
+                description="De UUID van de organisatie waarvan u de locaties wilt synchroniseren.",
+                required=True,
+                type=OpenApiTypes.UUID,
+                location=OpenApiParameter.PATH,
+            )
+        ],
+        request=LocatieSyncSerializer(many=True),
+        responses=LocatieSyncResultSerializer,
+    ),
 )
 class LokaleOverheidViewSet(
+    ResponseCacheMixin,
+    SparseFieldsetMixin,
     mixins.ListModelMixin,
     mixins.RetrieveModelMixin,
     mixins.UpdateModelMixin,
@@ -89,20 +141,24 @@ class LokaleOverheidViewSet(
     """Viewset for a municipality, retrieved by UUID"""
 
     lookup_field = "uuid"
-    queryset = (
-        LokaleOverheid.objects.active_organization()
-        .select_related(
-            "organisatie",
-        )
-        .prefetch_related(
-            "locaties",
-            "catalogi",
-            "bevoegde_organisaties__organisatie",
-        )
-        .distinct()
-    )
+    queryset = LokaleOverheid.objects.active_organization().distinct()
     filterset_class = LokaleOverheidFilterSet
     permission_classes = [OrganizationPermissions, WhitelistedPermission]
+    velden_select_related = {
+        "owms_identifier": ["organisatie"],
+        "owms_pref_label": ["organisatie"],
+        "owms_end_date": ["organisatie"],
+    }
+    velden_prefetch_related = {
+        "locaties": ["locaties"],
+        "catalogi": ["catalogi"],
+        "bevoegde_organisaties": ["bevoegde_organisaties__organisatie"],
+    }
+
+    def get_queryset(self):
+        if self.action == "locaties":
+            return super().get_queryset()
+        return self.select_velden_related(super().get_queryset())
 
     def get_serializer_class(self):
         if self.request.method in ["PUT", "PATCH"]:
@@ -115,6 +171,31 @@ class LokaleOverheidViewSet(
 
         return obj.organisatie
 
+    @action(
+        detail=True,
+        methods=["put", "patch"],
+        pagination_class=None,
+        permission_classes=[TokenRequiredPermission, WhitelistedPermission],
+    )
+    def locaties(self, request, *args, **kwargs):
+        """Synchronise the locations of the organization and return a summary."""
+        lokale_overheid = self.get_object()
+        if lokale_overheid.organisatie_id not in request.auth.organisaties:
+            raise PermissionDenied(
+                "U heeft geen rechten om locaties van deze organisatie te wijzigen."
+            )
+
+        record_last_seen(request.auth)
+
+        result = LocatieSync(
+            lokale_overheid,
+            request.data,
+            self.get_serializer_context(),
+            replace=request.method == "PUT",
+        ).save()
+
+        return Response(LocatieSyncResultSerializer(result).data)
+
 
 @extend_schema_view(
     list=extend_schema(
@@ -150,6 +231,13 @@ class LokaleOverheidViewSet(
                 type=int,
                 location=OpenApiParameter.QUERY,
             ),
+            OpenApiParameter(
+                name="velden",
+                description="Een komma-gescheiden lijst van de velden van de locatie die u wilt zien, bijvoorbeeld `url,naam,organisatie`. Indien niet opgegeven dan worden alle velden getoond.",
+                required=False,
+                type=str,
+                location=OpenApiParameter.QUERY,
+            ),
         ],
     ),
     retrieve=extend_schema(
@@ -162,7 +250,14 @@ class LokaleOverheidViewSet(
                 required=True,
                 type=OpenApiTypes.UUID,
                 location=OpenApiParameter.PATH,
-            )
+            ),
+            OpenApiParameter(
+                name="velden",
+                description="Een komma-gescheiden lijst van de velden van de locatie die u wilt zien, bijvoorbeeld `url,naam,organisatie`. Indien niet opgegeven dan worden alle velden getoond.",
+                required=False,
+                type=str,
+                location=OpenApiParameter.QUERY,
+            ),
         ],
     ),
     create=extend_schema(
@@ -205,16 +300,18 @@ class LokaleOverheidViewSet(
         ],
     ),
 )
-class LocatieViewSet(viewsets.ModelViewSet):
+class LocatieViewSet(ResponseCacheMixin, SparseFieldsetMixin, viewsets.ModelViewSet):
     """Viewset for a location, retrieved by UUID"""
 
     lookup_field = "uuid"
-    queryset = Locatie.objects.select_related(
-        "lokale_overheid", "lokale_overheid__organisatie"
-    ).distinct()
+    queryset = Locatie.objects.distinct()
     filterset_class = LocatieFilterSet
     serializer_class = LocatieSerializer
     permission_classes = [OrganizationPermissions, WhitelistedPermission]
+    velden_select_related = {"organisatie": ["lokale_overheid__organisatie"]}
+
+    def get_queryset(self):
+        return self.select_velden_related(super().get_queryset())
 
     def get_organisatie(self, request, view, obj=None):
         if request.method == "POST":
@@ -1,17 +1,66 @@
+import datetime
+import operator
+from functools import reduce
+
+from django.conf import settings
+from django.contrib.postgres.expressions import ArraySubquery
+from django.db.models import DateTimeField, OuterRef, Q
+from django.db.models.functions import Cast, Greatest
+from django.http import StreamingHttpResponse
+from django.utils.cache import patch_vary_headers
+from django.utils.text import compress_sequence
+
 from drf_spectacular.types import OpenApiTypes
 from drf_spectacular.utils import OpenApiParameter, extend_schema, extend_schema_view
 from rest_framework import mixins
+from rest_framework.decorators import action
+from rest_framework.exceptions import ValidationError
+from rest_framework.permissions import AllowAny
+from rest_framework.response import Response
 from rest_framework.viewsets import GenericViewSet
 
-from sdg.api.filters import GeneriekProductFilterSet, ProductFilterSet
-from sdg.api.permissions import OrganizationPermissions, WhitelistedPermission
+from sdg.api.batch import ProductBatch
+from sdg.api.cache import ProductDocumentCache, get_product_document_variant
+from sdg.api.compression import GZIP, negotiate_encoding
+from sdg.api.export import iter_product_export
+from sdg.api.filters import (
+    GeneriekProductFilterSet,
+    ProductFilterSet,
+    ProductWijzigingFilterSet,
+)
+from sdg.api.pagination import ProductPagination, ProductWijzigingPagination
+from sdg.api.permissions import (
+    OrganizationPermissions,
+    TokenRequiredPermission,
+    WhitelistedPermission,
+)
+from sdg.api.renderers import NDJSONRenderer
 from sdg.api.serializers import (
     GeneriekProductSerializer,
+    ProductBatchResultSerializer,
     ProductSerializer,
+    ProductSleutelSerializer,
     ProductVersieSerializer,
+    ProductWijzigingSerializer,
 )
+from sdg.api.tokens import record_last_seen
+from sdg.api.views.mixins import (
+    ConditionalGetMixin,
+    ResponseCacheMixin,
+    SparseFieldsetMixin,
+)
+from sdg.core.constants import TaalChoices
+from sdg.core.db.expressions import max_subquery
+from sdg.core.db.routers import read_from_replica
 from sdg.core.models.logius import Overheidsorganisatie
-from sdg.producten.models import LocalizedGeneriekProduct, Product, ProductVersie
+from sdg.organisaties.models import Lokatie
+from sdg.producten.models import (
+    GeneriekProductOverheidsorganisatieRol,
+    LocalizedGeneriekProduct,
+    LocalizedProduct,
+    Product,
+    ProductVersie,
+)
 
 
 @extend_schema_view(
@@ -27,6 +76,8 @@ De UUID is overgenomen van de nationale portalen.""",
     ),
 )
 class GeneriekProductViewSet(
+    ResponseCacheMixin,
+    ConditionalGetMixin,
     mixins.ListModelMixin,
     mixins.RetrieveModelMixin,
     GenericViewSet,
@@ -54,6 +105,41 @@ class GeneriekProductViewSet(
     filterset_class = GeneriekProductFilterSet
     serializer_class = GeneriekProductSerializer
 
+    def get_last_modified_expression(self):
+        # The dates of the national import are not set by the edits in the CMS
+        # and can be empty, they are only part of the last modification.
+        return Greatest(
+            "gewijzigd_op",
+            "laatst_gewijzigd",
+            "datum_check",
+            "generiek_product__gewijzigd_op",
+            "generiek_product__upn__gewijzigd_op",
+            max_subquery(
+                GeneriekProductOverheidsorganisatieRol.objects.filter(
+                    generiek_product=OuterRef("generiek_product")
+                ),
+                "gewijzigd_op",
+            ),
+            max_subquery(
+                GeneriekProductOverheidsorganisatieRol.objects.filter(
+                    generiek_product=OuterRef("generiek_product")
+                ),
+                "overheidsorganisatie__gewijzigd_op",
+            ),
+        )
+
+    def get_etag_expressions(self):
+        # Removing a role does not change the last modification.
+        return {
+            "_rollen": ArraySubquery(
+                GeneriekProductOverheidsorganisatieRol.objects.filter(
+                    generiek_product=OuterRef("generiek_product")
+                )
+                .order_by("pk")
+                .values("pk")
+            )
+        }
+
 
 @extend_schema_view(
     list=extend_schema(
@@ -73,6 +159,15 @@ Deze gegevens tezamen vormen de unieke sleutel van een product.""",
                 type=OpenApiTypes.UUID,
                 location=OpenApiParameter.QUERY,
             ),
+            OpenApiParameter(
+                name="cursor",
+                description="""De cursor van de gewenste pagina bij cursor-paginering. Geef een lege waarde op voor de eerste pagina en volg daarna de `next` URL.
+
+Cursor-paginering is sneller dan paginering op paginanummer, omdat het totaal aantal resultaten niet wordt bepaald.""",
+                required=False,
+                type=str,
+                location=OpenApiParameter.QUERY,
+            ),
             OpenApiParameter(
                 name="doelgroep",
                 description="""De gewenste doelgroep om alleen producten met die doelgroep te zien.
@@ -157,6 +252,24 @@ Opties: `en` of `nl`""",
                 type=str,
                 location=OpenApiParameter.QUERY,
             ),
+            OpenApiParameter(
+                name="zoek",
+                description="""Zoektermen om alleen de producten te zien waarvan de teksten (de titel en de velden die Markdown ondersteunen) deze termen bevatten. Er wordt gezocht in de taal van iedere vertaling, of alleen in de taal die met `taal` is opgegeven.
+
+U kunt woorden tussen aanhalingstekens plaatsen om op een exacte zin te zoeken, `or` gebruiken om op een van beide termen te zoeken en een `-` voor een term plaatsen om producten met die term uit te sluiten.""",
+                required=False,
+                type=str,
+                location=OpenApiParameter.QUERY,
+            ),
+            OpenApiParameter(
+                name="velden",
+                description="""Een komma-gescheiden lijst van de velden van het product die u wilt zien, bijvoorbeeld `url,upnUri,verantwoordelijkeOrganisatie,publicatieDatum`. Indien niet opgegeven dan worden alle velden getoond.
+
+Door alleen de benodigde velden op te vragen wordt het antwoord kleiner en sneller.""",
+                required=False,
+                type=str,
+                location=OpenApiParameter.QUERY,
+            ),
         ],
     ),
     retrieve=extend_schema(
@@ -176,6 +289,15 @@ Opties: `en` of `nl`""",
                 type=int,
                 location=OpenApiParameter.QUERY,
             ),
+            OpenApiParameter(
+                name="velden",
+                description="""Een komma-gescheiden lijst van de velden van het product die u wilt zien, bijvoorbeeld `url,upnUri,verantwoordelijkeOrganisatie,publicatieDatum`. Indien niet opgegeven dan worden alle velden getoond.
+
+Door alleen de benodigde velden op te vragen wordt het antwoord kleiner en sneller.""",
+                required=False,
+                type=str,
+                location=OpenApiParameter.QUERY,
+            ),
         ],
     ),
     create=extend_schema(
@@ -192,8 +314,49 @@ Indien u geen `bevoegdeOrganisatie` opgeeft, dan wordt de `verantwoordelijkeOrga
 organisatie. Indien u geen `catalogus` opgeeft, dan wordt de standaard catalogus gebruikt.
 """
     ),
+    wijzigingen=extend_schema(
+        description="""Lijst van alle producten die gewijzigd zijn sinds een bepaald tijdstip, met de soort en het tijdstip van de laatste wijziging. Hiermee kunt u de producten incrementeel synchroniseren, in plaats van steeds de volledige lijst op te halen.
+
+De lijst is gesorteerd op het tijdstip van de wijziging en wordt gepagineerd met een cursor: volg de `next` URL totdat deze `null` is. Het tijdstip van de laatste wijziging in de lijst kunt u bij een volgende synchronisatie als `sinds` gebruiken.
+
+Een wijziging is een van:
+
+* `nieuwe_versie`: een productversie is aangemaakt of gewijzigd.
+* `publicatie`: een productversie is actief geworden op de publicatiedatum.
+* `verborgen`: het product is verborgen voor de nationale portalen.
+* `organisatie_opgeheven`: de verantwoordelijke organisatie is opgeheven.
+* `gewijzigd`: het product of een van de locaties is gewijzigd.""",
+        auth=[],
+        responses=ProductWijzigingSerializer(many=True),
+    ),
+    export=extend_schema(
+        description="""Exporteer alle (actieve versies van de) producten als [NDJSON](https://github.com/ndjson/ndjson-spec): ieder product staat als JSON-object op een eigen regel. Een product heeft dezelfde opbouw als bij het ophalen van een enkel product. U kunt dezelfde filters gebruiken als bij de lijst van producten.
+
+De producten worden direct verstuurd terwijl ze worden opgehaald, er is geen paginering. Indien u `Accept-Encoding: gzip` meestuurt, wordt de export gecomprimeerd met gzip.
+
+Voor de export is een API-token nodig.""",
+        responses=ProductSerializer(many=True),
+    ),
+    batch=extend_schema(
+        description=f"""Werk meerdere producten in één verzoek bij. U geeft een lijst op van producten, ieder product met dezelfde gegevens als bij het bijwerken van een enkel product. Er kunnen maximaal {settings.SDG_API_PRODUCT_BATCH_MAX_SIZE} producten per verzoek worden opgegeven.
+
+Het antwoord bevat voor ieder opgegeven product (in dezelfde volgorde) het resultaat: het opgeslagen product, of de fouten waardoor het product niet is opgeslagen. Een product met fouten verhindert niet dat de overige producten worden opgeslagen.""",
+        request=ProductSerializer(many=True),
+        responses=ProductBatchResultSerializer(many=True),
+    ),
+    zoeken=extend_schema(
+        description=f"""Zoek meerdere producten in één verzoek op aan de hand van hun unieke sleutel: de `upnUri`, de `organisatieOwmsIdentifier` van de verantwoordelijke organisatie en de `doelgroep`. Er kunnen maximaal {settings.SDG_API_PRODUCT_LOOKUP_MAX_SIZE} sleutels per verzoek worden opgegeven.
+
+Het antwoord bevat voor iedere opgegeven sleutel (in dezelfde volgorde) het product, of `null` als er geen product met deze sleutel is. Een product heeft dezelfde opbouw als bij het ophalen van een enkel product.""",
+        auth=[],
+        request=ProductSleutelSerializer(many=True),
+        responses=ProductSerializer(many=True),
+    ),
 )
 class ProductViewSet(
+    ResponseCacheMixin,
+    SparseFieldsetMixin,
+    ConditionalGetMixin,
     mixins.ListModelMixin,
     mixins.RetrieveModelMixin,
     mixins.CreateModelMixin,
@@ -205,29 +368,26 @@ class ProductViewSet(
     queryset = (
         Product.objects.active_organization()
         .filter(api_verborgen=False)
-        .select_related(
-            "catalogus",
-            "catalogus__lokale_overheid",
-            "catalogus__lokale_overheid__organisatie",
-            "bevoegde_organisatie",
-            "bevoegde_organisatie__organisatie",
-            "product_valt_onder",
-            "product_valt_onder__generiek_product__upn",
-            "generiek_product",
-            "generiek_product__upn",
-        )
-        .prefetch_related(
-            "locaties",
-            "versies",
-            "versies__vertalingen",
-        )
         .order_by("generiek_product__upn__upn_label")
         .exclude_generic_status(api=True)
         .distinct()
     )
     filterset_class = ProductFilterSet
     serializer_class = ProductSerializer
+    pagination_class = ProductPagination
     permission_classes = [OrganizationPermissions, WhitelistedPermission]
+    velden_select_related = {
+        "upn_label": ["generiek_product__upn"],
+        "upn_uri": ["generiek_product__upn"],
+        "doelgroep": ["generiek_product"],
+        "product_valt_onder": ["product_valt_onder__generiek_product__upn"],
+        "verantwoordelijke_organisatie": ["catalogus__lokale_overheid__organisatie"],
+        "bevoegde_organisatie": ["bevoegde_organisatie__organisatie"],
+        "catalogus": ["catalogus"],
+        # The explanations of the translations depend on `productValtOnder`.
+        "vertalingen": ["product_valt_onder"],
+    }
+    velden_prefetch_related = {"locaties": ["locaties"]}
 
     def get_queryset(self):
         """
@@ -235,13 +395,107 @@ class ProductViewSet(
 
         If not, only return active products.
         """
+        # Only prefetch the translations in the language requested with the
+        # `taal` filter, and only if they are requested at all.
+        taal = self.request.query_params.get("taal")
+        if taal not in TaalChoices.values:
+            taal = None
+        velden = self.get_velden()
+        vertalingen = velden is None or "vertalingen" in velden
+
+        queryset = self.select_velden_related(self.queryset)
         if self.request.auth and self.request.auth.api_default_most_recent:
-            return self.queryset.most_recent()
+            return queryset.most_recent(taal=taal, vertalingen=vertalingen)
         else:
             # We need to explicitly exclude active products, otherwise we get
             # a list of all products, of which some have 0 active product
             # versions.
-            return self.queryset.active(exclude_inactive_products=True)
+            return queryset.active(
+                exclude_inactive_products=True, taal=taal, vertalingen=vertalingen
+            )
+
+    def get_last_modified_expression(self):
+        return Greatest(
+            "gewijzigd_op",
+            "catalogus__gewijzigd_op",
+            "catalogus__lokale_overheid__gewijzigd_op",
+            "catalogus__lokale_overheid__organisatie__gewijzigd_op",
+            "bevoegde_organisatie__gewijzigd_op",
+            "bevoegde_organisatie__organisatie__gewijzigd_op",
+            "generiek_product__gewijzigd_op",
+            "generiek_product__upn__gewijzigd_op",
+            "product_valt_onder__gewijzigd_op",
+            "product_valt_onder__generiek_product__upn__gewijzigd_op",
+            max_subquery(
+                ProductVersie.objects.filter(product=OuterRef("pk")), "gewijzigd_op"
+            ),
+            # A version becomes active on its publication date, without being
+            # modified.
+            Cast(
+                max_subquery(
+                    ProductVersie.objects.filter(
+                        product=OuterRef("pk"),
+                        publicatie_datum__lte=datetime.date.today(),
+                    ),
+                    "publicatie_datum",
+                ),
+                output_field=DateTimeField(),
+            ),
+            max_subquery(
+                LocalizedProduct.objects.filter(product_versie__product=OuterRef("pk")),
+                "datum_wijziging",
+            ),
+            max_subquery(
+                Lokatie.objects.filter(producten=OuterRef("pk")), "gewijzigd_op"
+            ),
+        )
+
+    def get_etag_expressions(self):
+        # Removing a location does not change the last modification.
+        return {
+            "_locaties": ArraySubquery(
+                Lokatie.objects.filter(producten=OuterRef("pk"))
+                .order_by("pk")
+                .values("pk")
+            )
+        }
+
+    def get_etag_variant(self):
+        return self.get_serializer().version_property_name
+
+    def get_representations(self, queryset, pks) -> list:
+        """
+        Return the rendered documents of the products, from the cache if enabled.
+
+        The products that are not cached are retrieved (with all related
+        objects) from the ``queryset`` and serialized.
+        """
+        # Only the complete documents are cached.
+        if not settings.SDG_API_PRODUCT_CACHE_ENABLED or self.get_velden():
+            return super().get_representations(queryset, pks)
+
+        variant = get_product_document_variant(
+            self.request, self.get_serializer().version_property_name
+        )
+        cache = ProductDocumentCache(variant)
+
+        documents = cache.get_many(pks)
+
+        missing = [pk for pk in pks if pk not in documents]
+        if missing:
+            # The documents are cached for all clients, they are not read from
+            # a (lagging) replica.
+            with read_from_replica(enabled=False):
+                instances = list(queryset.filter(pk__in=missing))
+                serializer = self.get_serializer(instances, many=True)
+                serialized = {
+                    instance.pk: document
+                    for instance, document in zip(instances, serializer.data)
+                }
+            cache.set_many(serialized)
+            documents.update(serialized)
+
+        return [documents[pk] for pk in pks if pk in documents]
 
     def get_organisatie(self, request, view, obj=None):
         if request.method == "POST":
@@ -259,6 +513,162 @@ class ProductViewSet(
 
         return None
 
+    @action(
+        detail=False,
+        filterset_class=ProductWijzigingFilterSet,
+        pagination_class=ProductWijzigingPagination,
+        permission_classes=[AllowAny],
+        serializer_class=ProductWijzigingSerializer,
+    )
+    def wijzigingen(self, request, *args, **kwargs):
+        """List the products changed since the given moment."""
+        # The hidden products are included, to report that they are hidden.
+        queryset = self.filter_queryset(
+            Product.objects.exclude_generic_status(api=True)
+        )
+
+        page = self.paginate_queryset(queryset)
+        serializer = self.get_serializer(page, many=True)
+        return self.get_paginated_response(serializer.data)
+
+    @action(
+        detail=False,
+        methods=["post"],
+        pagination_class=None,
+        permission_classes=[TokenRequiredPermission, WhitelistedPermission],
+    )
+    def batch(self, request, *args, **kwargs):
+        """Save a list of products and return the result of each product."""
+        if not isinstance(request.data, list):
+            raise ValidationError(
+                {"non_field_errors": ["U dient een lijst van producten op te geven."]}
+            )
+        if len(request.data) > settings.SDG_API_PRODUCT_BATCH_MAX_SIZE:
+            raise ValidationError(
+                {
+                    "non_field_errors": [
+                        f"U kunt maximaal {settings.SDG_API_PRODUCT_BATCH_MAX_SIZE} producten tegelijk opgeven."
+                    ]
+                }
+            )
+
+        record_last_seen(request.auth)
+
+        results = ProductBatch(
+            request.data, self.get_serializer_context(), request.auth.organisaties
+        ).save()
+
+        return Response(ProductBatchResultSerializer(results, many=True).data)
+
+    @action(
+        detail=False,
+        methods=["post"],
+        pagination_class=None,
+        permission_classes=[AllowAny],
+    )
+    def zoeken(self, request, *args, **kwargs):
+        """Return the products with the given natural keys, in the same order."""
+        if not isinstance(request.data, list):
+            raise ValidationError(
+                {"non_field_errors": ["U dient een lijst van sleutels op te geven."]}
+            )
+        if len(request.data) > settings.SDG_API_PRODUCT_LOOKUP_MAX_SIZE:
+            raise ValidationError(
+                {
+                    "non_field_errors": [
+                        f"U kunt maximaal {settings.SDG_API_PRODUCT_LOOKUP_MAX_SIZE} sleutels tegelijk opgeven."
+                    ]
+                }
+            )
+
+        serializer = ProductSleutelSerializer(data=request.data, many=True)
+        if not serializer.is_valid():
+            raise ValidationError(
+                {
+                    str(index): errors
+                    for index, errors in enumerate(serializer.errors)
+                    if errors
+                }
+            )
+        keys = [
+            (key["upn_uri"], key["organisatie_owms_identifier"], key["doelgroep"])
+            for key in serializer.validated_data
+        ]
+
+        queryset = self.get_queryset()
+        products = self.get_products_by_key(queryset, keys)
+        pks = list(dict.fromkeys(products.values()))
+        documents = dict(zip(pks, self.get_representations(queryset, pks)))
+
+        return Response([documents.get(products.get(key)) for key in keys])
+
+    def get_products_by_key(self, queryset, keys) -> dict:
+        """
+        Resolve the natural keys (UPN URI, OWMS identifier of the responsible
+        organization and target group) to products, in a single query.
+
+        If an organization has the same product in multiple catalogs, the
+        product in the default catalog is used.
+
+        :returns: A mapping of each key that exists to the pk of its product.
+        """
+        if not keys:
+            return {}
+
+        condition = reduce(
+            operator.or_,
+            (
+                Q(
+                    generiek_product__upn__upn_uri=upn_uri,
+                    catalogus__lokale_overheid__organisatie__owms_identifier=owms_identifier,
+                    generiek_product__doelgroep=doelgroep,
+                )
+                for upn_uri, owms_identifier, doelgroep in set(keys)
+            ),
+        )
+        rows = (
+            queryset.filter(condition)
+            .order_by("-catalogus__is_default_catalogus", "pk")
+            .values_list(
+                "generiek_product__upn__upn_uri",
+                "catalogus__lokale_overheid__organisatie__owms_identifier",
+                "generiek_product__doelgroep",
+                "pk",
+            )
+        )
+
+        products = {}
+        for upn_uri, owms_identifier, doelgroep, pk in rows:
+            products.setdefault((upn_uri, owms_identifier, doelgroep), pk)
+        return products
+
+    @action(
+        detail=False,
+        pagination_class=None,
+        permission_classes=[TokenRequiredPermission],
+        renderer_classes=[NDJSONRenderer],
+    )
+    def export(self, request, *args, **kwargs):
+        """Stream all products as NDJSON, compressed if the client accepts it."""
+        queryset = self.filter_queryset(self.get_queryset())
+        content = iter_product_export(self, queryset)
+
+        gzip = (
+            negotiate_encoding(request.headers.get("Accept-Encoding"), [GZIP]) == GZIP
+        )
+        if gzip:
+            content = compress_sequence(content)
+
+        response = StreamingHttpResponse(
+            content, content_type=NDJSONRenderer.media_type
+        )
+        response["Content-Disposition"] = 'attachment; filename="producten.ndjson"'
+        if gzip:
+            response["Content-Encoding"] = "gzip"
+        patch_vary_headers(response, ["Accept-Encoding"])
+
+        return response
+
 
 @extend_schema_view(
     list=extend_schema(
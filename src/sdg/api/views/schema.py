@@ -0,0 +1,59 @@
+from django.conf import settings
+from django.http import HttpResponse
+from django.utils import translation
+from django.utils.cache import patch_vary_headers
+
+from drf_spectacular.views import SpectacularJSONAPIView, SpectacularYAMLAPIView
+
+from sdg.api.compression import GZIP, negotiate_encoding
+from sdg.api.schema import schema_store
+
+
+class PrebuiltSchemaMixin:
+    """
+    Serve the pre-generated schema of the current release, instead of
+    generating it on every request.
+
+    The schema is generated as usual if it can not be cached, or if it is
+    requested in another language or version.
+    """
+
+    schema_format = None
+
+    def _get_schema_response(self, request):
+        document = None
+        if (
+            translation.get_language() == settings.LANGUAGE_CODE
+            and self.api_version is None
+            and not request.GET.get("version")
+        ):
+            document = schema_store.get(self.schema_format)
+
+        if document is None:
+            return super()._get_schema_response(request)
+
+        renderer = request.accepted_renderer
+        content_type = renderer.media_type
+        if renderer.charset:
+            content_type = f"{content_type}; charset={renderer.charset}"
+
+        encoding = negotiate_encoding(request.META.get("HTTP_ACCEPT_ENCODING"), [GZIP])
+        if encoding:
+            response = HttpResponse(document.compressed, content_type=content_type)
+            response.headers["Content-Encoding"] = encoding
+        else:
+            response = HttpResponse(document.content, content_type=content_type)
+
+        response.headers["Content-Disposition"] = (
+            f'inline; filename="{self._get_filename(request, None)}"'
+        )
+        patch_vary_headers(response, ["Accept-Encoding"])
+        return response
+
+
+class SchemaJSONView(PrebuiltSchemaMixin, SpectacularJSONAPIView):
+    schema_format = "json"
+
+
+class SchemaYAMLView(PrebuiltSchemaMixin, SpectacularYAMLAPIView):
+    schema_format = "yaml"
@@ -0,0 +1,49 @@
+"""
+ASGI config for sdg project.
+
+It exposes the ASGI callable as a module-level variable named ``application``.
+Like uwsgi (``--static-map``), it serves the collected static files and the
+media files itself.
+
+For more information on this file, see
+https://docs.djangoproject.com/en/5.2/howto/deployment/asgi/
+"""
+
+from django.conf import settings
+from django.contrib.staticfiles.handlers import ASGIStaticFilesHandler
+from django.core.asgi import get_asgi_application
+from django.views.static import serve
+
+from sdg.setup import setup_env
+
+setup_env()
+
+
+class StaticFilesHandler(ASGIStaticFilesHandler):
+    """
+    Serve the files in ``document_root`` under ``base_url``, and pass the other
+    requests on to ``application``.
+
+    Unlike ``ASGIStaticFilesHandler``, the files are served from the directory
+    and not through the static files finders, which only ``DEBUG`` allows.
+    """
+
+    def __init__(self, application, base_url: str, document_root):
+        self.url = base_url
+        self.document_root = document_root
+        super().__init__(application)
+
+    def get_base_url(self):
+        return self.url
+
+    def serve(self, request):
+        return serve(
+            request, self.file_path(request.path), document_root=self.document_root
+        )
+
+
+application = StaticFilesHandler(
+    StaticFilesHandler(get_asgi_application(), settings.MEDIA_URL, settings.MEDIA_ROOT),
+    settings.STATIC_URL,
+    settings.STATIC_ROOT,
+)
@@ -3,10 +3,10 @@ from vng_api_common.conf.api import *  # noqa
 # DRF
 REST_FRAMEWORK = {
     "DEFAULT_RENDERER_CLASSES": [
-        "djangorestframework_camel_case.render.CamelCaseJSONRenderer",
+        "sdg.api.renderers.CamelCaseORJSONRenderer",
     ],
     "DEFAULT_PARSER_CLASSES": [
-        "djangorestframework_camel_case.parser.CamelCaseJSONParser",
+        "sdg.api.parsers.CamelCaseORJSONParser",
     ],
     "DEFAULT_AUTHENTICATION_CLASSES": ["sdg.api.authentication.TokenAuthentication"],
     "DEFAULT_THROTTLE_CLASSES": [
@@ -45,6 +45,28 @@ Zonder API-token bent u gelimiteerd in het aantal verzoeken dat u kunt doen,
 namelijk: {REST_FRAMEWORK["DEFAULT_THROTTLE_RATES"]["user"]}. Als u wel in het
 bezit bent van een API-token is er geen limiet.
 
+## Paginering
+Lijsten worden standaard gepagineerd op paginanummer (`page`). Voor het
+ophalen van alle producten kunt u beter cursor-paginering gebruiken, door de
+parameter `cursor` (met een lege waarde) mee te geven. U volgt daarna steeds
+de `next` URL totdat deze `null` is. Bij cursor-paginering wordt het totaal
+aantal resultaten (`count`) niet bepaald, waardoor ook de laatste pagina's
+snel zijn.
+
+## Conditionele verzoeken
+Lijsten en objecten van producten, catalogi en generieke productteksten worden
+geleverd met de headers `ETag` en `Last-Modified`. Geeft u deze waarden bij
+een volgend verzoek mee in de headers `If-None-Match` of `If-Modified-Since`,
+dan krijgt u de status `304 Not Modified` (zonder inhoud) als er sindsdien
+niets gewijzigd is.
+
+## Export
+Alle producten zijn in één keer op te halen via `/producten/export` (met een
+API-token). De producten worden geleverd als
+[NDJSON](https://github.com/ndjson/ndjson-spec): ieder product staat op een
+eigen regel. Met de header `Accept-Encoding: gzip` wordt de export
+gecomprimeerd.
+
 ## Identificerende sleutels
 In de API wordt gebruik gemaakt van een identificerende sleutels voor producten
 en organisaties zoals die bekend zijn bij de
@@ -61,6 +83,11 @@ De velden in deze API worden aangeduid met de
 `(organisatie)OwmsIdentifier`. Afhankelijk van de resource staat het woord
 "organisatie" (of iets anders) er wel of niet voor.
 
+Een product wordt uniek geïdentificeerd door de `upnUri`, de
+`owmsIdentifier` van de verantwoordelijke organisatie en de `doelgroep`. Via
+`/producten/zoeken` zijn meerdere producten in één verzoek op te halen aan de
+hand van deze sleutels.
+
 Alle objecten worden tevens geïdentificeerd met een
 [UUID](https://nl.wikipedia.org/wiki/Universally_unique_identifier). Objecten
 die geen Rijksbrede identificatie kennen, hebben enkel een UUID. UUIDs zijn
@@ -145,6 +172,10 @@ Indien de API niet beschikbaar is, en uw productbeschrijving wijzigt, dan zal
 productbeschrijvingen waarvoor dit geldt, alsnog proberen te sturen aan deze
 API.
 
+Voor het versturen van veel productbeschrijvingen tegelijk kunt u
+`/producten/batch` gebruiken. U stuurt dan een lijst van productbeschrijvingen
+in één verzoek en krijgt per productbeschrijving het resultaat terug.
+
 """
 
 SPECTACULAR_SETTINGS = {
@@ -65,6 +65,26 @@ DATABASES = {
     }
 }
 
+# Optional read replicas of the database, as a comma-separated list of
+# `host[:port]`. Only the reads of the API, the exports and the reports are
+# sent to the replicas, see `sdg.core.db.routers`.
+DB_REPLICAS = []
+for index, replica in enumerate(config("DB_REPLICA_HOSTS", default="", split=True)):
+    host, _, port = replica.partition(":")
+    alias = f"replica_{index}"
+    DATABASES[alias] = {
+        **DATABASES["default"],
+        "HOST": host,
+        "PORT": port or DATABASES["default"]["PORT"],
+        "TEST": {"MIRROR": "default"},
+    }
+    DB_REPLICAS.append(alias)
+
+DATABASE_ROUTERS = ["sdg.core.db.routers.ReplicaRouter"]
+# The number of seconds that a client reads from the primary database after a
+# write, so it sees its own changes despite the replication lag.
+DB_REPLICA_STICKY_SECONDS = config("DB_REPLICA_STICKY_SECONDS", default=15)
+
 # keep the current schema for now and deal with migrating to BigAutoField later, see
 # https://docs.djangoproject.com/en/4.0/ref/settings/#std:setting-DEFAULT_AUTO_FIELD
 DEFAULT_AUTO_FIELD = "django.db.models.AutoField"
@@ -152,6 +172,8 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    # First, to measure the other middleware as well.
+    "sdg.core.middleware.QueryMetricsMiddleware",
     "django.middleware.security.SecurityMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
     # 'django.middleware.locale.LocaleMiddleware',
@@ -166,6 +188,7 @@ MIDDLEWARE = [
     "allauth.account.middleware.AccountMiddleware",
     "vng_api_common.authorizations.middleware.AuthMiddleware",
     "vng_api_common.middleware.APIVersionHeaderMiddleware",
+    "sdg.core.middleware.ReplicaRoutingMiddleware",
 ]
 
 ROOT_URLCONF = "sdg.urls"
@@ -197,6 +220,7 @@ TEMPLATES = [
 FORM_RENDERER = "django.forms.renderers.TemplatesSetting"
 
 WSGI_APPLICATION = "sdg.wsgi.application"
+ASGI_APPLICATION = "sdg.asgi.application"
 
 # Translations
 LOCALE_PATHS = (os.path.join(DJANGO_PROJECT_DIR, "conf", "locale"),)
@@ -642,6 +666,87 @@ SPECTACULAR_SETTINGS["SERVERS"] = SDG_API_SERVER_INSTANCES
 SDG_API_WHITELISTING_ENABLED = config("SDG_API_WHITELISTING_ENABLED", default=True)
 CLIENT_IP_HTTP_HEADER = config("CLIENT_IP_HTTP_HEADER", default="X-Real-IP")
 
+# Cache of the rendered product documents of the API.
+SDG_API_PRODUCT_CACHE_ENABLED = config("SDG_API_PRODUCT_CACHE_ENABLED", default=False)
+SDG_API_PRODUCT_CACHE_ALIAS = config("SDG_API_PRODUCT_CACHE_ALIAS", default="default")
+SDG_API_PRODUCT_CACHE_TIMEOUT = config(
+    "SDG_API_PRODUCT_CACHE_TIMEOUT", default=60 * 60 * 24
+)
+
+# Cache of the complete responses to anonymous requests of the products,
+# generic products, catalogs, organizations and locations of the API. The
+# responses are stored compressed with brotli and gzip as well.
+SDG_API_RESPONSE_CACHE_ENABLED = config("SDG_API_RESPONSE_CACHE_ENABLED", default=False)
+SDG_API_RESPONSE_CACHE_ALIAS = config("SDG_API_RESPONSE_CACHE_ALIAS", default="default")
+SDG_API_RESPONSE_CACHE_TIMEOUT = config(
+    "SDG_API_RESPONSE_CACHE_TIMEOUT", default=60 * 60 * 24
+)
+
+# Cache of the API tokens and their authorizations. Each process keeps the
+# tokens in memory for a short time, in front of the shared cache.
+SDG_API_TOKEN_CACHE_ENABLED = config("SDG_API_TOKEN_CACHE_ENABLED", default=True)
+SDG_API_TOKEN_CACHE_ALIAS = config("SDG_API_TOKEN_CACHE_ALIAS", default="default")
+SDG_API_TOKEN_CACHE_TIMEOUT = config("SDG_API_TOKEN_CACHE_TIMEOUT", default=60 * 5)
+SDG_API_TOKEN_CACHE_LOCAL_TIMEOUT = config(
+    "SDG_API_TOKEN_CACHE_LOCAL_TIMEOUT", default=10
+)
+SDG_API_TOKEN_CACHE_LOCAL_SIZE = config("SDG_API_TOKEN_CACHE_LOCAL_SIZE", default=1000)
+# The number of seconds during which the updates of the last use of the API
+# tokens are collected, before they are saved.
+SDG_API_TOKEN_LAST_SEEN_INTERVAL = config(
+    "SDG_API_TOKEN_LAST_SEEN_INTERVAL", default=60
+)
+
+# The maximum number of products in a single batch request of the API.
+SDG_API_PRODUCT_BATCH_MAX_SIZE = config("SDG_API_PRODUCT_BATCH_MAX_SIZE", default=500)
+# The maximum number of keys in a single product lookup request of the API.
+SDG_API_PRODUCT_LOOKUP_MAX_SIZE = config("SDG_API_PRODUCT_LOOKUP_MAX_SIZE", default=500)
+# The maximum number of locations in a single synchronisation of the locations
+# of an organization.
+SDG_API_LOCATIE_SYNC_MAX_SIZE = config("SDG_API_LOCATIE_SYNC_MAX_SIZE", default=500)
+
+# The pre-generated OpenAPI schema of the API, see `build_api_schema`. The
+# schema is cached per release and commit, without either it is generated on
+# every request.
+SDG_API_SCHEMA_CACHE_ENABLED = config("SDG_API_SCHEMA_CACHE_ENABLED", default=True)
+SDG_API_SCHEMA_CACHE_ALIAS = config("SDG_API_SCHEMA_CACHE_ALIAS", default="default")
+SDG_API_SCHEMA_CACHE_TIMEOUT = config(
+    "SDG_API_SCHEMA_CACHE_TIMEOUT", default=60 * 60 * 24
+)
+SDG_API_SCHEMA_ROOT = config(
+    "SDG_API_SCHEMA_ROOT", default=os.path.join(BASE_DIR, "schema")
+)
+
+# The number of queries, the time spent in the database and the total time per
+# URL name, Celery task and management command, see `sdg.core.metrics`. The
+# metrics of each process are added to the shared cache at most once per
+# interval (in seconds).
+SDG_METRICS_ENABLED = config("SDG_METRICS_ENABLED", default=True)
+SDG_METRICS_CACHE_ALIAS = config("SDG_METRICS_CACHE_ALIAS", default="default")
+SDG_METRICS_FLUSH_INTERVAL = config("SDG_METRICS_FLUSH_INTERVAL", default=10)
+# Log a warning for every request, task or command that runs more queries than
+# this (0 disables the warning).
+SDG_METRICS_QUERY_BUDGET = config("SDG_METRICS_QUERY_BUDGET", default=0)
+# Raise an error instead of performing the query, when a value that should have
+# been prefetched or annotated is missing for more than one object in the same
+# request, task or command (see `get_from_cache`). Enabled in CI.
+SDG_STRICT_PREFETCH = config("SDG_STRICT_PREFETCH", default=False)
+
+# The engine of the broken link checker: "threads" (a thread pool with a session
+# per url) or "asyncio" (a single session with keep-alive connections, see
+# `sdg.producten.link_checker`), with the maximum number of concurrent requests
+# in total and per host of the asyncio engine.
+SDG_LINK_CHECKER_ENGINE = config("SDG_LINK_CHECKER_ENGINE", default="threads")
+SDG_LINK_CHECKER_CONCURRENCY = config("SDG_LINK_CHECKER_CONCURRENCY", default=64)
+SDG_LINK_CHECKER_CONCURRENCY_PER_HOST = config(
+    "SDG_LINK_CHECKER_CONCURRENCY_PER_HOST", default=4
+)
+# The number of seconds the result of a url check is reused, for a successful
+# and a failed check (see `sdg.producten.models.CheckedUrl`). The failed urls
+# are checked again by every (nightly) run.
+SDG_LINK_CHECKER_TTL = config("SDG_LINK_CHECKER_TTL", default=7 * 24 * 60 * 60)
+SDG_LINK_CHECKER_FAILURE_TTL = config("SDG_LINK_CHECKER_FAILURE_TTL", default=60 * 60)
+
 SDG_MAIL_TEXT_CHANGES_EVERY_DAYS = config("SDG_MAIL_TEXT_CHANGES_EVERY_DAYS", default=7)
 
 # Published Product Links make sure to include [product] and {organisation} in the template instead of the product and organisation name.
@@ -6,6 +6,8 @@ import os
 
 os.environ.setdefault("IS_HTTPS", "no")
 os.environ.setdefault("SECRET_KEY", "dummy")
+# Fail the tests on the N+1 queries of `get_from_cache`.
+os.environ.setdefault("SDG_STRICT_PREFETCH", "yes")
 
 from .base import *  # noqa isort:skip
 
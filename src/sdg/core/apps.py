@@ -30,6 +30,8 @@ class CoreConfig(AppConfig):
     name = "sdg.core"
 
     def ready(self):
+        # Connect the receivers of the Celery signals.
+        from . import metrics  # noqa
         from .checks import localized_form_field_check
 
         post_migrate.connect(update_admin_index, sender=self)
@@ -17,6 +17,16 @@ class DoelgroepChoices(DjangoChoices):
     bedrijf = ChoiceItem("eu-bedrijf", _("EU Bedrijf"))
 
 
+class ProductWijzigingChoices(DjangoChoices):
+    nieuwe_versie = ChoiceItem("nieuwe_versie", _("Nieuwe versie"))
+    publicatie = ChoiceItem("publicatie", _("Publicatie"))
+    verborgen = ChoiceItem("verborgen", _("Verborgen"))
+    organisatie_opgeheven = ChoiceItem(
+        "organisatie_opgeheven", _("Organisatie opgeheven")
+    )
+    gewijzigd = ChoiceItem("gewijzigd", _("Gewijzigd"))
+
+
 class GenericProductStatus(DjangoChoices):
     NEW = ChoiceItem("new", _("Nieuw"))
     READY_FOR_ADMIN = ChoiceItem("ready_admin", _("Gereed voor beheer"))
@@ -0,0 +1,11 @@
+from django.db.models import F, Func, Subquery
+
+
+def max_subquery(queryset, field: str) -> Subquery:
+    """
+    Return a subquery for the maximum value of ``field`` in the ``queryset``,
+    which is typically filtered on an ``OuterRef``.
+    """
+    return Subquery(
+        queryset.order_by().annotate(_max=Func(F(field), function="MAX")).values("_max")
+    )
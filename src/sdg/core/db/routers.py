@@ -0,0 +1,95 @@
+import random
+from contextlib import ContextDecorator
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS
+
+# Whether reads in the current context may go to a replica.
+_read_from_replica = ContextVar("read_from_replica", default=False)
+# Whether the current context has written to the primary database, after
+# which all reads go to the primary as well.
+_pinned_to_primary = ContextVar("pinned_to_primary", default=False)
+
+
+def get_replica_aliases() -> list:
+    return settings.DB_REPLICAS
+
+
+def pin_to_primary():
+    _pinned_to_primary.set(True)
+
+
+def enable_replica_reads():
+    _read_from_replica.set(True)
+
+
+def replica_reads_enabled() -> bool:
+    return _read_from_replica.get() and not _pinned_to_primary.get()
+
+
+class read_from_replica(ContextDecorator):
+    """
+    Send the reads within the block (or the decorated function) to a replica,
+    until the first write.
+
+    The writes always go to the primary database. Once written, the block
+    reads from the primary as well, so it sees its own writes.
+    """
+
+    def __init__(self, enabled: bool = True):
+        self.enabled = enabled
+        self._tokens = None
+
+    def _recreate_cm(self):
+        # Every call of a decorated function gets its own context manager.
+        return type(self)(self.enabled)
+
+    def __enter__(self):
+        self._tokens = (
+            _read_from_replica.set(self.enabled),
+            _pinned_to_primary.set(False),
+        )
+        return self
+
+    def __exit__(self, *exc_info):
+        pinned = _pinned_to_primary.get()
+        read_token, pinned_token = self._tokens
+        _read_from_replica.reset(read_token)
+        _pinned_to_primary.reset(pinned_token)
+
+        # An enclosing block must see the writes of this block as well.
+        if pinned:
+            pin_to_primary()
+
+
+class ReplicaRouter:
+    """
+    Route the reads to one of the replicas in ``DB_REPLICAS``, if reading from
+    a replica is enabled with ``read_from_replica``.
+
+    Everything else (the writes, the migrations and any read outside of
+    ``read_from_replica``) uses the primary database.
+    """
+
+    def db_for_read(self, model, **hints):
+        if not replica_reads_enabled():
+            return DEFAULT_DB_ALIAS
+
+        replicas = get_replica_aliases()
+        if not replicas:
+            return DEFAULT_DB_ALIAS
+        return random.choice(replicas)
+
+    def db_for_write(self, model, **hints):
+        pin_to_primary()
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        databases = {DEFAULT_DB_ALIAS, *get_replica_aliases()}
+        if obj1._state.db in databases and obj2._state.db in databases:
+            return True
+        return None
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        return db == DEFAULT_DB_ALIAS
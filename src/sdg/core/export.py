@@ -30,6 +30,7 @@ from sdg.core.constants import (
     Systeemrechten,
     TaalChoices,
 )
+from sdg.core.db.routers import read_from_replica
 from sdg.core.models import Overheidsorganisatie, ProductenCatalogus
 from sdg.producten.models import (
     LocalizedGeneriekProduct,
@@ -58,6 +59,7 @@ class SpecifiekProduct:
 
 
 class ApplicationExporter:
+    @read_from_replica()
     def __init__(self, file):
         with pd.ExcelWriter(file, engine="xlsxwriter") as writer:
             self.account_data().to_excel(writer, sheet_name="Accounts info")
@@ -3,10 +3,12 @@ from pathlib import Path
 from django.conf import settings
 from django.core.management.base import BaseCommand
 
+from sdg.core.metrics import MeasuredCommandMixin
+
 from ...periodic_tasks_dump import dump_tasks
 
 
-class Command(BaseCommand):
+class Command(MeasuredCommandMixin, BaseCommand):
 
     def add_arguments(self, parser):
         parser.add_argument(
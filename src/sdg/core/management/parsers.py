@@ -9,6 +9,8 @@ from django.core.management import BaseCommand, CommandError
 import requests
 from lxml import etree
 
+from sdg.core.metrics import MeasuredCommandMixin
+
 logger = logging.getLogger(__name__)
 
 
@@ -63,7 +65,7 @@ class OwmsParser:
             return list(data)
 
 
-class ParserCommand(BaseCommand):
+class ParserCommand(MeasuredCommandMixin, BaseCommand):
     plural_object_name = "objects"
     xml_column_names = None
 
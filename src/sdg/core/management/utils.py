@@ -4,6 +4,7 @@ import string
 from typing import Any
 
 from django.db.models import Q
+from django.utils import timezone
 
 from sdg.core.constants import DoelgroepChoices, TaalChoices
 from sdg.core.models import (
@@ -23,6 +24,26 @@ from sdg.producten.models import (
 logger = logging.getLogger(__name__)
 
 
+def _update_or_create(model, defaults: dict[str, Any], **kwargs) -> tuple:
+    """
+    Like ``update_or_create``, but only save an existing object if one of the
+    ``defaults`` changed, so its modification date (and the responses of the
+    API that depend on it) only changes with its data.
+    """
+    obj = model.objects.filter(**kwargs).first()
+    if obj is None:
+        return model.objects.create(**kwargs, **defaults), True
+
+    changed = [
+        field for field, value in defaults.items() if getattr(obj, field) != value
+    ]
+    if changed:
+        for field in changed:
+            setattr(obj, field, defaults[field])
+        obj.save()
+    return obj, False
+
+
 def load_government_organisations(data: list[dict[str, Any]]) -> int:
     """
     Loads government organisations based on a list of dictionaries.
@@ -32,7 +53,8 @@ def load_government_organisations(data: list[dict[str, Any]]) -> int:
     count = 0
     for obj in data:
         resource_id = obj.get("resourceIdentifier")
-        organisatie, created = Overheidsorganisatie.objects.update_or_create(
+        organisatie, created = _update_or_create(
+            Overheidsorganisatie,
             owms_identifier=resource_id,
             defaults={
                 "owms_pref_label": obj.get("prefLabel"),
@@ -129,7 +151,8 @@ def load_upn(data: list[dict[str, Any]]) -> int:
         #       ManyToManyField.
         theme = Thema.objects.filter(code__in=sdg_list).first()
 
-        upn, created = UniformeProductnaam.objects.update_or_create(
+        upn, created = _update_or_create(
+            UniformeProductnaam,
             upn_uri=obj.get("URI"),
             defaults={
                 "upn_label": obj.get("UniformeProductnaam"),
@@ -164,9 +187,9 @@ def load_upn(data: list[dict[str, Any]]) -> int:
         if created:
             count += 1
 
-    UniformeProductnaam.objects.filter(~Q(pk__in=upn_updated_list)).update(
-        is_verwijderd=True
-    )
+    UniformeProductnaam.objects.filter(
+        ~Q(pk__in=upn_updated_list), is_verwijderd=False
+    ).update(is_verwijderd=True, gewijzigd_op=timezone.now())
 
     # Update generic products.
     for upn in UniformeProductnaam.objects.all():
@@ -0,0 +1,268 @@
+import logging
+import threading
+import time
+from collections import defaultdict
+from contextlib import ExitStack, contextmanager
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db import connections
+
+from celery.signals import task_postrun, task_prerun
+
+logger = logging.getLogger(__name__)
+
+METRIC_KEY = "sdg:metrics:{kind}:{name}:{field}"
+METRIC_LABELS_KEY = "sdg:metrics:labels"
+
+# The kinds of work that are measured.
+HTTP = "http"
+TASK = "task"
+COMMAND = "command"
+# The uncached queries of ``get_from_cache``, by model and attribute.
+UNCACHED = "uncached"
+
+# The name of the requests that do not match a URL.
+UNRESOLVED = "<unresolved>"
+
+FIELDS = ("count", "queries", "sql_time", "total_time")
+
+# The measurement of the current block, see ``get_current_measurement``.
+_local = threading.local()
+
+
+class Measurement:
+    """
+    The queries of a measured block. It is a database execute wrapper, which
+    counts the queries and their duration.
+    """
+
+    def __init__(self, kind: str, name: str):
+        self.kind = kind
+        self.name = name
+        self.queries = 0
+        self.sql_time = 0.0
+        # The pks of the objects of each uncached query of ``get_from_cache``.
+        self.uncached = defaultdict(set)
+
+    def __call__(self, execute, sql, params, many, context):
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.queries += 1
+            self.sql_time += time.perf_counter() - start
+
+
+class MetricsRecorder:
+    """
+    Collect the metrics and add them to the shared cache at most once per
+    ``SDG_METRICS_FLUSH_INTERVAL`` seconds, so all processes report the same
+    totals without a cache round trip per request.
+    """
+
+    def __init__(self):
+        self._pending = defaultdict(lambda: dict.fromkeys(FIELDS, 0))
+        self._flushed = None
+        self._lock = threading.Lock()
+
+    def record(self, kind: str, name: str, force_flush=False, **values):
+        with self._lock:
+            pending = self._pending[kind, name]
+            pending["count"] += 1
+            for field, value in values.items():
+                pending[field] += value
+
+            due = (
+                force_flush
+                or self._flushed is None
+                or time.monotonic() - self._flushed
+                >= settings.SDG_METRICS_FLUSH_INTERVAL
+            )
+
+        if due:
+            self.flush()
+
+    def flush(self):
+        with self._lock:
+            pending, self._pending = self._pending, defaultdict(
+                lambda: dict.fromkeys(FIELDS, 0)
+            )
+            self._flushed = time.monotonic()
+
+        if not pending:
+            return
+
+        cache = get_metrics_cache()
+        for (kind, name), values in pending.items():
+            for field, value in values.items():
+                if field.endswith("_time"):
+                    # The cache only increments integers, so the durations are
+                    # kept in microseconds.
+                    value = round(value * 1_000_000)
+                if value:
+                    _increment(
+                        cache,
+                        METRIC_KEY.format(kind=kind, name=name, field=field),
+                        value,
+                    )
+
+        labels = cache.get(METRIC_LABELS_KEY, set())
+        if not pending.keys() <= labels:
+            cache.set(METRIC_LABELS_KEY, labels | pending.keys(), timeout=None)
+
+
+metrics_recorder = MetricsRecorder()
+
+
+def get_metrics_cache():
+    return caches[settings.SDG_METRICS_CACHE_ALIAS]
+
+
+def _increment(cache, key: str, value: int):
+    cache.add(key, 0, timeout=None)
+    try:
+        cache.incr(key, value)
+    except ValueError:
+        # The counter was evicted between ``add`` and ``incr``.
+        cache.set(key, value, timeout=None)
+
+
+def get_metrics() -> dict:
+    """
+    :returns: A mapping of ``(kind, name)`` to the totals of the metrics, with
+        the durations in seconds.
+    """
+    cache = get_metrics_cache()
+    labels = sorted(cache.get(METRIC_LABELS_KEY, set()))
+
+    keys = {
+        METRIC_KEY.format(kind=kind, name=name, field=field): (kind, name, field)
+        for kind, name in labels
+        for field in FIELDS
+    }
+    values = cache.get_many(keys)
+
+    metrics = {label: dict.fromkeys(FIELDS, 0) for label in labels}
+    for key, (kind, name, field) in keys.items():
+        value = values.get(key, 0)
+        if field.endswith("_time"):
+            value /= 1_000_000
+        metrics[kind, name][field] = value
+    return metrics
+
+
+@contextmanager
+def measure(kind: str, name: str):
+    """
+    Record the number of queries, their duration and the total duration of the
+    block, on all database connections.
+
+    The block may change the ``name`` of the yielded measurement, for when the
+    name is only known afterwards.
+    """
+    measurement = Measurement(kind, name)
+    previous = get_current_measurement()
+    _local.measurement = measurement
+    try:
+        if settings.SDG_METRICS_ENABLED:
+            with _record(measurement):
+                yield measurement
+        else:
+            yield measurement
+    finally:
+        _local.measurement = previous
+
+
+@contextmanager
+def _record(measurement: Measurement):
+    start = time.perf_counter()
+    try:
+        with ExitStack() as stack:
+            for connection in connections.all():
+                stack.enter_context(connection.execute_wrapper(measurement))
+            yield
+    finally:
+        total_time = time.perf_counter() - start
+        budget = settings.SDG_METRICS_QUERY_BUDGET
+        if budget and measurement.queries > budget:
+            logger.warning(
+                "%s %s ran %d queries, more than the budget of %d.",
+                measurement.kind,
+                measurement.name,
+                measurement.queries,
+                budget,
+            )
+
+        metrics_recorder.record(
+            measurement.kind,
+            measurement.name,
+            # Tasks and commands are rare, and the process may exit afterwards.
+            force_flush=measurement.kind != HTTP,
+            queries=measurement.queries,
+            sql_time=measurement.sql_time,
+            total_time=total_time,
+        )
+
+
+def get_current_measurement() -> Measurement | None:
+    """
+    :returns: The measurement of the innermost measured block of this thread.
+    """
+    return getattr(_local, "measurement", None)
+
+
+def record_uncached_query(model_name: str, name: str, pk) -> bool:
+    """
+    Record an uncached query of ``get_from_cache``.
+
+    :returns: Whether the same attribute was already queried for another
+        object in the current measured block, which is an N+1 query.
+    """
+    if settings.SDG_METRICS_ENABLED:
+        metrics_recorder.record(UNCACHED, f"{model_name}.{name}")
+
+    measurement = get_current_measurement()
+    if measurement is None:
+        return False
+
+    pks = measurement.uncached[model_name, name]
+    pks.add(pk)
+    return len(pks) > 1
+
+
+#
+# Celery tasks
+#
+
+_task_measurements = {}
+
+
+@task_prerun.connect
+def start_task_measurement(task_id, task, **kwargs):
+    measurement = measure(TASK, task.name)
+    measurement.__enter__()
+    _task_measurements[task_id] = measurement
+
+
+@task_postrun.connect
+def stop_task_measurement(task_id, task, **kwargs):
+    measurement = _task_measurements.pop(task_id, None)
+    if measurement is not None:
+        measurement.__exit__(None, None, None)
+
+
+#
+# Management commands
+#
+
+
+class MeasuredCommandMixin:
+    """
+    Measure the management commands of this project, as there is no signal
+    for the execution of a management command.
+    """
+
+    def execute(self, *args, **options):
+        with measure(COMMAND, type(self).__module__.rsplit(".", 1)[-1]):
+            return super().execute(*args, **options)
@@ -0,0 +1,120 @@
+import hashlib
+
+from django.conf import settings
+from django.core.cache import cache
+
+from rest_framework.permissions import SAFE_METHODS
+
+from sdg.core.db.routers import (
+    enable_replica_reads,
+    read_from_replica,
+    replica_reads_enabled,
+)
+from sdg.core.metrics import HTTP, UNRESOLVED, measure
+
+PRIMARY_COOKIE_NAME = "sdg_db_primary"
+PRIMARY_TOKEN_KEY = "sdg:db:primary:{digest}"
+
+
+def _get_primary_token_key(request) -> str | None:
+    """
+    Return the cache key that pins the API token of the request to the primary
+    database, if the request has a token.
+    """
+    authorization = request.META.get("HTTP_AUTHORIZATION")
+    if not authorization:
+        return None
+
+    # The token itself is not stored in the cache.
+    digest = hashlib.sha256(authorization.encode()).hexdigest()
+    return PRIMARY_TOKEN_KEY.format(digest=digest)
+
+
+def _is_api_view(view_func) -> bool:
+    return view_func.__module__.startswith("sdg.api.")
+
+
+def _stream_from_replica(streaming_content):
+    with read_from_replica():
+        yield from streaming_content
+
+
+class ReplicaRoutingMiddleware:
+    """
+    Read from a database replica for the safe requests of the API.
+
+    A client that has written to the API reads from the primary database for
+    ``DB_REPLICA_STICKY_SECONDS`` afterwards, so it sees its own changes
+    despite the replication lag. This is remembered in a cookie, and in the
+    cache for the API token of the client, as the API clients usually do not
+    keep cookies.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        with read_from_replica(enabled=False):
+            response = self.get_response(request)
+            streams_from_replica = response.streaming and replica_reads_enabled()
+
+        if streams_from_replica:
+            # The content is produced after the view has returned.
+            response.streaming_content = _stream_from_replica(
+                response.streaming_content
+            )
+
+        if (
+            settings.DB_REPLICAS
+            and request.method not in SAFE_METHODS
+            and request.resolver_match
+            and _is_api_view(request.resolver_match.func)
+        ):
+            response.set_cookie(
+                PRIMARY_COOKIE_NAME,
+                "1",
+                max_age=settings.DB_REPLICA_STICKY_SECONDS,
+                httponly=True,
+                samesite="Lax",
+            )
+            token_key = _get_primary_token_key(request)
+            if token_key:
+                cache.set(token_key, True, timeout=settings.DB_REPLICA_STICKY_SECONDS)
+        return response
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        if (
+            settings.DB_REPLICAS
+            and request.method in SAFE_METHODS
+            and _is_api_view(view_func)
+            and not self.reads_from_primary(request)
+        ):
+            enable_replica_reads()
+
+    def reads_from_primary(self, request) -> bool:
+        """
+        Return whether the client has written recently.
+        """
+        if PRIMARY_COOKIE_NAME in request.COOKIES:
+            return True
+
+        token_key = _get_primary_token_key(request)
+        return bool(token_key and cache.get(token_key))
+
+
+class QueryMetricsMiddleware:
+    """
+    Record the number of queries, the time spent in the database and the total
+    time of every request, per URL name. See ``sdg.core.metrics``.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        with measure(HTTP, UNRESOLVED) as measurement:
+            response = self.get_response(request)
+            # The URL is resolved while handling the request.
+            if request.resolver_match:
+                measurement.name = request.resolver_match.view_name
+        return response
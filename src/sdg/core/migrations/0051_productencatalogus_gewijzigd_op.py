@@ -0,0 +1,22 @@
+# Generated by Django 5.2 on 2026-10-18 19:14
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("core", "0050_applicationrapport"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="productencatalogus",
+            name="gewijzigd_op",
+            field=models.DateTimeField(
+                auto_now=True,
+                help_text="De wijzigingsdatum voor deze catalogus.",
+                verbose_name="gewijzigd op",
+            ),
+        ),
+    ]
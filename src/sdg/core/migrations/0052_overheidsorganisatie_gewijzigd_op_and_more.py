@@ -0,0 +1,31 @@
+# Generated by Django 5.2 on 2026-10-19 09:12
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("core", "0051_productencatalogus_gewijzigd_op"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="overheidsorganisatie",
+            name="gewijzigd_op",
+            field=models.DateTimeField(
+                auto_now=True,
+                help_text="De wijzigingsdatum voor deze overheidsorganisatie.",
+                verbose_name="gewijzigd op",
+            ),
+        ),
+        migrations.AddField(
+            model_name="uniformeproductnaam",
+            name="gewijzigd_op",
+            field=models.DateTimeField(
+                auto_now=True,
+                help_text="De wijzigingsdatum voor deze uniforme productnaam.",
+                verbose_name="gewijzigd op",
+            ),
+        ),
+    ]
@@ -80,6 +80,11 @@ class ProductenCatalogus(models.Model):
         blank=True,
         default=list,
     )
+    gewijzigd_op = models.DateTimeField(
+        _("gewijzigd op"),
+        help_text=_("De wijzigingsdatum voor deze catalogus."),
+        auto_now=True,
+    )
 
     objects = ProductenCatalogusQuerySet.as_manager()
 
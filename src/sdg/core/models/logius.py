@@ -49,6 +49,11 @@ class Overheidsorganisatie(models.Model):
         blank=True,
         null=False,
     )
+    gewijzigd_op = models.DateTimeField(
+        _("gewijzigd op"),
+        help_text=_("De wijzigingsdatum voor deze overheidsorganisatie."),
+        auto_now=True,
+    )
 
     objects = OrganisatieQuerySet.as_manager()
 
@@ -205,6 +210,11 @@ class UniformeProductnaam(models.Model):
         blank=True,
         default=list,
     )
+    gewijzigd_op = models.DateTimeField(
+        _("gewijzigd op"),
+        help_text=_("De wijzigingsdatum voor deze uniforme productnaam."),
+        auto_now=True,
+    )
 
     def get_active_fields(self) -> Set[str]:
         """:returns: A set of active boolean field names for this UPN."""
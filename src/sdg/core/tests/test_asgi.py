@@ -0,0 +1,68 @@
+import tempfile
+from pathlib import Path
+
+from django.test import SimpleTestCase
+
+from asgiref.testing import ApplicationCommunicator
+
+from sdg.asgi import StaticFilesHandler
+
+
+async def application(scope, receive, send):
+    await send({"type": "http.response.start", "status": 204, "headers": []})
+    await send({"type": "http.response.body", "body": b""})
+
+
+class StaticFilesHandlerTests(SimpleTestCase):
+    def setUp(self):
+        super().setUp()
+
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        Path(directory.name, "logo.svg").write_text("<svg/>")
+
+        self.handler = StaticFilesHandler(application, "/static/", directory.name)
+
+    async def get(self, path: str) -> tuple[int, bytes]:
+        scope = {
+            "type": "http",
+            "asgi": {"version": "3.0"},
+            "http_version": "1.1",
+            "method": "GET",
+            "scheme": "http",
+            "path": path,
+            "raw_path": path.encode(),
+            "query_string": b"",
+            "root_path": "",
+            "headers": [(b"host", b"testserver")],
+            "client": ("127.0.0.1", 0),
+            "server": ("testserver", 80),
+        }
+        communicator = ApplicationCommunicator(self.handler, scope)
+        await communicator.send_input({"type": "http.request"})
+
+        start = await communicator.receive_output()
+        body = b""
+        while True:
+            message = await communicator.receive_output()
+            body += message.get("body", b"")
+            if not message.get("more_body"):
+                break
+        await communicator.wait()
+        return start["status"], body
+
+    async def test_file(self):
+        status, body = await self.get("/static/logo.svg")
+
+        self.assertEqual(status, 200)
+        self.assertEqual(body, b"<svg/>")
+
+    async def test_missing_file(self):
+        status, _ = await self.get("/static/missing.svg")
+
+        self.assertEqual(status, 404)
+
+    async def test_other_path(self):
+        status, _ = await self.get("/api/v1/producten")
+
+        self.assertEqual(status, 204)
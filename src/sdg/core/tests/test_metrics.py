@@ -0,0 +1,112 @@
+from io import StringIO
+
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from django.urls import reverse
+
+from sdg.core.metrics import (
+    COMMAND,
+    HTTP,
+    TASK,
+    UNCACHED,
+    get_metrics,
+    get_metrics_cache,
+    measure,
+    metrics_recorder,
+)
+from sdg.core.tasks import clean_application_exports
+from sdg.core.utils import UncachedQueryError
+from sdg.producten.models import Product
+from sdg.producten.tests.factories.product import ReferentieProductFactory
+
+
+@override_settings(SDG_METRICS_FLUSH_INTERVAL=0)
+class MetricsTests(TestCase):
+    def setUp(self):
+        super().setUp()
+
+        # Discard the metrics of the other tests.
+        metrics_recorder.flush()
+        get_metrics_cache().clear()
+        self.addCleanup(get_metrics_cache().clear)
+
+    def test_measure(self):
+        with measure(TASK, "test"):
+            list(Product.objects.all())
+            list(Product.objects.all())
+
+        with measure(TASK, "test"):
+            list(Product.objects.all())
+
+        metrics = get_metrics()[TASK, "test"]
+        self.assertEqual(metrics["count"], 2)
+        self.assertEqual(metrics["queries"], 3)
+        self.assertGreater(metrics["sql_time"], 0)
+        self.assertGreaterEqual(metrics["total_time"], metrics["sql_time"])
+
+    @override_settings(SDG_METRICS_ENABLED=False)
+    def test_disabled(self):
+        with measure(TASK, "test"):
+            list(Product.objects.all())
+
+        self.assertEqual(get_metrics(), {})
+
+    @override_settings(SDG_METRICS_QUERY_BUDGET=1)
+    def test_query_budget(self):
+        with self.assertLogs("sdg.core.metrics", level="WARNING") as logs:
+            with measure(TASK, "test"):
+                list(Product.objects.all())
+                list(Product.objects.all())
+
+        self.assertIn("task test ran 2 queries", logs.output[0])
+
+    def test_requests_by_url_name(self):
+        self.client.get(reverse("api:product-list"))
+
+        metrics = get_metrics()
+        self.assertEqual(metrics[HTTP, "api:product-list"]["count"], 1)
+        self.assertGreater(metrics[HTTP, "api:product-list"]["queries"], 0)
+
+    def test_tasks(self):
+        clean_application_exports.apply()
+
+        metrics = get_metrics()[TASK, "sdg.core.tasks.clean_application_exports"]
+        self.assertEqual(metrics["count"], 1)
+        self.assertGreater(metrics["queries"], 0)
+
+    def test_management_commands(self):
+        call_command("update_generic_product_status", stdout=StringIO())
+        call_command("check", stdout=StringIO())
+
+        metrics = get_metrics()
+        self.assertEqual(metrics[COMMAND, "update_generic_product_status"]["count"], 1)
+        self.assertNotIn((COMMAND, "check"), metrics)
+
+    def test_uncached_queries(self):
+        product = Product.objects.get(pk=ReferentieProductFactory.create().pk)
+
+        product.name
+        product.name
+
+        self.assertEqual(get_metrics()[UNCACHED, "Product.name"]["count"], 2)
+
+        product = Product.objects.annotate_name().get(pk=product.pk)
+        product.name
+
+        self.assertEqual(get_metrics()[UNCACHED, "Product.name"]["count"], 2)
+
+    @override_settings(SDG_STRICT_PREFETCH=True)
+    def test_strict_prefetch(self):
+        ReferentieProductFactory.create_batch(2)
+
+        with measure(TASK, "test"):
+            products = list(Product.objects.all())
+            products[0].name
+            products[0].name
+
+            with self.assertRaises(UncachedQueryError):
+                products[1].name
+
+        with measure(TASK, "test"):
+            for product in Product.objects.annotate_name():
+                self.assertTrue(product.name)
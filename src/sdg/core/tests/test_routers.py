@@ -0,0 +1,148 @@
+from django.core.cache import cache
+from django.http import HttpResponse, StreamingHttpResponse
+from django.test import RequestFactory, SimpleTestCase, override_settings
+from django.urls import ResolverMatch
+
+from sdg.core.db.routers import ReplicaRouter, read_from_replica
+from sdg.core.middleware import PRIMARY_COOKIE_NAME, ReplicaRoutingMiddleware
+
+
+def api_view(request):
+    pass
+
+
+api_view.__module__ = "sdg.api.views.producten"
+
+
+def cms_view(request):
+    pass
+
+
+cms_view.__module__ = "sdg.organisaties.views.catalogi"
+
+
+@override_settings(DB_REPLICAS=["replica"])
+class ReplicaRouterTests(SimpleTestCase):
+    def setUp(self):
+        super().setUp()
+
+        self.router = ReplicaRouter()
+
+    def test_reads_go_to_primary_by_default(self):
+        self.assertEqual(self.router.db_for_read(None), "default")
+
+    def test_reads_go_to_replica(self):
+        with read_from_replica():
+            self.assertEqual(self.router.db_for_read(None), "replica")
+
+        self.assertEqual(self.router.db_for_read(None), "default")
+
+    def test_reads_go_to_primary_after_write(self):
+        with read_from_replica():
+            with read_from_replica():
+                self.assertEqual(self.router.db_for_write(None), "default")
+                self.assertEqual(self.router.db_for_read(None), "default")
+
+            self.assertEqual(self.router.db_for_read(None), "default")
+
+        with read_from_replica():
+            self.assertEqual(self.router.db_for_read(None), "replica")
+
+    def test_decorator(self):
+        @read_from_replica()
+        def read():
+            return self.router.db_for_read(None)
+
+        self.assertEqual(read(), "replica")
+        self.assertEqual(read(), "replica")
+
+    @override_settings(DB_REPLICAS=[])
+    def test_without_replicas(self):
+        with read_from_replica():
+            self.assertEqual(self.router.db_for_read(None), "default")
+
+    def test_migrations_only_on_primary(self):
+        self.assertTrue(self.router.allow_migrate("default", "producten"))
+        self.assertFalse(self.router.allow_migrate("replica", "producten"))
+
+
+@override_settings(DB_REPLICAS=["replica"], DB_REPLICA_STICKY_SECONDS=15)
+class ReplicaRoutingMiddlewareTests(SimpleTestCase):
+    def setUp(self):
+        super().setUp()
+
+        self.factory = RequestFactory()
+        self.router = ReplicaRouter()
+
+    def handle(self, request, view):
+        def get_response(request):
+            request.resolver_match = ResolverMatch(view, (), {})
+            middleware.process_view(request, view, (), {})
+            return HttpResponse(self.router.db_for_read(None))
+
+        middleware = ReplicaRoutingMiddleware(get_response)
+        return middleware(request)
+
+    def test_api_reads_go_to_replica(self):
+        response = self.handle(self.factory.get("/api/v1/producten"), api_view)
+
+        self.assertEqual(response.content, b"replica")
+        self.assertNotIn(PRIMARY_COOKIE_NAME, response.cookies)
+        self.assertEqual(self.router.db_for_read(None), "default")
+
+    def test_other_reads_go_to_primary(self):
+        response = self.handle(self.factory.get("/cms/"), cms_view)
+
+        self.assertEqual(response.content, b"default")
+
+    def test_writes_pin_client_to_primary(self):
+        response = self.handle(self.factory.post("/api/v1/producten"), api_view)
+
+        self.assertEqual(response.content, b"default")
+        self.assertEqual(response.cookies[PRIMARY_COOKIE_NAME]["max-age"], 15)
+
+        request = self.factory.get("/api/v1/producten")
+        request.COOKIES[PRIMARY_COOKIE_NAME] = "1"
+        response = self.handle(request, api_view)
+
+        self.assertEqual(response.content, b"default")
+
+    def test_cms_writes_do_not_pin_client_to_primary(self):
+        response = self.handle(self.factory.post("/cms/"), cms_view)
+
+        self.assertNotIn(PRIMARY_COOKIE_NAME, response.cookies)
+
+    @override_settings(DB_REPLICAS=[])
+    def test_writes_without_replicas(self):
+        response = self.handle(self.factory.post("/api/v1/producten"), api_view)
+
+        self.assertNotIn(PRIMARY_COOKIE_NAME, response.cookies)
+
+    def test_writes_pin_token_to_primary(self):
+        cache.clear()
+        authorization = {"HTTP_AUTHORIZATION": "Token 1234"}
+
+        self.handle(self.factory.post("/api/v1/producten", **authorization), api_view)
+
+        response = self.handle(
+            self.factory.get("/api/v1/producten", **authorization), api_view
+        )
+        self.assertEqual(response.content, b"default")
+
+        response = self.handle(
+            self.factory.get("/api/v1/producten", HTTP_AUTHORIZATION="Token 5678"),
+            api_view,
+        )
+        self.assertEqual(response.content, b"replica")
+
+    def test_streamed_content_is_read_from_replica(self):
+        def get_response(request):
+            middleware.process_view(request, api_view, (), {})
+            return StreamingHttpResponse(
+                self.router.db_for_read(None).encode() for _ in range(1)
+            )
+
+        middleware = ReplicaRoutingMiddleware(get_response)
+        response = middleware(self.factory.get("/api/v1/producten/export"))
+
+        self.assertEqual(b"".join(response.streaming_content), b"replica")
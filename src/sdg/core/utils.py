@@ -12,6 +12,14 @@ from . import empty
 logger = logging.getLogger(__name__)
 
 
+class UncachedQueryError(Exception):
+    """
+    Raised by ``get_from_cache`` for an uncached query of the same attribute of
+    another object in the same request, task or command (an N+1 query), when
+    ``SDG_STRICT_PREFETCH`` is enabled.
+    """
+
+
 def string_to_date(string: str, date_format: str):
     date = datetime.strptime(string, date_format)
     tz = pytz.timezone(getattr(settings, "TIME_ZONE", None))
@@ -44,8 +52,18 @@ def get_from_cache(instance, name, manager_methods: list = None):
     _cached = getattr(instance, cached_name, empty)
 
     if _cached is empty:
+        from .metrics import record_uncached_query
+
+        model_name = instance.__class__.__name__
+        repeated = record_uncached_query(model_name, name, instance.pk)
+        if repeated and settings.SDG_STRICT_PREFETCH:
+            raise UncachedQueryError(
+                f"{model_name}.{name} (pk={instance.pk}) is not prefetched or "
+                f"annotated, and queried for every object. Add it to the queryset."
+            )
+
         logger.debug(
-            f"Performing uncached query to retrieve {instance.__class__.__name__}.{name} (pk={instance.pk})"
+            f"Performing uncached query to retrieve {model_name}.{name} (pk={instance.pk})"
         )
         queryset = instance.__class__.objects.all()
 
@@ -11,11 +11,12 @@ from dateutil.relativedelta import relativedelta
 
 from sdg.accounts.models import User
 from sdg.conf.utils import org_type_cfg
+from sdg.core.metrics import MeasuredCommandMixin
 from sdg.core.models.config import SiteConfiguration
 from sdg.producten.models.product import ProductVersie
 
 
-class Command(BaseCommand):
+class Command(MeasuredCommandMixin, BaseCommand):
     help = f"Send product update notification emails from last ({settings.SDG_MAIL_TEXT_CHANGES_EVERY_DAYS}) days to subscribed users."
 
     def add_arguments(self, parser):
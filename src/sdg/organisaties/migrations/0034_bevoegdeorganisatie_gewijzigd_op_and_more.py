@@ -0,0 +1,40 @@
+# Generated by Django 5.2 on 2026-10-18 19:14
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("organisaties", "0033_auto_20241022_1421"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="bevoegdeorganisatie",
+            name="gewijzigd_op",
+            field=models.DateTimeField(
+                auto_now=True,
+                help_text="De wijzigingsdatum voor deze bevoegde organisatie.",
+                verbose_name="gewijzigd op",
+            ),
+        ),
+        migrations.AddField(
+            model_name="lokaleoverheid",
+            name="gewijzigd_op",
+            field=models.DateTimeField(
+                auto_now=True,
+                help_text="De wijzigingsdatum voor deze lokale overheid.",
+                verbose_name="gewijzigd op",
+            ),
+        ),
+        migrations.AddField(
+            model_name="lokatie",
+            name="gewijzigd_op",
+            field=models.DateTimeField(
+                auto_now=True,
+                help_text="De wijzigingsdatum voor deze locatie.",
+                verbose_name="gewijzigd op",
+            ),
+        ),
+    ]
@@ -0,0 +1,23 @@
+# Generated by Django 5.2 on 2026-10-18 19:27
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("organisaties", "0034_bevoegdeorganisatie_gewijzigd_op_and_more"),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name="lokatie",
+            name="gewijzigd_op",
+            field=models.DateTimeField(
+                auto_now=True,
+                db_index=True,
+                help_text="De wijzigingsdatum voor deze locatie.",
+                verbose_name="gewijzigd op",
+            ),
+        ),
+    ]
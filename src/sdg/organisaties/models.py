@@ -70,6 +70,11 @@ class LokaleOverheid(models.Model):
             "Indien aangevinkt wordt een specifieke catalogus aangemaakt voor deze lokale overheid."
         ),
     )
+    gewijzigd_op = models.DateTimeField(
+        _("gewijzigd op"),
+        help_text=_("De wijzigingsdatum voor deze lokale overheid."),
+        auto_now=True,
+    )
 
     objects = LokaleOverheidManager()
 
@@ -142,6 +147,11 @@ class BevoegdeOrganisatie(models.Model):
         blank=True,
         null=True,
     )
+    gewijzigd_op = models.DateTimeField(
+        _("gewijzigd op"),
+        help_text=_("De wijzigingsdatum voor deze bevoegde organisatie."),
+        auto_now=True,
+    )
 
     class Meta:
         verbose_name = _("bevoegde organisatie")
@@ -274,6 +284,12 @@ class Lokatie(models.Model):
             "De identificatie die binnen deze API gebruikt wordt voor de resource."
         ),
     )
+    gewijzigd_op = models.DateTimeField(
+        _("gewijzigd op"),
+        help_text=_("De wijzigingsdatum voor deze locatie."),
+        auto_now=True,
+        db_index=True,
+    )
 
     def get_formatted_address(self):
         return f"{self.naam}\n{self.straat} {self.nummer}\n{self.postcode} {self.plaats}\n{self.land}"
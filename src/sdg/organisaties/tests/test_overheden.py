@@ -10,7 +10,7 @@ from freezegun import freeze_time
 from maykin_2fa.test import disable_admin_mfa as disable_mfa
 
 from sdg.accounts.tests.factories import RoleFactory, UserFactory
-from sdg.core.constants import GenericProductStatus
+from sdg.core.constants import GenericProductStatus, TaalChoices
 from sdg.core.tests.factories.catalogus import ProductenCatalogusFactory
 from sdg.core.tests.factories.logius import OverheidsorganisatieFactory
 from sdg.organisaties.tests.factories.overheid import (
@@ -379,6 +379,52 @@ class CatalogListViewTests(WebTest):
         self.assertNotIn(str(specific_new), response_text)
         self.assertNotIn(str(specific_deleted), response_text)
 
+    def test_search_on_product_texts(self):
+        reference_catalog = ProductenCatalogusFactory.create(
+            is_referentie_catalogus=True
+        )
+        matching, old_match, other = ReferentieProductFactory.create_batch(
+            3, catalogus=reference_catalog
+        )
+        LocalizedReferentieProductFactory.create(
+            product_versie__product=matching,
+            taal=TaalChoices.nl,
+            vereisten="Een uittreksel uit de basisregistratie personen.",
+        )
+        # Only the texts of an older version match.
+        LocalizedReferentieProductFactory.create(
+            product_versie__product=old_match,
+            product_versie__versie=1,
+            taal=TaalChoices.nl,
+            vereisten="Een uittreksel uit de basisregistratie personen.",
+        )
+        LocalizedReferentieProductFactory.create(
+            product_versie__product=old_match,
+            product_versie__versie=2,
+            taal=TaalChoices.nl,
+            vereisten="Een geldig paspoort.",
+        )
+        LocalizedReferentieProductFactory.create(product_versie__product=other)
+
+        lokale_overheid = reference_catalog.lokale_overheid
+        RoleFactory.create(
+            user=self.user, lokale_overheid=lokale_overheid, is_redacteur=True
+        )
+
+        response = self.app.get(
+            lokale_overheid.get_absolute_url(), {"_name": "uittreksels"}
+        )
+
+        self.assertEqual(response.pyquery(PRODUCT_SELECTOR).length, 1)
+        self.assertIn(str(matching), response.text)
+
+        response = self.app.get(
+            lokale_overheid.get_absolute_url(), {"_name": str(other)}
+        )
+
+        self.assertEqual(response.pyquery(PRODUCT_SELECTOR).length, 1)
+        self.assertIn(str(other), response.text)
+
     @skip("TODO: Clarify if both catalogs must be displayed")
     def test_both_reference_and_specific_products_are_displayed(self):
         reference_catalog = ProductenCatalogusFactory.create(
@@ -1,6 +1,6 @@
 import datetime
 
-from django.db.models import F
+from django.db.models import F, Q
 from django.utils.translation import gettext as _
 
 from rijkshuisstijl.views.generic import ListView as RHListView
@@ -10,7 +10,7 @@ from sdg.core.constants.product import DoelgroepChoices
 from sdg.core.models import ProductenCatalogus
 from sdg.organisaties.models import LokaleOverheid
 from sdg.producten.constants import BooleanChoices
-from sdg.producten.models import Product
+from sdg.producten.models import Product, ProductVersie
 
 
 class CatalogListView(
@@ -21,7 +21,7 @@ class CatalogListView(
         {
             "key": "_name",
             "label": _("Naam"),
-            "filter_label": _("Zoek op productnaam"),
+            "filter_label": _("Zoek op productnaam of tekst"),
         },
         {
             "label": _("Aangeboden"),
@@ -47,7 +47,10 @@ class CatalogListView(
         },
     ]
     filterable_columns = [
-        "_name",
+        # The datagrid does not filter on the name itself (`bypass_filter`), it
+        # is filtered in `get_queryset`, on the name and the texts of the
+        # products.
+        {"key": "_name", "bypass_filter": True},
         "generiek_product__upn__thema__informatiegebied",
         {
             "key": "product_aanwezig",
@@ -88,7 +91,7 @@ class CatalogListView(
             lokale_overheid=self.lokale_overheid
         )
 
-        return (
+        queryset = (
             super()
             .get_queryset()
             .filter(catalogus__in=catalogs)
@@ -107,3 +110,17 @@ class CatalogListView(
             .exclude_generic_status()
             .order_by("_name")
         )
+
+        zoek = self.request.GET.get("_name")
+        if zoek:
+            queryset = queryset.filter(
+                Q(_name__icontains=zoek)
+                # Only the texts of the most recent version are shown.
+                | Q(
+                    pk__in=Product.objects.search(
+                        zoek, versies=ProductVersie.objects.most_recent()
+                    )
+                )
+            )
+
+        return queryset
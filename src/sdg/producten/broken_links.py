@@ -1,14 +1,17 @@
 from collections import defaultdict
 from collections.abc import Sequence
+from datetime import timedelta
 from typing import TypedDict
 
+from django.conf import settings
 from django.core.exceptions import ValidationError
 from django.core.validators import URLValidator
+from django.db import connection, transaction
+from django.db.models import F, Prefetch, Q
+from django.utils.timezone import now
 
-import markdown
 import requests
 import urllib3
-from bs4 import BeautifulSoup
 from glom import glom
 from requests.adapters import HTTPAdapter
 from urllib3.util.retry import Retry
@@ -16,7 +19,15 @@ from zgw_consumers.concurrent import parallel
 
 from sdg.core.models import ProductFieldConfiguration
 
-from .models import BrokenLinks, Product
+from .markdown_inspection import inspect_markdown
+from .models import (
+    BrokenLinks,
+    CheckedUrl,
+    Product,
+    ProductUrl,
+    ProductUrlIndex,
+    ProductVersie,
+)
 
 urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
 
@@ -35,11 +46,33 @@ VALID_URL_ADAPTERS = ("tel:", "sms:", "mailto:")
 INVALID_URL_ADAPTERS = "geo:"
 SUCCES_STATUS_CODE = 200
 ANY_ERROR_STATUS_CODE = 420
+# The status codes of a broken link.
+BROKEN_STATUS_CODES = (404, ANY_ERROR_STATUS_CODE)
+# The status code of a successful conditional request, the url has not changed.
+NOT_MODIFIED_STATUS_CODE = 304
+
+# Headers that mimic a browser, as some sites refuse other clients.
+REQUEST_HEADERS = {
+    "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36",
+    "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8",
+    "Accept-Language": "nl,en-US;q=0.7,en;q=0.3",
+    "Connection": "keep-alive",
+    "Upgrade-Insecure-Requests": "1",
+    "Pragma": "no-cache",
+    "Cache-Control": "no-cache",
+}
+# Responses with less content than this are checked for a custom error page.
+SOFT_404_MAX_SIZE = 100
 
 
 __all__ = [
     "reset_broken_links",
+    "save_broken_links",
     "get_product_urls",
+    "update_url_index",
+    "get_indexed_product_urls",
+    "check_urls_in_threads",
+    "check_urls_with_store",
     "check_broken_links",
 ]
 
@@ -50,6 +83,25 @@ class FieldUrl(TypedDict):
     url: str
 
 
+class UrlStatus(TypedDict):
+    status_code: int
+    etag: str
+    last_modified: str
+
+
+def url_status(status_code: int, headers=None) -> UrlStatus:
+    """
+    :param headers: The headers of the response, with the validators that are
+        used to revalidate the url.
+    """
+    headers = headers or {}
+    return UrlStatus(
+        status_code=status_code,
+        etag=headers.get("ETag", ""),
+        last_modified=headers.get("Last-Modified", ""),
+    )
+
+
 def _create_session():
     """
     Create a requests session with retry capabilities and custom headers
@@ -68,42 +120,53 @@ def _create_session():
     session.mount("http://", adapter)
     session.mount("https://", adapter)
     # Set custom headers to mimic a browser
-    session.headers.update(
-        {
-            "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36",
-            "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8",
-            "Accept-Language": "nl,en-US;q=0.7,en;q=0.3",
-            "Connection": "keep-alive",
-            "Upgrade-Insecure-Requests": "1",
-            "Pragma": "no-cache",
-            "Cache-Control": "no-cache",
-        }
-    )
+    session.headers.update(REQUEST_HEADERS)
 
     return session
 
 
-def _request_head(session, url: str):
+def normalize_url(url: str) -> str:
+    """
+    Add the missing scheme of a url, which is assumed to be https.
+    """
+    if url.startswith((INVALID_URL_ADAPTERS, *VALID_URL_ADAPTERS)):
+        return url
+    elif not url.startswith("http"):
+        return f"https://{url}"
+    return url
+
+
+def is_soft_404(status_code: int, content: bytes) -> bool:
+    """
+    Check for false 200 responses (some servers return 200 for missing pages).
+
+    :param content: The content of the response, only the first
+        ``SOFT_404_MAX_SIZE`` bytes are needed.
+    """
+    # If the page is suspiciously small, it might be a custom error page
+    return (
+        status_code == 200
+        and len(content) < SOFT_404_MAX_SIZE
+        and (b"not found" in content.lower() or b"404" in content)
+    )
+
+
+def _request_head(session, url: str, headers: dict | None = None):
     """
     Implementation of `requests.head(url)` with improved error handling
     and support for sites that don't properly implement HEAD.
 
     :param session: requests.Session to use for the request
     :param url: The requested url
-    :param timeout: Timeout in seconds
+    :param headers: The conditional headers of the request, if any
     :returns: Response object and error message if any
     """
-    # Normalize URL
-    if url.startswith((INVALID_URL_ADAPTERS, *VALID_URL_ADAPTERS)):
-        parsed_url = url
-    elif not url.startswith("http"):
-        parsed_url = f"https://{url}"
-    else:
-        parsed_url = url
+    parsed_url = normalize_url(url)
 
     # Use GET with stream=True to avoid downloading the entire content
     response = session.get(
         parsed_url,
+        headers=headers,
         timeout=20,
         stream=True,
         allow_redirects=True,
@@ -115,79 +178,96 @@ def _request_head(session, url: str):
     return response
 
 
-def _check_url_with_retry(url: str):
+def _check_url_with_retry(url: str, headers: dict | None = None):
     """
-    Check a url with retry mechanism and return a tuple of the url and status_code
+    Check a url with retry mechanism and return a tuple of the url and its status
 
     :param url: The url to check
-    :returns: (url, status_code, message) The checked url, response status code, and error message if any
+    :param headers: The conditional headers of the request, if any
+    :returns: (url, url_status) The checked url and the status of its response
     """
 
     # Check for special URL schemes
     if url.startswith(VALID_URL_ADAPTERS):
-        return (url, SUCCES_STATUS_CODE, None)
+        return url, url_status(SUCCES_STATUS_CODE)
 
     if url.startswith(INVALID_URL_ADAPTERS):
-        return (url, ANY_ERROR_STATUS_CODE, "Invalid URL scheme")
+        return url, url_status(ANY_ERROR_STATUS_CODE)
 
     # Create a new session for each URL to avoid cookie/session contamination
     session = _create_session()
 
     # for attempt in range(max_retries + 1):
     try:
-        response = _request_head(session, url)
+        response = _request_head(session, url, headers)
 
         if response:
             status_code = response.status_code
-            # Check for false 200 responses (some servers return 200 for missing pages)
-            if status_code == 200 and len(response.content) < 100:
-                # If the page is suspiciously small, it might be a custom error page
-                if (
-                    b"not found" in response.content.lower()
-                    or b"404" in response.content
-                ):
-                    status_code = 404
+            if is_soft_404(status_code, response.content):
+                status_code = 404
 
-            return url, status_code
+            return url, url_status(status_code, response.headers)
 
     except requests.RequestException:
         pass
 
-    return url, ANY_ERROR_STATUS_CODE
+    return url, url_status(ANY_ERROR_STATUS_CODE)
 
 
-def _handle_response_code(
-    url,
-    occurring_field,
-    product_pk,
-    url_label,
-    founded_status_code,
-) -> int | None:
-    """
-    Increment or delete the broken_link based on the status_code
+# Create the new broken links and increment the error count of the existing
+# ones, see the unique constraint of `BrokenLinks`.
+UPSERT_BROKEN_LINKS_SQL = """
+    INSERT INTO producten_brokenlinks (
+        product_id, url, occurring_field, url_label, error_count, last_checked
+    )
+    SELECT link.product_id, link.url, link.occurring_field, link.url_label, 1, %s
+    FROM unnest(%s::integer[], %s::text[], %s::text[], %s::text[])
+        AS link (product_id, url, occurring_field, url_label)
+    -- The products that were deleted during the check are skipped.
+    JOIN producten_product AS product ON product.id = link.product_id
+    ON CONFLICT (product_id, md5(url), md5(occurring_field), md5(url_label))
+    DO UPDATE SET
+        error_count = producten_brokenlinks.error_count + 1,
+        last_checked = EXCLUDED.last_checked
+"""
+# Delete the links that are no longer broken or no longer exist.
+DELETE_FIXED_LINKS_SQL = """
+    DELETE FROM producten_brokenlinks AS broken_link
+    WHERE NOT EXISTS (
+        SELECT 1
+        FROM unnest(%s::integer[], %s::text[], %s::text[], %s::text[])
+            AS link (product_id, url, occurring_field, url_label)
+        WHERE link.product_id = broken_link.product_id
+            AND link.url = broken_link.url
+            AND link.occurring_field = broken_link.occurring_field
+            AND link.url_label = broken_link.url_label
+    )
+"""
 
-    :param url: The url of the request response.
-    :param occurring_field: The field where the URL was found
-    :param product_pk: The primary key of the product
-    :param url_label: The 'label' of the url in the content.
-    :param founded_status_code: The response status code of the requested url
-    :param error_message: Any error message from the request
+
+def save_broken_links(broken_links) -> int:
     """
-    broken_link, _ = BrokenLinks.objects.get_or_create(
-        product_id=product_pk,
-        url=url[:2000],
-        occurring_field=occurring_field,
-        url_label=url_label,
-    )
+    Replace the broken links with the ``broken_links`` that were found, in a
+    single transaction.
 
-    # Good status return without ignore reference
-    if founded_status_code not in [404, 420]:
-        return
+    The error count of a link that was already broken is incremented, the new
+    broken links have an error count of 1 and the other links are deleted.
 
-    # Definitely broken
-    broken_link.increment_error_count()
-    broken_link.save()
-    return broken_link.id
+    :param broken_links: The (product id, url, occurring field, url label) of
+        each broken link.
+    :returns: The number of deleted links.
+    """
+    broken_links = {
+        (product_id, url[:2000], occurring_field, url_label)
+        for product_id, url, occurring_field, url_label in broken_links
+    }
+    columns = [list(column) for column in zip(*broken_links)] or [[], [], [], []]
+
+    with transaction.atomic(), connection.cursor() as cursor:
+        if broken_links:
+            cursor.execute(UPSERT_BROKEN_LINKS_SQL, [now(), *columns])
+        cursor.execute(DELETE_FIXED_LINKS_SQL, columns)
+        return cursor.rowcount
 
 
 def _is_valid_url(url: str):
@@ -218,12 +298,28 @@ def _is_valid_url(url: str):
     return True
 
 
-def _localized_field_verbose_name(field_name: str, taal: str):
+def _get_localized_field_configurations() -> dict:
+    """
+    :returns: The localized field configuration of each language.
+    """
+    return {
+        configuration.taal: configuration
+        for configuration in ProductFieldConfiguration.get_solo().localizedproductfieldconfiguration_set.all()
+    }
+
+
+def _localized_field_verbose_name(
+    field_name: str, taal: str, configurations: dict | None = None
+):
+    """
+    :param configurations: The localized field configurations, see
+        ``_get_localized_field_configurations``. Retrieved if not given.
+    """
+    if configurations is None:
+        configurations = _get_localized_field_configurations()
+
     if configured_field_name := getattr(
-        ProductFieldConfiguration.get_solo().localizedproductfieldconfiguration_set.get(
-            taal=taal
-        ),
-        f"localizedproduct_{field_name}",
+        configurations[taal], f"localizedproduct_{field_name}"
     ):
         field_name = configured_field_name[0][0]
 
@@ -239,10 +335,7 @@ def reset_broken_links(ignore_broken_ids: list | None = None, reset_all=False):
     :param reset_all: Clean all the links or just the excluded ones.
     """
     if reset_all:
-        links = BrokenLinks.objects.all()
-        for link in links:
-            link.reset_error_count()
-
+        BrokenLinks.objects.update(error_count=0, last_checked=now())
         return
 
     if not ignore_broken_ids:
@@ -258,84 +351,291 @@ def reset_broken_links(ignore_broken_ids: list | None = None, reset_all=False):
     return total
 
 
+def _extract_urls(localized_product) -> list[tuple[str, str, str]]:
+    """
+    :returns: The (field name, label, url) of each valid url in the
+        ``localized_product``.
+    """
+    urls = []
+    for markdown_field in MARKDOWN_LINKS:
+        value = getattr(localized_product, markdown_field)
+        # The text of a link is its label, request VNG.
+        for link in inspect_markdown(value).links:
+            if _is_valid_url(link.href):
+                urls.append((markdown_field, link.label, link.href))
+
+    if _is_valid_url(localized_product.decentrale_procedure_link):
+        urls.append(
+            (
+                "decentrale_procedure_link",
+                localized_product.decentrale_procedure_label,
+                localized_product.decentrale_procedure_link,
+            )
+        )
+
+    for label, url in localized_product.verwijzing_links or []:
+        if _is_valid_url(url):
+            urls.append(("verwijzing_links", label, url))
+
+    return urls
+
+
 def get_product_urls(products: Sequence[Product]) -> {int: [FieldUrl]}:
     product_dict = defaultdict(list)
+    configurations = _get_localized_field_configurations()
 
     for product in products:
         for localized_product in product.most_recent_version.vertalingen.all():
-            for markdown_field in MARKDOWN_LINKS:
-                occurring_field = _localized_field_verbose_name(
-                    markdown_field, localized_product.taal
-                )
-                value = getattr(localized_product, markdown_field)
-                html = markdown.markdown(value)
-                soup = BeautifulSoup(html, "html.parser")
-                for link in soup.find_all("a"):
-                    text = link.get_text()  # Get the label, request VNG.
-                    href = link.get("href", "")
-                    if _is_valid_url(href):
-                        product_dict[product.id].append(
-                            FieldUrl(field=occurring_field, label=text, url=href)
-                        )
-
-            if _is_valid_url(localized_product.decentrale_procedure_link):
+            for field_name, label, url in _extract_urls(localized_product):
                 occurring_field = _localized_field_verbose_name(
-                    "decentrale_procedure_link", localized_product.taal
+                    field_name, localized_product.taal, configurations
                 )
                 product_dict[product.id].append(
-                    FieldUrl(
-                        field=occurring_field,
-                        label=localized_product.decentrale_procedure_label,
-                        url=localized_product.decentrale_procedure_link,
-                    )
+                    FieldUrl(field=occurring_field, label=label, url=url)
                 )
 
-            if verwijzing_links := localized_product.verwijzing_links:
-                occurring_field = _localized_field_verbose_name(
-                    "verwijzing_links", localized_product.taal
+    return product_dict
+
+
+def _get_changed_product_ids(products) -> list[int]:
+    """
+    :returns: The ids of the ``products`` that are not indexed, that have a new
+        most recent version, or of which the most recent version or one of its
+        translations changed after the product was indexed.
+    """
+    most_recent_versions = dict(
+        ProductVersie.objects.most_recent()
+        .filter(product__in=products)
+        .values_list("product_id", "pk")
+    )
+    indexed_versions = dict(
+        ProductUrlIndex.objects.filter(product__in=products).values_list(
+            "product_id", "product_versie_id"
+        )
+    )
+    changed = set(
+        ProductUrlIndex.objects.filter(product__in=products)
+        .filter(
+            Q(product_versie__gewijzigd_op__gt=F("geindexeerd_op"))
+            | Q(product_versie__vertalingen__datum_wijziging__gt=F("geindexeerd_op"))
+        )
+        .values_list("product_id", flat=True)
+    )
+
+    return sorted(
+        pk
+        for pk in products.values_list("pk", flat=True)
+        if pk in changed
+        or pk not in indexed_versions
+        or indexed_versions[pk] != most_recent_versions.get(pk)
+    )
+
+
+def update_url_index(products, batch_size=500) -> int:
+    """
+    Extract the urls of the ``products`` that changed since they were indexed,
+    see ``_get_changed_product_ids``.
+
+    :param products: A queryset of products.
+    :returns: The number of indexed products.
+    """
+    product_ids = _get_changed_product_ids(products)
+
+    for start in range(0, len(product_ids), batch_size):
+        batch = product_ids[start : start + batch_size]
+        # The changes after this moment are indexed by the next update.
+        timestamp = now()
+        versies = ProductVersie.objects.most_recent().prefetch_related("vertalingen")
+
+        indexes, urls = [], []
+        for product in Product.objects.filter(pk__in=batch).prefetch_related(
+            Prefetch("versies", to_attr="_most_recent_version", queryset=versies)
+        ):
+            index = ProductUrlIndex(
+                product=product,
+                product_versie=product.most_recent_version,
+                geindexeerd_op=timestamp,
+            )
+            indexes.append(index)
+
+            if product.most_recent_version is None:
+                continue
+            for localized_product in product.most_recent_version.vertalingen.all():
+                urls.extend(
+                    ProductUrl(
+                        index=index,
+                        field_name=field_name,
+                        taal=localized_product.taal,
+                        label=label,
+                        url=url,
+                    )
+                    for field_name, label, url in _extract_urls(localized_product)
                 )
-                for label, url in verwijzing_links:
-                    if _is_valid_url(url):
-                        product_dict[product.id].append(
-                            FieldUrl(field=occurring_field, label=label, url=url)
-                        )
 
-    return product_dict
+        with transaction.atomic():
+            ProductUrlIndex.objects.filter(product__in=batch).delete()
+            ProductUrlIndex.objects.bulk_create(indexes)
+            ProductUrl.objects.bulk_create(urls, batch_size=1000)
 
+    return len(product_ids)
 
-def check_broken_links():
-    founded_broken_link_ids: list = []
-    url_response_dict = {}
 
-    # Get all products
-    products = Product.objects.prefetch_related(
-        "most_recent_version__vertalingen"
-    ).exclude_generic_status()
+def get_indexed_product_urls(products) -> {int: [FieldUrl]}:
+    """
+    The same as ``get_product_urls``, from the url index of the ``products``,
+    which is updated first.
+
+    :param products: A queryset of products.
+    """
+    update_url_index(products)
+
+    product_dict = defaultdict(list)
+    configurations = _get_localized_field_configurations()
 
-    product_urls: dict[int : list[FieldUrl]] = dict(get_product_urls(products))
+    for product_id, field_name, taal, label, url in (
+        ProductUrl.objects.filter(index__product__in=products)
+        .order_by("pk")
+        .values_list("index__product_id", "field_name", "taal", "label", "url")
+    ):
+        product_dict[product_id].append(
+            FieldUrl(
+                field=_localized_field_verbose_name(field_name, taal, configurations),
+                label=label,
+                url=url,
+            )
+        )
 
+    return product_dict
+
+
+def check_urls_in_threads(urls, headers: dict | None = None) -> dict[str, UrlStatus]:
+    """
+    Check the urls in a thread pool, each with its own session.
+
+    :param headers: The conditional headers of the request of each url, if any.
+    :returns: The status of each url.
+    """
+    urls = list(urls)
+    headers = headers or {}
     with parallel() as executor:
-        # create a set of unique urls from the product_urls
-        unique_urls = set(glom(product_urls, "**.url"))
-        futures = executor.map(_check_url_with_retry, unique_urls)
+        return dict(
+            executor.map(
+                _check_url_with_retry, urls, [headers.get(url) for url in urls]
+            )
+        )
 
-        for url, status_code in futures:
-            url_response_dict[url] = status_code
 
-    for product_id, url_information_list in product_urls.items():
-        for url_information in url_information_list:
-            url_information: FieldUrl
+def _get_ttl(status_code: int) -> int:
+    if status_code < 400:
+        return settings.SDG_LINK_CHECKER_TTL
+    return settings.SDG_LINK_CHECKER_FAILURE_TTL
 
-            url = url_information["url"]
-            status_code = url_response_dict[url]
 
-            if broken_link_id := _handle_response_code(
-                url=url,
-                occurring_field=url_information["field"],
-                product_pk=product_id,
-                url_label=url_information["label"],
-                founded_status_code=status_code,
-            ):
-                founded_broken_link_ids.append(broken_link_id)
-
-    return reset_broken_links(ignore_broken_ids=founded_broken_link_ids)
+def check_urls_with_store(
+    urls, check_urls=check_urls_in_threads, force=False
+) -> dict[str, int]:
+    """
+    Check the urls that are due, and reuse the stored status of the other urls.
+
+    The status of every checked url is stored in ``CheckedUrl``, and expires
+    after the TTL of its status code. The urls with a stored ``ETag`` or
+    ``Last-Modified`` header are revalidated with a conditional request, and
+    keep their status if they have not been modified. The stored urls that are
+    not part of ``urls`` are deleted.
+
+    :param check_urls: The function that checks the urls, see
+        ``check_urls_in_threads``.
+    :param force: Check all urls, also those with a status that has not expired.
+    :returns: The status code of each url.
+    """
+    timestamp = now()
+    hashes = {url: CheckedUrl.hash_url(url) for url in urls}
+    stored = CheckedUrl.objects.in_bulk(hashes.values(), field_name="url_hash")
+
+    due = [
+        url
+        for url, url_hash in hashes.items()
+        if force or url_hash not in stored or stored[url_hash].expires_at <= timestamp
+    ]
+    headers = {
+        url: stored[hashes[url]].get_conditional_headers()
+        for url in due
+        if hashes[url] in stored
+    }
+    results = check_urls(due, headers=headers) if due else {}
+
+    created, updated = [], []
+    for url, result in results.items():
+        checked_url = stored.get(hashes[url])
+        if checked_url is None:
+            checked_url = CheckedUrl(url_hash=hashes[url], url=url)
+            created.append(checked_url)
+        else:
+            updated.append(checked_url)
+
+        if result["status_code"] == NOT_MODIFIED_STATUS_CODE and checked_url.pk:
+            # The url still has the stored (successful) status.
+            checked_url.etag = result["etag"] or checked_url.etag
+            checked_url.last_modified = (
+                result["last_modified"] or checked_url.last_modified
+            )
+        else:
+            checked_url.status_code = result["status_code"]
+            # Only a successful response is revalidated.
+            is_success = checked_url.status_code < 400
+            checked_url.etag = result["etag"] if is_success else ""
+            checked_url.last_modified = result["last_modified"] if is_success else ""
+
+        if checked_url.status_code < 400:
+            checked_url.consecutive_failures = 0
+        else:
+            checked_url.consecutive_failures += 1
+        checked_url.checked_at = timestamp
+        checked_url.expires_at = timestamp + timedelta(
+            seconds=_get_ttl(checked_url.status_code)
+        )
+
+    with transaction.atomic():
+        CheckedUrl.objects.bulk_create(created, batch_size=1000)
+        CheckedUrl.objects.bulk_update(
+            updated,
+            [
+                "status_code",
+                "checked_at",
+                "expires_at",
+                "etag",
+                "last_modified",
+                "consecutive_failures",
+            ],
+            batch_size=1000,
+        )
+        CheckedUrl.objects.exclude(url_hash__in=hashes.values()).delete()
+
+    stored.update({checked_url.url_hash: checked_url for checked_url in created})
+    return {url: stored[url_hash].status_code for url, url_hash in hashes.items()}
+
+
+def check_broken_links(check_urls=check_urls_in_threads, force=False):
+    """
+    Check the urls of all products and update the broken links.
+
+    :param check_urls: The function that checks the urls that are due and
+        returns their status, see ``check_urls_in_threads`` and
+        ``sdg.producten.link_checker.AsyncLinkChecker``.
+    :param force: Check all urls, see ``check_urls_with_store``.
+    """
+    # Get all products
+    products = Product.objects.exclude_generic_status()
+
+    product_urls: dict[int : list[FieldUrl]] = dict(get_indexed_product_urls(products))
+
+    # create a set of unique urls from the product_urls
+    unique_urls = set(glom(product_urls, "**.url"))
+    url_response_dict = check_urls_with_store(unique_urls, check_urls, force=force)
+
+    return save_broken_links(
+        (product_id, url["url"], url["field"], url["label"])
+        for product_id, urls in product_urls.items()
+        for url in urls
+        if url_response_dict[url["url"]] in BROKEN_STATUS_CODES
+    )
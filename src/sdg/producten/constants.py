@@ -11,3 +11,11 @@ class PublishChoices(DjangoChoices):
 class BooleanChoices(DjangoChoices):
     ja = ChoiceItem(True, _("Ja"))
     nee = ChoiceItem(False, _("Nee"))
+
+
+# The Postgres text search configuration of each language, for the full-text
+# search over the product texts.
+ZOEK_CONFIGURATIES = {
+    "nl": "dutch",
+    "en": "english",
+}
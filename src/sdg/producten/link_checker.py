@@ -0,0 +1,166 @@
+"""
+Asyncio engine of the broken link checker.
+
+All urls are checked from a single session, which keeps the connections to
+each host alive and reuses them for the next url of that host. The number of
+concurrent requests is limited in total and per host, so a host with many
+urls is not flooded and does not hold up the other hosts.
+"""
+
+import asyncio
+import re
+from collections import defaultdict
+from urllib.parse import urlsplit
+
+import aiohttp
+
+from .broken_links import (
+    ANY_ERROR_STATUS_CODE,
+    INVALID_URL_ADAPTERS,
+    NOT_MODIFIED_STATUS_CODE,
+    REQUEST_HEADERS,
+    SOFT_404_MAX_SIZE,
+    SUCCES_STATUS_CODE,
+    VALID_URL_ADAPTERS,
+    UrlStatus,
+    is_soft_404,
+    normalize_url,
+    url_status,
+)
+
+# The status codes that are retried, like the retry policy of the thread pool.
+RETRY_STATUS_CODES = {429, 500, 502, 503, 504}
+
+content_range_re = re.compile(r"/(\d+)$")
+
+
+class AsyncLinkChecker:
+    """
+    Check urls with HEAD requests, and fall back to a ranged GET request when
+    the HEAD request fails or the content is too small to rule out a custom
+    error page.
+
+    The status codes are the same as those of ``check_urls_in_threads``: the
+    final status code after redirects, 404 for a page that is not found,
+    ``ANY_ERROR_STATUS_CODE`` for any other error or if the url could not be
+    requested and 304 if a conditional request finds that the url has not been
+    modified.
+    """
+
+    def __init__(
+        self,
+        concurrency: int = 64,
+        concurrency_per_host: int = 4,
+        timeout: int = 20,
+        retries: int = 3,
+        backoff_factor: float = 0.5,
+    ):
+        self.concurrency = concurrency
+        self.concurrency_per_host = concurrency_per_host
+        self.timeout = timeout
+        self.retries = retries
+        self.backoff_factor = backoff_factor
+
+    def check_urls(self, urls, headers: dict | None = None) -> dict[str, UrlStatus]:
+        """
+        :param headers: The conditional headers of the request of each url, if
+            any.
+        :returns: The status of each url.
+        """
+        return asyncio.run(self.acheck_urls(urls, headers or {}))
+
+    async def acheck_urls(self, urls, headers: dict) -> dict[str, UrlStatus]:
+        self._semaphore = asyncio.Semaphore(self.concurrency)
+        self._host_semaphores = defaultdict(
+            lambda: asyncio.Semaphore(self.concurrency_per_host)
+        )
+
+        connector = aiohttp.TCPConnector(
+            limit=self.concurrency,
+            limit_per_host=self.concurrency_per_host,
+            ttl_dns_cache=300,
+            ssl=False,
+        )
+        async with aiohttp.ClientSession(
+            connector=connector,
+            headers=REQUEST_HEADERS,
+            timeout=aiohttp.ClientTimeout(
+                sock_connect=self.timeout, sock_read=self.timeout
+            ),
+            # Like a new session per url, no cookies are shared between urls.
+            cookie_jar=aiohttp.DummyCookieJar(),
+            max_line_size=16384,
+            max_field_size=16384,
+        ) as session:
+            urls = list(urls)
+            statuses = await asyncio.gather(
+                *(self.check_url(session, url, headers.get(url)) for url in urls)
+            )
+
+        return dict(zip(urls, statuses))
+
+    async def check_url(self, session, url: str, headers: dict | None) -> UrlStatus:
+        # Check for special URL schemes
+        if url.startswith(VALID_URL_ADAPTERS):
+            return url_status(SUCCES_STATUS_CODE)
+
+        if url.startswith(INVALID_URL_ADAPTERS):
+            return url_status(ANY_ERROR_STATUS_CODE)
+
+        url = normalize_url(url)
+        try:
+            host = urlsplit(url).hostname
+        except ValueError:
+            return url_status(ANY_ERROR_STATUS_CODE)
+
+        # The host is acquired first, so the requests that wait for a busy host
+        # do not occupy the slots of the other hosts.
+        async with self._host_semaphores[host], self._semaphore:
+            for attempt in range(self.retries + 1):
+                if attempt:
+                    await asyncio.sleep(self.backoff_factor * 2 ** (attempt - 1))
+
+                try:
+                    status = await self.request(session, url, headers or {})
+                except (aiohttp.ClientError, asyncio.TimeoutError, ValueError):
+                    continue
+
+                if status["status_code"] in RETRY_STATUS_CODES:
+                    continue
+                if status["status_code"] >= 400 and status["status_code"] != 404:
+                    # Like the thread pool, which does not keep the status code
+                    # of an error response.
+                    return url_status(ANY_ERROR_STATUS_CODE)
+                return status
+
+        return url_status(ANY_ERROR_STATUS_CODE)
+
+    async def request(self, session, url: str, headers: dict) -> UrlStatus:
+        async with session.head(url, headers=headers, allow_redirects=True) as response:
+            if response.status == NOT_MODIFIED_STATUS_CODE or (
+                response.status < 400
+                and (response.content_length or 0) >= SOFT_404_MAX_SIZE
+            ):
+                return url_status(response.status, response.headers)
+
+        # The server does not support HEAD, or the content must be checked.
+        headers = {**headers, "Range": f"bytes=0-{SOFT_404_MAX_SIZE - 1}"}
+        async with session.get(url, headers=headers, allow_redirects=True) as response:
+            if response.status == 416:
+                # The range is not satisfiable, the content is empty.
+                return url_status(SUCCES_STATUS_CODE, response.headers)
+
+            content = await response.content.read(SOFT_404_MAX_SIZE)
+            status_code = response.status
+            if status_code == 206:
+                status_code = SUCCES_STATUS_CODE
+                # The size of the complete content is part of the content range.
+                match = content_range_re.search(
+                    response.headers.get("Content-Range", "")
+                )
+                if match and int(match.group(1)) >= SOFT_404_MAX_SIZE:
+                    return url_status(status_code, response.headers)
+
+            if is_soft_404(status_code, content):
+                status_code = 404
+            return url_status(status_code, response.headers)
@@ -1,12 +1,13 @@
 from django.core.management import BaseCommand
 
 from sdg.core.constants import TaalChoices
+from sdg.core.metrics import MeasuredCommandMixin
 from sdg.core.models import ProductenCatalogus, UniformeProductnaam
 from sdg.organisaties.models import BevoegdeOrganisatie
 from sdg.producten.models import LocalizedProduct, Product, ProductVersie
 
 
-class Command(BaseCommand):
+class Command(MeasuredCommandMixin, BaseCommand):
     help = "Create reference products, based on generic products, for all reference catalogs where appropriate."
 
     def handle(self, **options):
@@ -2,11 +2,12 @@ from datetime import date
 
 from django.core.management import BaseCommand
 
+from sdg.core.metrics import MeasuredCommandMixin
 from sdg.producten.models import Product, ProductVersie
 from sdg.producten.utils import get_placeholder_maps
 
 
-class Command(BaseCommand):
+class Command(MeasuredCommandMixin, BaseCommand):
     help = "Druk referentie teksten door op de gerelateerde producten."
 
     # Reset DB data that indicates an active press through.
@@ -41,7 +42,7 @@ class Command(BaseCommand):
 
         total_updated_products = 0
 
-        for reference_product in reference_products:
+        for reference_product in reference_products.most_recent():
             self.stdout.write(f"Processing reference product: {reference_product.pk}")
 
             reference_product_version: ProductVersie = (
@@ -65,7 +66,9 @@ class Command(BaseCommand):
             )
 
             # Update each product linked to the reference product.
-            for product in products:
+            for product in products.most_recent().select_related(
+                "generiek_product", "catalogus__lokale_overheid"
+            ):
                 self.stdout.write(f"    Updating product: {product.pk}")
                 product_version: ProductVersie = product.most_recent_version
 
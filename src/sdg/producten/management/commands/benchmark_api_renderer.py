@@ -0,0 +1,97 @@
+import io
+import timeit
+
+from django.contrib.auth.models import AnonymousUser
+from django.core.management import BaseCommand, CommandError
+from django.http import HttpRequest
+
+from djangorestframework_camel_case.parser import CamelCaseJSONParser
+from djangorestframework_camel_case.render import CamelCaseJSONRenderer
+from rest_framework.request import Request
+
+from sdg.api.parsers import CamelCaseORJSONParser
+from sdg.api.renderers import CamelCaseORJSONRenderer
+from sdg.api.views import ProductViewSet
+from sdg.core.metrics import MeasuredCommandMixin
+
+
+class Command(MeasuredCommandMixin, BaseCommand):
+    help = (
+        "Compare the JSON renderer and parser of the API with the ones of "
+        "djangorestframework-camel-case, on a page of products."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--page-size",
+            type=int,
+            default=25,
+            help="The number of products on the page.",
+        )
+        parser.add_argument(
+            "--number",
+            type=int,
+            default=100,
+            help="The number of times the page is rendered and parsed.",
+        )
+        parser.add_argument(
+            "--host",
+            default="localhost",
+            help="The host used in the URLs of the products.",
+        )
+
+    def handle(self, **options):
+        page = self.get_page(options["page_size"], options["host"])
+        if not page["results"]:
+            raise CommandError("There are no active products to render.")
+
+        content = CamelCaseJSONRenderer().render(page)
+        if CamelCaseORJSONRenderer().render(page) != content:
+            raise CommandError("The renderers do not produce the same output.")
+
+        self.stdout.write(
+            f"Page of {len(page['results'])} products, {len(content)} bytes, "
+            f"{options['number']} times."
+        )
+        self.compare(
+            "render",
+            lambda: CamelCaseJSONRenderer().render(page),
+            lambda: CamelCaseORJSONRenderer().render(page),
+            options["number"],
+        )
+        self.compare(
+            "parse",
+            lambda: CamelCaseJSONParser().parse(io.BytesIO(content)),
+            lambda: CamelCaseORJSONParser().parse(io.BytesIO(content)),
+            options["number"],
+        )
+
+    def get_page(self, page_size: int, host: str) -> dict:
+        http_request = HttpRequest()
+        http_request.META["SERVER_NAME"] = host
+        http_request.META["SERVER_PORT"] = "80"
+
+        request = Request(http_request)
+        request.user = AnonymousUser()
+        request.auth = None
+
+        view = ProductViewSet(request=request, format_kwarg=None, kwargs={})
+        queryset = view.get_queryset()
+        pks = list(queryset.order_by("pk").values_list("pk", flat=True)[:page_size])
+
+        return {
+            "count": len(pks),
+            "next": None,
+            "previous": None,
+            "results": view.get_representations(queryset, pks),
+        }
+
+    def compare(self, name: str, current, replacement, number: int):
+        current_time = min(timeit.repeat(current, number=number, repeat=3))
+        replacement_time = min(timeit.repeat(replacement, number=number, repeat=3))
+
+        self.stdout.write(
+            f"{name}: {current_time / number * 1000:.2f} ms -> "
+            f"{replacement_time / number * 1000:.2f} ms "
+            f"({current_time / replacement_time:.1f}x)"
+        )
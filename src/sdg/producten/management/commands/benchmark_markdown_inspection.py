@@ -0,0 +1,116 @@
+import timeit
+from html.parser import HTMLParser
+
+from django.core.management import BaseCommand, CommandError
+
+import markdown
+from bs4 import BeautifulSoup
+
+from sdg.core.metrics import MeasuredCommandMixin
+
+from ...broken_links import MARKDOWN_LINKS
+from ...markdown_inspection import inspect_markdown
+from ...models import LocalizedProduct
+
+
+class TagParser(HTMLParser):
+    def __init__(self):
+        super().__init__()
+        self.tags = []
+
+    def handle_starttag(self, tag, attrs):
+        self.tags.append(tag)
+
+
+def get_links_from_html(value: str) -> list:
+    soup = BeautifulSoup(markdown.markdown(value), "html.parser")
+    return [(link.get("href", ""), link.get_text()) for link in soup.find_all("a")]
+
+
+def get_tags_from_html(value: str) -> list:
+    parser = TagParser()
+    parser.feed(markdown.markdown(value))
+    return parser.tags
+
+
+def inspect(value: str) -> tuple:
+    inspection = inspect_markdown(value)
+    return [(link.href, link.label) for link in inspection.links], inspection.tags
+
+
+class Command(MeasuredCommandMixin, BaseCommand):
+    help = (
+        "Compare the inspection of the markdown fields of the products with "
+        "parsing the HTML of the markdown, as done before by the broken link "
+        "checker and the markdown validator."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--limit",
+            type=int,
+            default=1000,
+            help="The number of translations of which the fields are inspected.",
+        )
+        parser.add_argument(
+            "--number",
+            type=int,
+            default=1,
+            help="The number of times the fields are inspected.",
+        )
+
+    def handle(self, **options):
+        values = [
+            value
+            for values in LocalizedProduct.objects.order_by("-pk").values_list(
+                *MARKDOWN_LINKS
+            )[: options["limit"]]
+            for value in values
+            if value
+        ]
+        if not values:
+            raise CommandError("There are no markdown fields to inspect.")
+
+        for value in values:
+            if inspect(value) != (
+                get_links_from_html(value),
+                get_tags_from_html(value),
+            ):
+                raise CommandError(f"The inspection of {value!r} is not the same.")
+
+        link_count = sum(len(inspect_markdown(value).links) for value in values)
+        self.stdout.write(
+            f"{len(values)} fields, {sum(map(len, values))} characters, "
+            f"{link_count} links, {options['number']} times."
+        )
+        self.compare(
+            "links and tags",
+            lambda: [
+                (get_links_from_html(value), get_tags_from_html(value))
+                for value in values
+            ],
+            lambda: [inspect(value) for value in values],
+            options["number"],
+        )
+        self.compare(
+            "links",
+            lambda: [get_links_from_html(value) for value in values],
+            lambda: [inspect_markdown(value).links for value in values],
+            options["number"],
+        )
+        self.compare(
+            "tags",
+            lambda: [get_tags_from_html(value) for value in values],
+            lambda: [inspect_markdown(value).tags for value in values],
+            options["number"],
+        )
+
+    def compare(self, name: str, current, replacement, number: int):
+        current_time = min(timeit.repeat(current, number=number, repeat=3))
+        replacement_time = min(timeit.repeat(replacement, number=number, repeat=3))
+
+        self.stdout.write(
+            f"{name}: {current_time / number * 1000:.2f} ms -> "
+            f"{replacement_time / number * 1000:.2f} ms "
+            f"({current_time / replacement_time:.1f}x)"
+        )
@@ -0,0 +1,28 @@
+from django.core.management import BaseCommand
+
+from sdg.api.schema import (
+    generate_schema_documents,
+    get_schema_version,
+    write_schema_documents,
+)
+from sdg.core.metrics import MeasuredCommandMixin
+
+
+class Command(MeasuredCommandMixin, BaseCommand):
+    help = (
+        "Generate the OpenAPI schema of the API for the current release, so the "
+        "API can serve it without generating it."
+    )
+
+    def handle(self, *args, **options):
+        version = get_schema_version()
+        if version is None:
+            self.stderr.write(
+                "There is no release to build the schema for, the schema will be "
+                "generated by the API."
+            )
+            return
+
+        write_schema_documents(generate_schema_documents(), version=version)
+
+        self.stdout.write(f"Built the API schema for release {version}.")
@@ -1,29 +1,97 @@
-from django.core.management import BaseCommand
-
-from ...broken_links import check_broken_links, reset_broken_links
-
-
-class Command(BaseCommand):
-    help = "Check for broken links in product fields and update the BrokenLink model."
-
-    def add_arguments(self, parser):
-        parser.add_argument(
-            "--reset",
-            "-R",
-            action="store_true",
-            help="Reset all the broken links.",
-        )
-
-    def handle(self, **options):
-        # Handle Reset
-        if options.get("reset"):
-            reset_broken_links(reset_all=True)
-            self.stdout.write(
-                self.style.SUCCESS(
-                    "Successfully cleared the error_count of every BrokenLink."
-                )
-            )
-            return
-
-        total = check_broken_links()
-        self.stdout.write(self.style.SUCCESS(f"Deleted {total} old BrokenLink(s)."))
+import time
+
+from django.conf import settings
+from django.core.management import BaseCommand
+
+from sdg.core.metrics import MeasuredCommandMixin
+
+from ...broken_links import (
+    check_broken_links,
+    check_urls_in_threads,
+    reset_broken_links,
+)
+from ...link_checker import AsyncLinkChecker
+
+ENGINES = ["threads", "asyncio"]
+
+
+class TimedCheck:
+    """
+    Count the checked urls and the time spent checking them.
+    """
+
+    def __init__(self, check_urls):
+        self.check_urls = check_urls
+        self.count = 0
+        self.elapsed = 0.0
+
+    def __call__(self, urls, **kwargs):
+        start = time.monotonic()
+        statuses = self.check_urls(urls, **kwargs)
+        self.elapsed += time.monotonic() - start
+        self.count += len(statuses)
+        return statuses
+
+
+class Command(MeasuredCommandMixin, BaseCommand):
+    help = "Check for broken links in product fields and update the BrokenLink model."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--reset",
+            "-R",
+            action="store_true",
+            help="Reset all the broken links.",
+        )
+        parser.add_argument(
+            "--engine",
+            choices=ENGINES,
+            default=settings.SDG_LINK_CHECKER_ENGINE,
+            help="The engine that checks the urls.",
+        )
+        parser.add_argument(
+            "--concurrency",
+            type=int,
+            default=settings.SDG_LINK_CHECKER_CONCURRENCY,
+            help="The maximum number of concurrent requests (asyncio engine).",
+        )
+        parser.add_argument(
+            "--concurrency-per-host",
+            type=int,
+            default=settings.SDG_LINK_CHECKER_CONCURRENCY_PER_HOST,
+            help="The maximum number of concurrent requests per host (asyncio engine).",
+        )
+        parser.add_argument(
+            "--force",
+            action="store_true",
+            help="Check all urls, also the urls with a previous result that has not expired.",
+        )
+
+    def handle(self, **options):
+        # Handle Reset
+        if options.get("reset"):
+            reset_broken_links(reset_all=True)
+            self.stdout.write(
+                self.style.SUCCESS(
+                    "Successfully cleared the error_count of every BrokenLink."
+                )
+            )
+            return
+
+        if options["engine"] == "asyncio":
+            check_urls = AsyncLinkChecker(
+                concurrency=options["concurrency"],
+                concurrency_per_host=options["concurrency_per_host"],
+            ).check_urls
+        else:
+            check_urls = check_urls_in_threads
+
+        timed_check = TimedCheck(check_urls)
+        total = check_broken_links(check_urls=timed_check, force=options["force"])
+        if options["verbosity"] > 1:
+            rate = timed_check.count / timed_check.elapsed if timed_check.elapsed else 0
+            self.stdout.write(
+                f"Checked {timed_check.count} url(s) in {timed_check.elapsed:.1f}s "
+                f"({rate:.1f}/s, {options['engine']})."
+            )
+        self.stdout.write(self.style.SUCCESS(f"Deleted {total} old BrokenLink(s)."))
@@ -1,5 +1,6 @@
 from django.core.management import BaseCommand
 
+from sdg.core.metrics import MeasuredCommandMixin
 from sdg.producten.models import LocalizedProduct
 
 previous_placeholder_texts = {
@@ -24,7 +25,7 @@ previous_placeholder_texts = {
 }
 
 
-class Command(BaseCommand):
+class Command(MeasuredCommandMixin, BaseCommand):
     help = "Clean all products according to standard rules."
 
     def handle(self, **options):
@@ -4,13 +4,16 @@ from django.core.management import BaseCommand
 from django.http import HttpRequest
 
 from sdg.api.views import ProductViewSet
+from sdg.core.db.routers import read_from_replica
+from sdg.core.metrics import MeasuredCommandMixin
 
 OUTPUT_FILE = "products.json"
 
 
-class Command(BaseCommand):
+class Command(MeasuredCommandMixin, BaseCommand):
     help = "Dump all products to a JSON file."
 
+    @read_from_replica()
     def handle(self, **options):
         class auth:
             api_default_most_recent = True
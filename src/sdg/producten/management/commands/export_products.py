@@ -0,0 +1,83 @@
+import gzip
+import sys
+
+from django.contrib.auth.models import AnonymousUser
+from django.core.management import BaseCommand
+from django.http import HttpRequest
+
+from rest_framework.request import Request
+
+from sdg.api.export import EXPORT_CHUNK_SIZE, iter_product_export
+from sdg.api.views import ProductViewSet
+from sdg.core.db.routers import read_from_replica
+from sdg.core.metrics import MeasuredCommandMixin
+
+
+class Command(MeasuredCommandMixin, BaseCommand):
+    help = "Export all products as newline delimited JSON (NDJSON)."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--output",
+            default="-",
+            help="The file to write the export to, defaults to stdout.",
+        )
+        parser.add_argument(
+            "--gzip", action="store_true", help="Compress the export with gzip."
+        )
+        parser.add_argument(
+            "--chunk-size",
+            type=int,
+            default=EXPORT_CHUNK_SIZE,
+            help="The number of products that are retrieved at once.",
+        )
+        parser.add_argument(
+            "--most-recent",
+            action="store_true",
+            help="Export the most recent versions instead of the active versions.",
+        )
+        parser.add_argument(
+            "--host",
+            default="localhost",
+            help="The host used in the URLs of the exported products.",
+        )
+
+    @read_from_replica()
+    def handle(self, **options):
+        class auth:
+            api_default_most_recent = options["most_recent"]
+
+        http_request = HttpRequest()
+        http_request.META["SERVER_NAME"] = options["host"]
+        http_request.META["SERVER_PORT"] = "80"
+
+        request = Request(http_request)
+        request.user = AnonymousUser()
+        request.auth = auth
+
+        view = ProductViewSet(request=request, format_kwarg=None, kwargs={})
+        lines = iter_product_export(
+            view, view.get_queryset(), chunk_size=options["chunk_size"]
+        )
+
+        if options["output"] == "-":
+            count = self.write(sys.stdout.buffer, lines, options["gzip"])
+        else:
+            with open(options["output"], "wb") as output:
+                count = self.write(output, lines, options["gzip"])
+
+        self.stderr.write(self.style.SUCCESS(f"Successfully exported {count} products"))
+
+    def write(self, output, lines, compress: bool) -> int:
+        if compress:
+            output = gzip.GzipFile(fileobj=output, mode="wb")
+
+        count = 0
+        for count, line in enumerate(lines, start=1):
+            output.write(line)
+
+        if compress:
+            # Closing the ``GzipFile`` writes the trailer, but does not close
+            # the underlying file.
+            output.close()
+        return count
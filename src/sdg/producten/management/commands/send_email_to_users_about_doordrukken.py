@@ -15,6 +15,7 @@ from furl import furl
 
 from sdg.accounts.models import Role
 from sdg.conf.utils import org_type_cfg
+from sdg.core.metrics import MeasuredCommandMixin
 from sdg.core.models import ProductenCatalogus
 from sdg.organisaties.models import LokaleOverheid
 from sdg.producten.models import Product
@@ -22,7 +23,7 @@ from sdg.producten.models import Product
 User = get_user_model()
 
 
-class Command(BaseCommand):
+class Command(MeasuredCommandMixin, BaseCommand):
     help = "Send an e-mail to users to inform them about their related products and that they will be overwritten."
 
     def construct_product_url(
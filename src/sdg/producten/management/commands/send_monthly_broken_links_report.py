@@ -5,7 +5,7 @@ from django.contrib.auth import get_user_model
 from django.contrib.sites.models import Site
 from django.core.mail import send_mail
 from django.core.management import BaseCommand
-from django.db.models import Q
+from django.db.models import Prefetch, Q
 from django.template.loader import render_to_string
 from django.utils.html import strip_tags
 
@@ -13,13 +13,15 @@ from furl import furl
 
 from sdg.accounts.models import Role
 from sdg.conf.utils import org_type_cfg
+from sdg.core.db.routers import read_from_replica
+from sdg.core.metrics import MeasuredCommandMixin
 from sdg.organisaties.models import LokaleOverheid
-from sdg.producten.models import BrokenLinks
+from sdg.producten.models import BrokenLinks, Product
 
 User = get_user_model()
 
 
-class Command(BaseCommand):
+class Command(MeasuredCommandMixin, BaseCommand):
     help = "Send monthly broken links report to the all redactors of the content."
 
     def construct_base_url(
@@ -70,6 +72,7 @@ class Command(BaseCommand):
             html_message=html_message,
         )
 
+    @read_from_replica()
     def handle(self, *args, **options):
         """
         Description:
@@ -81,7 +84,14 @@ class Command(BaseCommand):
         grouped_users = defaultdict(lambda: ([], set(), None))
 
         # First create mailing list
-        for broken_link in BrokenLinks.objects.filter(error_count__gte=3):
+        products = Product.objects.annotate_name().select_related(
+            "catalogus__lokale_overheid__organisatie"
+        )
+        reported_links = BrokenLinks.objects.filter(error_count__gte=3)
+        reported_links = reported_links.prefetch_related(
+            Prefetch("product", queryset=products)
+        )
+        for broken_link in reported_links:
             lokale_overheid: LokaleOverheid = (
                 broken_link.product.catalogus.lokale_overheid
             )
@@ -1,8 +1,11 @@
 import datetime
 
 from django.core.management import BaseCommand
+from django.utils import timezone
 
+from sdg.api.cache import bump_response_cache_generation, invalidate_product_documents
 from sdg.core.constants import TaalChoices
+from sdg.core.metrics import MeasuredCommandMixin
 from sdg.core.models import ProductenCatalogus
 from sdg.organisaties.models import BevoegdeOrganisatie, LokaleOverheid
 from sdg.producten.models import Product, ProductVersie
@@ -10,7 +13,7 @@ from sdg.producten.models.localized import LocalizedProduct
 from sdg.producten.utils import get_placeholder_maps
 
 
-class Command(BaseCommand):
+class Command(MeasuredCommandMixin, BaseCommand):
     help = "Creates, updates and corrects catalogs with products based on reference catalogs, for each active organisation."
 
     def add_arguments(self, parser):
@@ -92,7 +95,8 @@ class Command(BaseCommand):
         ):
 
             # Iterate over all reference products in the reference catalog.
-            for reference_product in reference_catalog.producten.all():
+            reference_products = reference_catalog.producten.active().annotate_name()
+            for reference_product in reference_products:
                 active_reference_product_version = reference_product.active_version
 
                 if not active_reference_product_version:
@@ -147,8 +151,10 @@ class Command(BaseCommand):
                     # Make sure the product has an authorized organisation.
                     if not is_created and product.bevoegde_organisatie is None:
                         Product.objects.filter(pk=product.pk).update(
-                            bevoegde_organisatie=default_auth_org
+                            bevoegde_organisatie=default_auth_org,
+                            gewijzigd_op=timezone.now(),
                         )
+                        invalidate_product_documents([product.pk])
                         corrections.append("added missing authorized organisation")
 
                     # For newly created products, create an initial version.
@@ -166,7 +172,7 @@ class Command(BaseCommand):
                         # Since we're also scanning to make corrections, we grab
                         # the most recent product version here to check its
                         # translations.
-                        product_version = product.most_recent_version
+                        product_version = product.versies.order_by("-versie").first()
 
                     if is_created or product_version.vertalingen.count() != len(
                         TaalChoices.values.keys()
@@ -249,5 +255,8 @@ class Command(BaseCommand):
                             f"[{perc(current_count)}] Created new product '{product}' ({product.pk}) in catalog '{catalog}' for '{catalog.lokale_overheid}'."
                         )
 
+        # Some products are corrected in bulk, without sending any signals.
+        bump_response_cache_generation()
+
         self.stdout.write(f"Created {created_catalogs} catalogs.")
         self.stdout.write(f"Created {created_products} products.")
@@ -3,6 +3,7 @@ import datetime
 from django.core.management import BaseCommand
 
 from sdg.core.constants import GenericProductStatus
+from sdg.core.metrics import MeasuredCommandMixin
 from sdg.producten.models import GeneriekProduct, Product
 from sdg.producten.models.localized import LocalizedGeneriekProduct
 
@@ -13,10 +14,12 @@ def _generate_status(generic_product: GeneriekProduct):
     """
     try:
         reference_product_has_active_version = bool(
-            Product.objects.get(
+            Product.objects.active()
+            .get(
                 catalogus__is_referentie_catalogus=True,
                 generiek_product=generic_product,
-            ).active_version
+            )
+            .active_version
         )
     except Product.DoesNotExist:
         reference_product_has_active_version = None
@@ -45,14 +48,20 @@ def _generate_status(generic_product: GeneriekProduct):
         return GenericProductStatus.NEW
 
 
-class Command(BaseCommand):
+class Command(MeasuredCommandMixin, BaseCommand):
     help = "Update status for all generic products"
 
     def handle(self, **options):
         updated_product_count = 0
 
         for generic_product in GeneriekProduct.objects.all():
-            generic_product.product_status = _generate_status(generic_product)
+            product_status = _generate_status(generic_product)
+            # Only save a changed status, the API responses depend on the
+            # modification date.
+            if product_status == generic_product.product_status:
+                continue
+
+            generic_product.product_status = product_status
             generic_product.save()
             updated_product_count += 1
 
@@ -0,0 +1,226 @@
+"""
+Inspect the links and tags of markdown, without rendering it to HTML.
+
+The markdown is parsed by Python-Markdown, like ``markdown.markdown``, up to
+the element tree. The tree is read as a stream of start tag, text and end tag
+tokens, in which the raw HTML in the markdown is replaced by its own tokens.
+The result is the same as parsing the HTML of ``markdown.markdown``, without
+serializing and parsing the HTML again.
+"""
+
+import html
+import re
+import threading
+from dataclasses import dataclass, field
+from html.parser import HTMLParser
+from xml.etree.ElementTree import Comment
+
+import markdown
+from markdown.util import AMP_SUBSTITUTE, HTML_PLACEHOLDER_RE
+
+__all__ = ["Link", "MarkdownInspection", "inspect_markdown"]
+
+# The elements without content, which are never closed.
+VOID_ELEMENTS = {
+    "area",
+    "base",
+    "br",
+    "col",
+    "embed",
+    "hr",
+    "img",
+    "input",
+    "link",
+    "meta",
+    "param",
+    "source",
+    "track",
+    "wbr",
+}
+
+START, DATA, END = "start", "data", "end"
+
+entity_re = re.compile(r"&#?\w+;")
+
+_local = threading.local()
+
+
+@dataclass
+class Link:
+    href: str
+    label: str = ""
+
+
+@dataclass
+class MarkdownInspection:
+    # The links, in the order of the document.
+    links: list[Link] = field(default_factory=list)
+    # The tag of every element, in the order of the document.
+    tags: list[str] = field(default_factory=list)
+
+
+class _RawHTMLTokenizer(HTMLParser):
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.tokens = []
+
+    def handle_starttag(self, tag, attrs):
+        self.tokens.append((START, tag, dict(attrs)))
+
+    def handle_startendtag(self, tag, attrs):
+        self.tokens.append((START, tag, dict(attrs)))
+        if tag not in VOID_ELEMENTS:
+            self.tokens.append((END, tag, None))
+
+    def handle_endtag(self, tag):
+        self.tokens.append((END, tag, None))
+
+    def handle_data(self, data):
+        self.tokens.append((DATA, data, None))
+
+
+def _get_markdown() -> markdown.Markdown:
+    # Creating the parser is expensive, it is reused by each thread.
+    if not hasattr(_local, "markdown"):
+        _local.markdown = markdown.Markdown()
+    return _local.markdown
+
+
+def _unescape(text: str) -> str:
+    """
+    Decode the entities of the text of an element, as they are decoded when
+    the HTML is parsed.
+    """
+    text = text.replace(AMP_SUBSTITUTE, "&")
+    if "&" in text:
+        text = entity_re.sub(lambda match: html.unescape(match.group()), text)
+    return text
+
+
+class _Tokenizer:
+    def __init__(self, md: markdown.Markdown):
+        self.md = md
+        self.raw_html = md.postprocessors["raw_html"]
+
+    def get_raw_html(self, index: int) -> str:
+        raw_html = self.raw_html.stash_to_string(self.md.htmlStash.rawHtmlBlocks[index])
+        # The raw HTML can contain other raw HTML.
+        return HTML_PLACEHOLDER_RE.sub(
+            lambda match: self.get_raw_html(int(match.group(1))), raw_html
+        )
+
+    def tokenize_text(self, text: str):
+        position = 0
+        for match in HTML_PLACEHOLDER_RE.finditer(text):
+            if match.start() > position:
+                yield DATA, _unescape(text[position : match.start()]), None
+            yield from self.tokenize_raw_html(self.get_raw_html(int(match.group(1))))
+            position = match.end()
+        if position < len(text):
+            yield DATA, _unescape(text[position:]), None
+
+    def tokenize_raw_html(self, raw_html: str):
+        tokenizer = _RawHTMLTokenizer()
+        tokenizer.feed(raw_html)
+        tokenizer.close()
+        return tokenizer.tokens
+
+    def is_raw_html_block(self, element) -> bool:
+        """
+        A paragraph that only contains block level raw HTML is replaced by the
+        raw HTML, see ``RawHtmlPostprocessor``.
+        """
+        if element.tag != "p" or len(element) or not element.text:
+            return False
+        match = HTML_PLACEHOLDER_RE.fullmatch(element.text)
+        return bool(match) and self.raw_html.isblocklevel(
+            self.get_raw_html(int(match.group(1)))
+        )
+
+    def tokenize(self, element):
+        if element.tag is Comment:
+            pass
+        elif self.is_raw_html_block(element):
+            yield from self.tokenize_text(element.text)
+        else:
+            yield START, element.tag, {
+                name: _unescape(value) for name, value in element.items()
+            }
+            if element.text:
+                yield from self.tokenize_text(element.text)
+            for child in element:
+                yield from self.tokenize(child)
+            if element.tag not in VOID_ELEMENTS:
+                yield END, element.tag, None
+
+        if element.tail:
+            yield from self.tokenize_text(element.tail)
+
+    def tokenize_document(self, root):
+        if root.text:
+            yield from self.tokenize_text(root.text)
+        for child in root:
+            yield from self.tokenize(child)
+
+
+def _parse(md: markdown.Markdown, value: str):
+    """
+    The steps of ``Markdown.convert`` up to the serialization of the tree.
+    """
+    md.reset()
+    lines = value.split("\n")
+    for preprocessor in md.preprocessors:
+        lines = preprocessor.run(lines)
+
+    root = md.parser.parseDocument(lines).getroot()
+    for treeprocessor in md.treeprocessors:
+        new_root = treeprocessor.run(root)
+        if new_root is not None:
+            root = new_root
+    return root
+
+
+def inspect_markdown(value: str) -> MarkdownInspection:
+    """
+    :returns: The links (``<a>`` elements) with their href and text, and the
+        tags of the elements in the HTML of the markdown ``value``.
+    """
+    inspection = MarkdownInspection()
+    if not value or not value.strip():
+        return inspection
+
+    md = _get_markdown()
+    root = _parse(md, value)
+
+    # The open elements, with the link and the text of the open links.
+    open_elements = []
+    for kind, name, attrs in _Tokenizer(md).tokenize_document(root):
+        if kind == DATA:
+            for _, link, label in open_elements:
+                if link:
+                    label.append(name)
+        elif kind == START:
+            inspection.tags.append(name)
+            if name in VOID_ELEMENTS:
+                continue
+            link = None
+            if name == "a":
+                link = Link(href=attrs.get("href") or "")
+                inspection.links.append(link)
+            open_elements.append((name, link, []))
+        elif any(tag == name for tag, _, _ in open_elements):
+            # Close the unclosed elements within the element.
+            while True:
+                tag, link, label = open_elements.pop()
+                if link:
+                    link.label = "".join(label)
+                if tag == name:
+                    break
+
+    # Close the unclosed links at the end of the document.
+    for _, link, label in open_elements:
+        if link:
+            link.label = "".join(label)
+
+    md.reset()
+    return inspection
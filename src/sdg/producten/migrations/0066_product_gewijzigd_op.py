@@ -0,0 +1,22 @@
+# Generated by Django 5.2 on 2026-10-18 19:14
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("producten", "0065_alter_localizedgeneriekproduct_landelijke_link"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="product",
+            name="gewijzigd_op",
+            field=models.DateTimeField(
+                auto_now=True,
+                help_text="De wijzigingsdatum voor dit product.",
+                verbose_name="gewijzigd op",
+            ),
+        ),
+    ]
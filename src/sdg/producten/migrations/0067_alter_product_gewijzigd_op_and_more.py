@@ -0,0 +1,44 @@
+# Generated by Django 5.2 on 2026-10-18 19:27
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("producten", "0066_product_gewijzigd_op"),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name="product",
+            name="gewijzigd_op",
+            field=models.DateTimeField(
+                auto_now=True,
+                db_index=True,
+                help_text="De wijzigingsdatum voor dit product.",
+                verbose_name="gewijzigd op",
+            ),
+        ),
+        migrations.AlterField(
+            model_name="productversie",
+            name="gewijzigd_op",
+            field=models.DateTimeField(
+                auto_now=True,
+                db_index=True,
+                help_text="De wijzigingsdatum voor deze productversie.",
+                verbose_name="gewijzigd op",
+            ),
+        ),
+        migrations.AlterField(
+            model_name="productversie",
+            name="publicatie_datum",
+            field=models.DateField(
+                blank=True,
+                db_index=True,
+                help_text="De datum van publicatie van de productversie.",
+                null=True,
+                verbose_name="publicatie datum",
+            ),
+        ),
+    ]
@@ -0,0 +1,26 @@
+# Generated by Django 5.2 on 2026-10-18 20:07
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("producten", "0067_alter_product_gewijzigd_op_and_more"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="productversie",
+            index=models.Index(
+                fields=["product", "-versie"], name="productversie_product_versie"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="productversie",
+            index=models.Index(
+                fields=["product", "publicatie_datum"],
+                name="productversie_product_datum",
+            ),
+        ),
+    ]
@@ -0,0 +1,97 @@
+# Generated by Django 5.2 on 2026-10-18 20:44
+
+import django.contrib.postgres.indexes
+import django.contrib.postgres.search
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("producten", "0068_productversie_indexes"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="localizedproduct",
+            name="zoekvector",
+            field=models.GeneratedField(
+                db_persist=True,
+                expression=models.Case(
+                    models.When(
+                        taal="nl",
+                        then=django.contrib.postgres.search.CombinedSearchVector(
+                            django.contrib.postgres.search.SearchVector(
+                                "product_titel_decentraal", config="dutch", weight="A"
+                            ),
+                            "||",
+                            django.contrib.postgres.search.SearchVector(
+                                "specifieke_tekst",
+                                "procedure_beschrijving",
+                                "vereisten",
+                                "bewijs",
+                                "bezwaar_en_beroep",
+                                "kosten_en_betaalmethoden",
+                                "uiterste_termijn",
+                                "wtd_bij_geen_reactie",
+                                config="dutch",
+                                weight="B",
+                            ),
+                            django.contrib.postgres.search.SearchConfig("dutch"),
+                        ),
+                    ),
+                    models.When(
+                        taal="en",
+                        then=django.contrib.postgres.search.CombinedSearchVector(
+                            django.contrib.postgres.search.SearchVector(
+                                "product_titel_decentraal", config="english", weight="A"
+                            ),
+                            "||",
+                            django.contrib.postgres.search.SearchVector(
+                                "specifieke_tekst",
+                                "procedure_beschrijving",
+                                "vereisten",
+                                "bewijs",
+                                "bezwaar_en_beroep",
+                                "kosten_en_betaalmethoden",
+                                "uiterste_termijn",
+                                "wtd_bij_geen_reactie",
+                                config="english",
+                                weight="B",
+                            ),
+                            django.contrib.postgres.search.SearchConfig("english"),
+                        ),
+                    ),
+                    default=django.contrib.postgres.search.CombinedSearchVector(
+                        django.contrib.postgres.search.SearchVector(
+                            "product_titel_decentraal", config="simple", weight="A"
+                        ),
+                        "||",
+                        django.contrib.postgres.search.SearchVector(
+                            "specifieke_tekst",
+                            "procedure_beschrijving",
+                            "vereisten",
+                            "bewijs",
+                            "bezwaar_en_beroep",
+                            "kosten_en_betaalmethoden",
+                            "uiterste_termijn",
+                            "wtd_bij_geen_reactie",
+                            config="simple",
+                            weight="B",
+                        ),
+                        django.contrib.postgres.search.SearchConfig("simple"),
+                    ),
+                    output_field=django.contrib.postgres.search.SearchVectorField(),
+                ),
+                help_text="De teksten van het product, voor het zoeken in de taal van de vertaling.",
+                output_field=django.contrib.postgres.search.SearchVectorField(),
+                verbose_name="zoekvector",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="localizedproduct",
+            index=django.contrib.postgres.indexes.GinIndex(
+                fields=["zoekvector"], name="localizedproduct_zoekvector"
+            ),
+        ),
+    ]
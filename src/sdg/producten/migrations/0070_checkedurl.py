@@ -0,0 +1,35 @@
+# Generated by Django 5.2 on 2026-10-18 22:57
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("producten", "0069_localizedproduct_zoekvector"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="CheckedUrl",
+            fields=[
+                (
+                    "id",
+                    models.AutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("url_hash", models.CharField(max_length=64, unique=True)),
+                ("url", models.TextField()),
+                ("status_code", models.PositiveSmallIntegerField()),
+                ("checked_at", models.DateTimeField()),
+                ("expires_at", models.DateTimeField(db_index=True)),
+                ("etag", models.TextField(blank=True, default="")),
+                ("last_modified", models.TextField(blank=True, default="")),
+                ("consecutive_failures", models.PositiveIntegerField(default=0)),
+            ],
+        ),
+    ]
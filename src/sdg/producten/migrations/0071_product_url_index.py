@@ -0,0 +1,72 @@
+# Generated by Django 5.2 on 2026-10-18 23:04
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("producten", "0070_checkedurl"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="ProductUrlIndex",
+            fields=[
+                (
+                    "id",
+                    models.AutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("geindexeerd_op", models.DateTimeField()),
+                (
+                    "product",
+                    models.OneToOneField(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="url_index",
+                        to="producten.product",
+                    ),
+                ),
+                (
+                    "product_versie",
+                    models.ForeignKey(
+                        null=True,
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="+",
+                        to="producten.productversie",
+                    ),
+                ),
+            ],
+        ),
+        migrations.CreateModel(
+            name="ProductUrl",
+            fields=[
+                (
+                    "id",
+                    models.AutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("field_name", models.CharField(max_length=64)),
+                ("taal", models.CharField(max_length=2)),
+                ("label", models.TextField(blank=True, default="")),
+                ("url", models.TextField()),
+                (
+                    "index",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="urls",
+                        to="producten.producturlindex",
+                    ),
+                ),
+            ],
+        ),
+    ]
@@ -0,0 +1,38 @@
+# Generated by Django 5.2 on 2026-10-18 23:18
+
+import django.db.models.functions.text
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("producten", "0071_product_url_index"),
+    ]
+
+    operations = [
+        # Keep the duplicate with the highest error count.
+        migrations.RunSQL(
+            """
+            DELETE FROM producten_brokenlinks AS duplicate
+            USING producten_brokenlinks AS broken_link
+            WHERE duplicate.product_id = broken_link.product_id
+                AND duplicate.url = broken_link.url
+                AND duplicate.occurring_field = broken_link.occurring_field
+                AND duplicate.url_label = broken_link.url_label
+                AND (duplicate.error_count, duplicate.id)
+                    < (broken_link.error_count, broken_link.id)
+            """,
+            migrations.RunSQL.noop,
+        ),
+        migrations.AddConstraint(
+            model_name="brokenlinks",
+            constraint=models.UniqueConstraint(
+                models.F("product"),
+                django.db.models.functions.text.MD5("url"),
+                django.db.models.functions.text.MD5("occurring_field"),
+                django.db.models.functions.text.MD5("url_label"),
+                name="unique_broken_link",
+            ),
+        ),
+    ]
@@ -0,0 +1,40 @@
+# Generated by Django 5.2 on 2026-10-19 09:12
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("producten", "0072_brokenlinks_unique"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="generiekproduct",
+            name="gewijzigd_op",
+            field=models.DateTimeField(
+                auto_now=True,
+                help_text="De wijzigingsdatum voor dit generieke product.",
+                verbose_name="gewijzigd op",
+            ),
+        ),
+        migrations.AddField(
+            model_name="generiekproductoverheidsorganisatierol",
+            name="gewijzigd_op",
+            field=models.DateTimeField(
+                auto_now=True,
+                help_text="De wijzigingsdatum voor deze rol.",
+                verbose_name="gewijzigd op",
+            ),
+        ),
+        migrations.AddField(
+            model_name="localizedgeneriekproduct",
+            name="gewijzigd_op",
+            field=models.DateTimeField(
+                auto_now=True,
+                help_text="De wijzigingsdatum voor deze vertaling.",
+                verbose_name="gewijzigd op",
+            ),
+        ),
+    ]
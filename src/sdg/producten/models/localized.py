@@ -1,5 +1,8 @@
 from django.contrib.postgres.fields import ArrayField
+from django.contrib.postgres.indexes import GinIndex
+from django.contrib.postgres.search import SearchVector, SearchVectorField
 from django.db import models
+from django.db.models import Case, When
 from django.utils.functional import cached_property
 from django.utils.translation import gettext_lazy as _
 
@@ -9,10 +12,11 @@ from sdg.core.models.validators import (
     validate_labeled_url,
     validate_labeled_url_with_category,
 )
+from sdg.producten.constants import ZOEK_CONFIGURATIES
 from sdg.producten.models.fields import MarkdownxField
 from sdg.producten.models.managers import (
     LocalizedGeneriekProductManager,
-    LocalizedManager,
+    LocalizedProductManager,
 )
 from sdg.producten.models.mixins import ProductFieldMixin, TaalMixin
 from sdg.producten.models.validators import validate_https
@@ -113,6 +117,11 @@ class LocalizedGeneriekProduct(ProductFieldMixin, TaalMixin, models.Model):
         blank=True,
         validators=[validate_https],
     )
+    gewijzigd_op = models.DateTimeField(
+        _("gewijzigd op"),
+        help_text=_("De wijzigingsdatum voor deze vertaling."),
+        auto_now=True,
+    )
 
     objects = LocalizedGeneriekProductManager()
 
@@ -131,6 +140,25 @@ class LocalizedGeneriekProduct(ProductFieldMixin, TaalMixin, models.Model):
         return self.product_titel
 
 
+# The markdown fields of a localized product that are part of the full-text search.
+ZOEK_VELDEN = (
+    "specifieke_tekst",
+    "procedure_beschrijving",
+    "vereisten",
+    "bewijs",
+    "bezwaar_en_beroep",
+    "kosten_en_betaalmethoden",
+    "uiterste_termijn",
+    "wtd_bij_geen_reactie",
+)
+
+
+def get_zoekvector(config):
+    return SearchVector("product_titel_decentraal", weight="A", config=config) + (
+        SearchVector(*ZOEK_VELDEN, weight="B", config=config)
+    )
+
+
 class LocalizedProduct(ProductFieldMixin, TaalMixin, models.Model):
     """
     Localized information for a product.
@@ -260,7 +288,26 @@ class LocalizedProduct(ProductFieldMixin, TaalMixin, models.Model):
         default="",
     )
 
-    objects = LocalizedManager()
+    # Generated by the database, so it is kept up to date by any kind of save
+    # or (bulk) update.
+    zoekvector = models.GeneratedField(
+        expression=Case(
+            *(
+                When(taal=taal, then=get_zoekvector(config))
+                for taal, config in ZOEK_CONFIGURATIES.items()
+            ),
+            default=get_zoekvector("simple"),
+            output_field=SearchVectorField(),
+        ),
+        output_field=SearchVectorField(),
+        db_persist=True,
+        verbose_name=_("zoekvector"),
+        help_text=_(
+            "De teksten van het product, voor het zoeken in de taal van de vertaling."
+        ),
+    )
+
+    objects = LocalizedProductManager()
 
     @cached_property
     def referentie_informatie(self):
@@ -288,9 +335,7 @@ class LocalizedProduct(ProductFieldMixin, TaalMixin, models.Model):
             LocalizedProduct.objects.bulk_localize(
                 instances=(
                     most_recent_version
-                    for p in product.specifieke_producten.all().prefetch_related(
-                        "versies"
-                    )
+                    for p in product.specifieke_producten.most_recent(vertalingen=False)
                     if (most_recent_version := p.most_recent_version)
                 ),
                 languages=[self.taal],
@@ -306,6 +351,7 @@ class LocalizedProduct(ProductFieldMixin, TaalMixin, models.Model):
                 name="unique_language_per_productversie",
             )
         ]
+        indexes = [GinIndex(fields=["zoekvector"], name="localizedproduct_zoekvector")]
 
     def __str__(self):
         return self.product_titel_decentraal
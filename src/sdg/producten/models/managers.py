@@ -1,15 +1,36 @@
 from datetime import date
 
 from django.conf import settings
+from django.contrib.postgres.search import SearchQuery
 from django.db import models
-from django.db.models import Exists, F, Max, OuterRef, Prefetch, Q, Subquery
+from django.db.models import (
+    Case,
+    DateTimeField,
+    Exists,
+    F,
+    Max,
+    OuterRef,
+    Prefetch,
+    Q,
+    Value,
+    When,
+)
+from django.db.models.functions import Cast, Greatest
 from django.utils.timezone import now
 
-from sdg.core.constants import GenericProductStatus
+from sdg.core.constants import GenericProductStatus, ProductWijzigingChoices
+from sdg.core.db.expressions import max_subquery
+from sdg.producten.constants import ZOEK_CONFIGURATIES
 
 
 class ProductQuerySet(models.QuerySet):
-    def active(self, active_on=None, exclude_inactive_products=False):
+    def active(
+        self,
+        active_on=None,
+        exclude_inactive_products=False,
+        taal=None,
+        vertalingen=True,
+    ):
         """
         An active product is a product with its product version and its
         translations as it was most recently published.
@@ -22,19 +43,24 @@ class ProductQuerySet(models.QuerySet):
         prefetched translations. The prefetched active version is available
         via `Product.active_version` and is always a list, containing 0 or 1
         `ProductVersie`.
+
+        If `taal` is given, only the translations in that language are
+        prefetched. If `vertalingen` is false, the translations are not
+        prefetched at all.
         """
-        from sdg.producten.models import ProductVersie
+        from sdg.producten.models import LocalizedProduct, ProductVersie
 
         if active_on is None:
             active_on = date.today()
 
-        subquery = Subquery(
-            ProductVersie.objects.exclude(publicatie_datum=None)
-            .filter(publicatie_datum__lte=active_on)
-            .filter(product=OuterRef("product"))
-            .order_by("-versie")
-            .values_list("pk", flat=True)[:1]
-        )
+        versies = ProductVersie.objects.active(active_on)
+        if vertalingen:
+            localized_products = LocalizedProduct.objects.all()
+            if taal:
+                localized_products = localized_products.filter(taal=taal)
+            versies = versies.prefetch_related(
+                Prefetch("vertalingen", queryset=localized_products)
+            )
 
         queryset = self
 
@@ -52,13 +78,7 @@ class ProductQuerySet(models.QuerySet):
         # Second, make sure we prefetch the correct active version for
         # performance.
         return queryset.prefetch_related(
-            Prefetch(
-                "versies",
-                to_attr="_active_version",
-                queryset=ProductVersie.objects.filter(pk__in=subquery).prefetch_related(
-                    "vertalingen"
-                ),
-            )
+            Prefetch("versies", to_attr="_active_version", queryset=versies)
         )
 
     def active_organization(self):
@@ -70,7 +90,7 @@ class ProductQuerySet(models.QuerySet):
             | Q(catalogus__lokale_overheid__organisatie__owms_end_date__isnull=True)
         )
 
-    def most_recent(self):
+    def most_recent(self, taal=None, vertalingen=True):
         """
         The most recent product is the product that was last published
         (including future publications) or a concept.
@@ -80,23 +100,122 @@ class ProductQuerySet(models.QuerySet):
         prefetched most recent version is available via
         `Product._most_recent_version` and is always a list, containing 0 or 1
         `ProductVersie`.
+
+        If `taal` is given, only the translations in that language are
+        prefetched. If `vertalingen` is false, the translations are not
+        prefetched at all.
         """
+        from sdg.producten.models import (
+            LocalizedGeneriekProduct,
+            LocalizedProduct,
+            ProductVersie,
+        )
+
+        versies = ProductVersie.objects.most_recent()
+        if vertalingen:
+            localized_products = LocalizedProduct.objects.all()
+            generieke_vertalingen = LocalizedGeneriekProduct.objects.all()
+            if taal:
+                localized_products = localized_products.filter(taal=taal)
+                generieke_vertalingen = generieke_vertalingen.filter(taal=taal)
+            versies = versies.prefetch_related(
+                Prefetch("vertalingen", queryset=localized_products),
+                Prefetch(
+                    "product__generiek_product__vertalingen",
+                    queryset=generieke_vertalingen,
+                ),
+            )
+
+        return self.prefetch_related(
+            Prefetch("versies", to_attr="_most_recent_version", queryset=versies)
+        )
+
+    def changed_since(self, since):
+        """
+        Return the products that changed after the given ``since`` datetime.
+
+        Each product is annotated with the moment of its last change
+        (`wijziging_op`) and the kind of change (`wijziging_soort`). Besides
+        modifications of the product, its published versions and its
+        locations, this includes the moment a version became active (its
+        publication date) and the moment the organization ended. Concept
+        versions are not visible, their changes are ignored.
+
+        The products of organizations that ended on or before ``since`` are
+        left out, their end was reported before.
+        """
+        from sdg.organisaties.models import Lokatie
         from sdg.producten.models import ProductVersie
 
-        subquery = Subquery(
-            ProductVersie.objects.filter(product=OuterRef("product"))
-            .order_by("-versie")
-            .values_list("pk", flat=True)[:1]
+        today = date.today()
+        current_time = now()
+        end_date = "catalogus__lokale_overheid__organisatie__owms_end_date"
+        versies = ProductVersie.objects.published()
+
+        # Only the products with a change are annotated, the candidates are
+        # determined using the indexes on the timestamps.
+        queryset = self.exclude(**{f"{end_date}__lte": since}).filter(
+            Q(gewijzigd_op__gt=since)
+            | Q(pk__in=versies.filter(gewijzigd_op__gt=since).values("product"))
+            | Q(
+                pk__in=versies.filter(
+                    publicatie_datum__gt=since.date(), publicatie_datum__lte=today
+                ).values("product")
+            )
+            | Q(
+                pk__in=Lokatie.objects.filter(gewijzigd_op__gt=since).values(
+                    "producten"
+                )
+            )
+            | Q(**{f"{end_date}__gt": since, f"{end_date}__lte": current_time})
+        )
+
+        queryset = queryset.annotate(
+            _versie_gewijzigd_op=max_subquery(
+                versies.filter(product=OuterRef("pk")), "gewijzigd_op"
+            ),
+            _gepubliceerd_op=Cast(
+                max_subquery(
+                    versies.filter(product=OuterRef("pk"), publicatie_datum__lte=today),
+                    "publicatie_datum",
+                ),
+                output_field=DateTimeField(),
+            ),
+            _opgeheven_op=Case(
+                When(**{f"{end_date}__lte": current_time}, then=F(end_date)),
+            ),
+            _locatie_gewijzigd_op=max_subquery(
+                Lokatie.objects.filter(producten=OuterRef("pk")), "gewijzigd_op"
+            ),
+        ).annotate(
+            wijziging_op=Greatest(
+                "gewijzigd_op",
+                "_versie_gewijzigd_op",
+                "_gepubliceerd_op",
+                "_opgeheven_op",
+                "_locatie_gewijzigd_op",
+            ),
         )
 
-        return self.prefetch_related(
-            Prefetch(
-                "versies",
-                to_attr="_most_recent_version",
-                queryset=ProductVersie.objects.filter(pk__in=subquery).prefetch_related(
-                    "vertalingen",
-                    "product__generiek_product__vertalingen",
+        return queryset.filter(wijziging_op__gt=since).annotate(
+            wijziging_soort=Case(
+                When(
+                    api_verborgen=True,
+                    then=Value(ProductWijzigingChoices.verborgen),
                 ),
+                When(
+                    _opgeheven_op__isnull=False,
+                    then=Value(ProductWijzigingChoices.organisatie_opgeheven),
+                ),
+                When(
+                    _gepubliceerd_op=F("wijziging_op"),
+                    then=Value(ProductWijzigingChoices.publicatie),
+                ),
+                When(
+                    _versie_gewijzigd_op=F("wijziging_op"),
+                    then=Value(ProductWijzigingChoices.nieuwe_versie),
+                ),
+                default=Value(ProductWijzigingChoices.gewijzigd),
             )
         )
 
@@ -110,6 +229,29 @@ class ProductQuerySet(models.QuerySet):
             _name=F("generiek_product__upn__upn_label"),
         )
 
+    def search(self, query, taal=None, versies=None):
+        """
+        Filter the products with a version of which the texts match the
+        (web search syntax) `query`. See `LocalizedProductManager.search`.
+
+        If `versies` (a `ProductVersie` queryset, e.g.
+        `ProductVersie.objects.active()`) is given, only the texts of the
+        version of each product in `versies` are searched.
+        """
+        from sdg.producten.models import LocalizedProduct
+
+        translations = LocalizedProduct.objects.search(query, taal=taal).filter(
+            product_versie__product=OuterRef("pk")
+        )
+        if versies is not None:
+            translations = translations.filter(
+                product_versie__in=versies.filter(
+                    product=OuterRef(OuterRef("pk"))
+                ).values("pk")
+            )
+
+        return self.filter(Exists(translations))
+
     def annotate_latest_publication_date(self):
         return self.annotate(_latest_publication_date=Max("versies__publicatie_datum"))
 
@@ -166,6 +308,24 @@ class ProductVersieQuerySet(models.QuerySet):
         """
         return self.exclude(publicatie_datum=None)
 
+    def active(self, active_on=None):
+        """
+        Returns the version of each product that is active on the given
+        `active_on` date (today by default): the most recent published version
+        with a publication date on or before `active_on`.
+        """
+        if active_on is None:
+            active_on = date.today()
+
+        return self.published().filter(publicatie_datum__lte=active_on).most_recent()
+
+    def most_recent(self):
+        """
+        Returns the most recent version (the highest version number) of each
+        product, in a single `DISTINCT ON` query.
+        """
+        return self.order_by("product_id", "-versie").distinct("product_id")
+
 
 class LocalizedManager(models.Manager):
     def localize(self, instance, languages, **kwargs):
@@ -192,6 +352,30 @@ class LocalizedManager(models.Manager):
         return self.bulk_create(create_list, ignore_conflicts=True)
 
 
+class LocalizedProductManager(LocalizedManager):
+    def search(self, query, taal=None):
+        """
+        Return the translations of which the texts match the (web search
+        syntax) `query`, using the text search configuration of the language
+        of each translation.
+
+        If `taal` is given, only the translations in that language are
+        searched.
+        """
+        condition = Q()
+        for language, config in ZOEK_CONFIGURATIES.items():
+            if taal and language != taal:
+                continue
+            condition |= Q(
+                taal=language,
+                zoekvector=SearchQuery(query, config=config, search_type="websearch"),
+            )
+
+        if not condition:
+            return self.none()
+        return self.filter(condition)
+
+
 class LocalizedGeneriekProductManager(LocalizedManager):
     def sdg(self, org_type=None):
         from sdg.core.models import UniformeProductnaam
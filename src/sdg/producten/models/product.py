@@ -1,6 +1,7 @@
 from __future__ import annotations
 
 import datetime
+import hashlib
 import uuid
 from functools import partialmethod
 from typing import Any
@@ -9,6 +10,7 @@ from django.contrib.auth import get_user_model
 from django.core.exceptions import ValidationError
 from django.db import models
 from django.db.models import BooleanField, Case, Q, Value, When
+from django.db.models.functions import MD5
 from django.template.loader import render_to_string
 from django.urls import reverse
 from django.utils.functional import cached_property
@@ -43,6 +45,11 @@ class GeneriekProductOverheidsorganisatieRol(models.Model):
         "core.Overheidsorganisatie", on_delete=models.CASCADE
     )
     rol = models.CharField(_("rol"), max_length=100, blank=True)
+    gewijzigd_op = models.DateTimeField(
+        _("gewijzigd op"),
+        help_text=_("De wijzigingsdatum voor deze rol."),
+        auto_now=True,
+    )
 
 
 class GeneriekProduct(models.Model):
@@ -94,6 +101,11 @@ class GeneriekProduct(models.Model):
         choices=GenericProductStatus.choices,
         default=GenericProductStatus.NEW,
     )
+    gewijzigd_op = models.DateTimeField(
+        _("gewijzigd op"),
+        help_text=_("De wijzigingsdatum voor dit generieke product."),
+        auto_now=True,
+    )
 
     objects = GeneriekProductQuerySet.as_manager()
 
@@ -224,6 +236,12 @@ class Product(ProductFieldMixin, models.Model):
         help_text=_("Verbergen voor Nationale Portalen."),
         default=False,
     )
+    gewijzigd_op = models.DateTimeField(
+        _("gewijzigd op"),
+        help_text=_("De wijzigingsdatum voor dit product."),
+        auto_now=True,
+        db_index=True,
+    )
 
     automatisch_doordrukken = models.BooleanField(
         _("Product teksten automatisch doordrukken"),
@@ -440,6 +458,7 @@ class ProductVersie(ProductFieldMixin, models.Model):
         help_text=_("De datum van publicatie van de productversie."),
         blank=True,
         null=True,
+        db_index=True,
     )
     gemaakt_op = models.DateTimeField(
         _("gemaakt op"),
@@ -450,6 +469,7 @@ class ProductVersie(ProductFieldMixin, models.Model):
         _("gewijzigd op"),
         help_text=_("De wijzigingsdatum voor deze productversie."),
         auto_now=True,
+        db_index=True,
     )
 
     bewerkte_velden = models.JSONField(
@@ -472,6 +492,17 @@ class ProductVersie(ProductFieldMixin, models.Model):
         verbose_name_plural = _("product versies")
         ordering = ("-gewijzigd_op",)
         unique_together = (("versie", "product"),)
+        indexes = [
+            # Used to determine the most recent and the active version of each
+            # product, see `ProductVersieQuerySet`.
+            models.Index(
+                fields=["product", "-versie"], name="productversie_product_versie"
+            ),
+            models.Index(
+                fields=["product", "publicatie_datum"],
+                name="productversie_product_datum",
+            ),
+        ]
 
     def __str__(self):
         return self.get_pretty_name()
@@ -590,6 +621,18 @@ class BrokenLinks(models.Model):
     occurring_field = models.TextField(default="")
     url_label = models.TextField(default="")
 
+    class Meta:
+        constraints = [
+            # The texts can be too long for an index, so their hashes are used.
+            models.UniqueConstraint(
+                models.F("product"),
+                MD5("url"),
+                MD5("occurring_field"),
+                MD5("url_label"),
+                name="unique_broken_link",
+            ),
+        ]
+
     def increment_error_count(self):
         self.error_count += 1
         self.save()
@@ -597,3 +640,80 @@ class BrokenLinks(models.Model):
     def reset_error_count(self):
         self.error_count = 0
         self.save()
+
+
+class CheckedUrl(models.Model):
+    """
+    Checked URL
+
+    The result of the last check of a url by the broken link checker. The
+    result is reused until it expires, and the validators of the response are
+    used to revalidate the url with a conditional request.
+    """
+
+    url_hash = models.CharField(max_length=64, unique=True)
+    url = models.TextField()
+    status_code = models.PositiveSmallIntegerField()
+    checked_at = models.DateTimeField()
+    expires_at = models.DateTimeField(db_index=True)
+    etag = models.TextField(blank=True, default="")
+    last_modified = models.TextField(blank=True, default="")
+    consecutive_failures = models.PositiveIntegerField(default=0)
+
+    def __str__(self):
+        return f"{self.url} ({self.status_code})"
+
+    @staticmethod
+    def hash_url(url: str) -> str:
+        return hashlib.sha256(url.encode()).hexdigest()
+
+    def get_conditional_headers(self) -> dict:
+        headers = {}
+        if self.etag:
+            headers["If-None-Match"] = self.etag
+        if self.last_modified:
+            headers["If-Modified-Since"] = self.last_modified
+        return headers
+
+
+class ProductUrlIndex(models.Model):
+    """
+    Product URL index
+
+    The urls in the most recent version of a product, which are extracted again
+    when the product has a new version or the version or one of its
+    translations changed after it was indexed.
+    """
+
+    product = models.OneToOneField(
+        Product, on_delete=models.CASCADE, related_name="url_index"
+    )
+    product_versie = models.ForeignKey(
+        ProductVersie,
+        null=True,
+        on_delete=models.CASCADE,
+        related_name="+",
+    )
+    geindexeerd_op = models.DateTimeField()
+
+    def __str__(self):
+        return f"{self.product} ({self.geindexeerd_op})"
+
+
+class ProductUrl(models.Model):
+    """
+    Product URL
+
+    A url in a field of a translation of the most recent version of a product.
+    """
+
+    index = models.ForeignKey(
+        ProductUrlIndex, on_delete=models.CASCADE, related_name="urls"
+    )
+    field_name = models.CharField(max_length=64)
+    taal = models.CharField(max_length=2)
+    label = models.TextField(blank=True, default="")
+    url = models.TextField()
+
+    def __str__(self):
+        return self.url
@@ -1,10 +1,8 @@
-from html.parser import HTMLParser
-
 from django.core.exceptions import ValidationError
 from django.core.validators import RegexValidator, _lazy_re_compile
 from django.utils.translation import gettext_lazy as _
 
-import markdown
+from sdg.producten.markdown_inspection import inspect_markdown
 
 SIMPLE_HTML_REGEX = _lazy_re_compile(
     r"""<[A-Za-z\s="']+?>.*?<\/[A-Za-z\s="']+?>|<[A-Za-z\s="']+?\/>"""
@@ -20,12 +18,7 @@ HTML_TAGS_TO_TEXT = {
 }
 
 
-class AllowedMarkdownValidator(HTMLParser):
-    prohibited_html_tags = ["h1", "h2", "h5", "h6", "hr", "img", "code"]
-
-    def handle_starttag(self, tag, attr):
-        if tag in self.prohibited_html_tags:
-            self.data = tag
+PROHIBITED_MARKDOWN_TAGS = ["h1", "h2", "h5", "h6", "hr", "img", "code"]
 
 
 no_html_validator = RegexValidator(
@@ -47,15 +40,15 @@ def validate_markdown(value):
     - `h1`, `h2`, `h5`, `h6`, `hr`, `img`, `code`
     """
 
-    html_text = markdown.markdown(value)
-
-    parser = AllowedMarkdownValidator()
-    parser.feed(html_text)
+    prohibited_tags = [
+        tag for tag in inspect_markdown(value).tags if tag in PROHIBITED_MARKDOWN_TAGS
+    ]
 
-    if hasattr(parser, "data"):
+    if prohibited_tags:
+        # The last prohibited element is reported.
         raise ValidationError(
             _("Het veld mag geen '{html_element}' in Markdown bevatten.").format(
-                html_element=str(HTML_TAGS_TO_TEXT[parser.data])
+                html_element=str(HTML_TAGS_TO_TEXT[prohibited_tags[-1]])
             )
         )
 
@@ -105,6 +105,7 @@ class SpecifiekProductVersieFactory(ProductVersieFactory):
 
 class BrokenLinksFactory(DjangoModelFactory):
     product = factory.SubFactory(ProductFactory)
+    url = factory.Sequence(lambda n: f"https://example.com/{n}")
 
     class Meta:
         model = BrokenLinks
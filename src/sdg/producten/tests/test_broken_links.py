@@ -1,4 +1,4 @@
-from datetime import datetime
+from datetime import datetime, timedelta
 
 from django.test import TestCase
 
@@ -8,8 +8,16 @@ from freezegun import freeze_time
 from sdg.core.constants import TaalChoices
 
 from ...core.models import LocalizedProductFieldConfiguration, ProductFieldConfiguration
-from ..broken_links import check_broken_links, get_product_urls, reset_broken_links
-from ..models import BrokenLinks, Product
+from ..broken_links import (
+    check_broken_links,
+    check_urls_with_store,
+    get_indexed_product_urls,
+    get_product_urls,
+    reset_broken_links,
+    save_broken_links,
+    update_url_index,
+)
+from ..models import BrokenLinks, CheckedUrl, Product, ProductUrl
 from .constants import FUTURE_DATE, NOW_DATE
 from .factories.localized import LocalizedProductFactory
 from .factories.product import (
@@ -45,9 +53,7 @@ class GetProductUrlsTestCase(TestCase):
             decentrale_procedure_link="https://example.com/product/decentrale_procedure_link",
         )
 
-        products = Product.objects.prefetch_related(
-            "most_recent_version__vertalingen"
-        ).exclude_generic_status()
+        products = Product.objects.most_recent().exclude_generic_status()
         product_urls = get_product_urls(products)
 
         # specifieke_tekst
@@ -123,9 +129,7 @@ class GetProductUrlsTestCase(TestCase):
             decentrale_procedure_link="https://example.com/product/decentrale_procedure_link",
         )
 
-        products = Product.objects.prefetch_related(
-            "most_recent_version__vertalingen"
-        ).exclude_generic_status()
+        products = Product.objects.most_recent().exclude_generic_status()
         product_urls = get_product_urls(products)
 
         # specifieke_tekst
@@ -197,9 +201,7 @@ class GetProductUrlsTestCase(TestCase):
             decentrale_procedure_link="https:example.",
         )
 
-        products = Product.objects.prefetch_related(
-            "most_recent_version__vertalingen"
-        ).exclude_generic_status()
+        products = Product.objects.most_recent().exclude_generic_status()
         product_urls = get_product_urls(products)
         # specifieke_tekst
         self.assertEqual(product_urls, {})
@@ -337,6 +339,81 @@ class CheckBrokenLinksTestCase(TestCase):
         self.assertFalse(BrokenLinks.objects.filter(pk=broken_link.pk).exists())
 
 
+@freeze_time(NOW_DATE)
+class SaveBrokenLinksTestCase(TestCase):
+    def setUp(self):
+        super().setUp()
+
+        self.product = SpecifiekProductFactory.create(
+            referentie_product=None, generiek_product=GeneriekProductFactory.create()
+        )
+
+    def test_save_broken_links(self):
+        still_broken = BrokenLinksFactory.create(
+            product=self.product,
+            url="https://example.com/1",
+            occurring_field="bewijs (nl)",
+            url_label="label",
+            error_count=2,
+        )
+        fixed = BrokenLinksFactory.create(product=self.product, error_count=5)
+
+        deleted = save_broken_links(
+            [
+                (self.product.pk, "https://example.com/1", "bewijs (nl)", "label"),
+                (self.product.pk, "https://example.com/2", "bewijs (nl)", "label"),
+                # The same link in the same field is counted once.
+                (self.product.pk, "https://example.com/2", "bewijs (nl)", "label"),
+                (self.product.pk, "https://example.com/2", "kosten (nl)", "label"),
+            ]
+        )
+
+        self.assertEqual(deleted, 1)
+        self.assertFalse(BrokenLinks.objects.filter(pk=fixed.pk).exists())
+        self.assertEqual(
+            set(
+                BrokenLinks.objects.values_list("url", "occurring_field", "error_count")
+            ),
+            {
+                ("https://example.com/1", "bewijs (nl)", 3),
+                ("https://example.com/2", "bewijs (nl)", 1),
+                ("https://example.com/2", "kosten (nl)", 1),
+            },
+        )
+        still_broken.refresh_from_db()
+        self.assertEqual(still_broken.error_count, 3)
+
+    def test_no_broken_links(self):
+        BrokenLinksFactory.create_batch(3, product=self.product)
+
+        self.assertEqual(save_broken_links([]), 3)
+        self.assertFalse(BrokenLinks.objects.exists())
+
+    def test_number_of_queries_does_not_depend_on_the_number_of_links(self):
+        links = [
+            (self.product.pk, f"https://example.com/{index}", "bewijs (nl)", "label")
+            for index in range(100)
+        ]
+        BrokenLinksFactory.create_batch(100, product=self.product)
+
+        with self.assertNumQueries(4):
+            save_broken_links(links)
+        with self.assertNumQueries(4):
+            save_broken_links(links)
+
+        self.assertEqual(
+            set(BrokenLinks.objects.values_list("error_count", flat=True)), {2}
+        )
+
+    def test_deleted_products_are_skipped(self):
+        deleted = save_broken_links(
+            [(self.product.pk + 1, "https://example.com", "bewijs (nl)", "label")]
+        )
+
+        self.assertEqual(deleted, 0)
+        self.assertFalse(BrokenLinks.objects.exists())
+
+
 class ResetBrokenLinksTestCase(TestCase):
     def test_reset_links(self):
         assert BrokenLinks.objects.count() == 0
@@ -374,3 +451,196 @@ class ResetBrokenLinksTestCase(TestCase):
 
         self.assertEqual(BrokenLinks.objects.count(), 2)
         self.assertFalse(BrokenLinks.objects.filter(pk=link3.pk).exists())
+
+
+@freeze_time(NOW_DATE)
+@requests_mock.Mocker()
+class CheckUrlsWithStoreTestCase(TestCase):
+    url = "https://example.com/page"
+
+    def test_checked_url_is_stored(self, m):
+        m.get(self.url, status_code=200, headers={"ETag": '"abc"'})
+
+        self.assertEqual(check_urls_with_store([self.url]), {self.url: 200})
+
+        checked_url = CheckedUrl.objects.get()
+        self.assertEqual(checked_url.url, self.url)
+        self.assertEqual(checked_url.status_code, 200)
+        self.assertEqual(checked_url.etag, '"abc"')
+        self.assertEqual(checked_url.consecutive_failures, 0)
+        self.assertEqual(
+            checked_url.expires_at, checked_url.checked_at + timedelta(days=7)
+        )
+
+    def test_stored_status_is_reused_until_it_expires(self, m):
+        m.get(self.url, status_code=200)
+        check_urls_with_store([self.url])
+
+        with freeze_time(NOW_DATE + timedelta(days=6)):
+            self.assertEqual(check_urls_with_store([self.url]), {self.url: 200})
+        self.assertEqual(m.call_count, 1)
+
+        with freeze_time(NOW_DATE + timedelta(days=7)):
+            check_urls_with_store([self.url])
+        self.assertEqual(m.call_count, 2)
+
+    def test_force(self, m):
+        m.get(self.url, status_code=200)
+        check_urls_with_store([self.url])
+
+        check_urls_with_store([self.url], force=True)
+
+        self.assertEqual(m.call_count, 2)
+
+    def test_revalidation(self, m):
+        m.get(
+            self.url,
+            status_code=200,
+            headers={"ETag": '"abc"', "Last-Modified": "Mon, 1 Jan 2024 00:00:00 GMT"},
+        )
+        check_urls_with_store([self.url])
+
+        m.get(self.url, status_code=304)
+        with freeze_time(NOW_DATE + timedelta(days=8)):
+            self.assertEqual(check_urls_with_store([self.url]), {self.url: 200})
+
+        headers = m.last_request.headers
+        self.assertEqual(headers["If-None-Match"], '"abc"')
+        self.assertEqual(headers["If-Modified-Since"], "Mon, 1 Jan 2024 00:00:00 GMT")
+
+        checked_url = CheckedUrl.objects.get()
+        self.assertEqual(checked_url.status_code, 200)
+        self.assertEqual(checked_url.etag, '"abc"')
+        self.assertEqual(checked_url.checked_at.date(), NOW_DATE + timedelta(days=8))
+
+    def test_failures(self, m):
+        m.get(self.url, status_code=404, headers={"ETag": '"abc"'})
+        check_urls_with_store([self.url])
+
+        with freeze_time(NOW_DATE + timedelta(days=1)):
+            self.assertEqual(check_urls_with_store([self.url]), {self.url: 420})
+
+        checked_url = CheckedUrl.objects.get()
+        self.assertEqual(checked_url.consecutive_failures, 2)
+        self.assertEqual(checked_url.etag, "")
+        self.assertEqual(
+            checked_url.expires_at, checked_url.checked_at + timedelta(hours=1)
+        )
+
+        m.get(self.url, status_code=200)
+        with freeze_time(NOW_DATE + timedelta(days=2)):
+            check_urls_with_store([self.url])
+
+        checked_url.refresh_from_db()
+        self.assertEqual(checked_url.consecutive_failures, 0)
+
+    def test_removed_urls_are_deleted(self, m):
+        m.get(requests_mock.ANY, status_code=200)
+        check_urls_with_store([self.url, "https://example.com/other"])
+
+        check_urls_with_store(["https://example.com/other"])
+
+        self.assertEqual(
+            list(CheckedUrl.objects.values_list("url", flat=True)),
+            ["https://example.com/other"],
+        )
+
+    def test_error_count_is_incremented_every_run(self, m):
+        m.get(self.url, status_code=404)
+        product = SpecifiekProductFactory.create(
+            referentie_product=None, generiek_product=GeneriekProductFactory.create()
+        )
+        product_versie = ProductVersieFactory.create(
+            product=product, publicatie_datum=FUTURE_DATE, versie=1
+        )
+        LocalizedProductFactory.create(
+            taal=TaalChoices.nl,
+            product_versie=product_versie,
+            specifieke_tekst=f"Dummy text with a [broken url]({self.url}).",
+            verwijzing_links=[],
+            decentrale_procedure_label="",
+            decentrale_procedure_link="",
+        )
+
+        check_broken_links()
+        check_broken_links()
+
+        self.assertEqual(BrokenLinks.objects.get().error_count, 2)
+        self.assertEqual(m.call_count, 1)
+
+
+@freeze_time(NOW_DATE)
+class UrlIndexTestCase(TestCase):
+    def setUp(self):
+        super().setUp()
+
+        product = SpecifiekProductFactory.create(
+            referentie_product=None, generiek_product=GeneriekProductFactory.create()
+        )
+        self.product_versie = ProductVersieFactory.create(
+            product=product, publicatie_datum=FUTURE_DATE, versie=1
+        )
+        self.localized_product = LocalizedProductFactory.create(
+            taal=TaalChoices.nl,
+            product_versie=self.product_versie,
+            specifieke_tekst="Dummy text with a [valid url](https://example.com/specifieke_tekst).",
+            verwijzing_links=[["label1", "https://example.com/verwijzing_links/1"]],
+            decentrale_procedure_label="label",
+            decentrale_procedure_link="https://example.com/decentrale_procedure_link",
+        )
+        self.products = Product.objects.exclude_generic_status()
+
+    def test_same_urls_as_get_product_urls(self):
+        expected = get_product_urls(self.products.most_recent())
+
+        self.assertEqual(get_indexed_product_urls(self.products), expected)
+        self.assertEqual(len(expected[self.product_versie.product_id]), 3)
+
+    def test_unchanged_products_are_not_indexed_again(self):
+        self.assertEqual(update_url_index(self.products), 1)
+
+        with freeze_time(NOW_DATE + timedelta(days=1)):
+            with self.assertNumQueries(3):
+                self.assertEqual(update_url_index(self.products), 0)
+
+    def test_changed_translation_is_indexed(self):
+        update_url_index(self.products)
+
+        with freeze_time(NOW_DATE + timedelta(days=1)):
+            self.localized_product.specifieke_tekst = (
+                "[Other url](https://example.com/other)"
+            )
+            self.localized_product.save()
+
+            self.assertEqual(update_url_index(self.products), 1)
+
+        self.assertEqual(
+            set(ProductUrl.objects.values_list("field_name", "url")),
+            {
+                ("specifieke_tekst", "https://example.com/other"),
+                ("verwijzing_links", "https://example.com/verwijzing_links/1"),
+                (
+                    "decentrale_procedure_link",
+                    "https://example.com/decentrale_procedure_link",
+                ),
+            },
+        )
+
+    def test_new_version_is_indexed(self):
+        update_url_index(self.products)
+
+        product_versie = ProductVersieFactory.create(
+            product=self.product_versie.product, publicatie_datum=None, versie=2
+        )
+        LocalizedProductFactory.create(
+            taal=TaalChoices.nl,
+            product_versie=product_versie,
+            specifieke_tekst="",
+            verwijzing_links=[],
+            decentrale_procedure_label="",
+            decentrale_procedure_link="",
+        )
+
+        self.assertEqual(update_url_index(self.products), 1)
+        self.assertEqual(ProductUrl.objects.count(), 0)
+        self.assertEqual(update_url_index(self.products), 0)
@@ -33,6 +33,20 @@ class TestCheckBrokenLinksCommandTestCase(TestCase):
         out = self.call_command("check_broken_links")
         self.assertIn("Deleted 0 old BrokenLink(s).", out)
 
+    def test_asyncio_engine(self):
+        out = self.call_command(
+            "check_broken_links",
+            "--engine",
+            "asyncio",
+            "--concurrency",
+            "8",
+            verbosity=2,
+        )
+
+        self.assertIn("Checked 0 url(s)", out)
+        self.assertIn("asyncio", out)
+        self.assertIn("Deleted 0 old BrokenLink(s).", out)
+
     def test_reset_all_broken_links(self):
         out = self.call_command("check_broken_links", "--reset")
         self.assertIn(
@@ -0,0 +1,189 @@
+import asyncio
+import threading
+
+from django.test import SimpleTestCase
+
+from aiohttp import web
+
+from ..link_checker import AsyncLinkChecker
+
+
+def create_app(requests: list, in_flight: dict):
+    async def ok(request):
+        return web.Response(text="x" * 500)
+
+    async def small(request):
+        return web.Response(text="Hello")
+
+    async def soft_404(request):
+        return web.Response(text="Page not found")
+
+    async def not_found(request):
+        return web.Response(status=404)
+
+    async def gone(request):
+        return web.Response(status=410)
+
+    async def forbidden(request):
+        return web.Response(status=403)
+
+    async def unavailable(request):
+        return web.Response(status=503)
+
+    async def no_head(request):
+        if request.method == "HEAD":
+            return web.Response(status=405)
+        return web.Response(text="x" * 500)
+
+    async def slow(request):
+        in_flight["current"] += 1
+        in_flight["max"] = max(in_flight["max"], in_flight["current"])
+        await asyncio.sleep(0.01)
+        in_flight["current"] -= 1
+        return web.Response(text="x" * 500)
+
+    async def etag(request):
+        if request.headers.get("If-None-Match") == '"abc"':
+            return web.Response(status=304)
+        return web.Response(text="x" * 500, headers={"ETag": '"abc"'})
+
+    async def redirect(request):
+        raise web.HTTPFound("/ok")
+
+    @web.middleware
+    async def log_requests(request, handler):
+        requests.append((request.method, request.path, request.headers.get("Range")))
+        return await handler(request)
+
+    app = web.Application(middlewares=[log_requests])
+    app.router.add_route("*", "/ok", ok)
+    app.router.add_route("*", "/small", small)
+    app.router.add_route("*", "/soft-404", soft_404)
+    app.router.add_route("*", "/not-found", not_found)
+    app.router.add_route("*", "/gone", gone)
+    app.router.add_route("*", "/forbidden", forbidden)
+    app.router.add_route("*", "/unavailable", unavailable)
+    app.router.add_route("*", "/no-head", no_head)
+    app.router.add_route("*", "/redirect", redirect)
+    app.router.add_route("*", "/slow", slow)
+    app.router.add_route("*", "/etag", etag)
+    return app
+
+
+class AsyncLinkCheckerTests(SimpleTestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+
+        cls.requests = []
+        cls.in_flight = {"current": 0, "max": 0}
+        cls.loop = asyncio.new_event_loop()
+        cls.runner = web.AppRunner(create_app(cls.requests, cls.in_flight))
+        cls.loop.run_until_complete(cls.runner.setup())
+        site = web.TCPSite(cls.runner, "127.0.0.1", 0)
+        cls.loop.run_until_complete(site.start())
+        cls.base_url = "http://127.0.0.1:%d" % site._server.sockets[0].getsockname()[1]
+
+        cls.thread = threading.Thread(target=cls.loop.run_forever, daemon=True)
+        cls.thread.start()
+
+    @classmethod
+    def tearDownClass(cls):
+        asyncio.run_coroutine_threadsafe(cls.runner.cleanup(), cls.loop).result()
+        cls.loop.call_soon_threadsafe(cls.loop.stop)
+        cls.thread.join()
+        cls.loop.close()
+
+        super().tearDownClass()
+
+    def setUp(self):
+        super().setUp()
+
+        self.requests.clear()
+        self.checker = AsyncLinkChecker(backoff_factor=0)
+
+    def check(self, path):
+        url = f"{self.base_url}{path}"
+        return self.checker.check_urls([url])[url]["status_code"]
+
+    def test_head_request(self):
+        self.assertEqual(self.check("/ok"), 200)
+        self.assertEqual(self.requests, [("HEAD", "/ok", None)])
+
+    def test_small_content_is_requested(self):
+        self.assertEqual(self.check("/small"), 200)
+        self.assertEqual(
+            self.requests, [("HEAD", "/small", None), ("GET", "/small", "bytes=0-99")]
+        )
+
+    def test_soft_404(self):
+        self.assertEqual(self.check("/soft-404"), 404)
+
+    def test_not_found(self):
+        self.assertEqual(self.check("/not-found"), 404)
+
+    def test_gone(self):
+        self.assertEqual(self.check("/gone"), 420)
+
+    def test_forbidden(self):
+        self.assertEqual(self.check("/forbidden"), 420)
+
+    def test_head_not_allowed(self):
+        self.assertEqual(self.check("/no-head"), 200)
+        self.assertEqual(
+            self.requests,
+            [("HEAD", "/no-head", None), ("GET", "/no-head", "bytes=0-99")],
+        )
+
+    def test_redirect(self):
+        self.assertEqual(self.check("/redirect"), 200)
+
+    def test_conditional_request(self):
+        url = f"{self.base_url}/etag"
+
+        status = self.checker.check_urls([url])[url]
+        self.assertEqual(status["status_code"], 200)
+        self.assertEqual(status["etag"], '"abc"')
+
+        status = self.checker.check_urls(
+            [url], headers={url: {"If-None-Match": status["etag"]}}
+        )[url]
+        self.assertEqual(status["status_code"], 304)
+        self.assertEqual(self.requests[-1], ("HEAD", "/etag", None))
+
+    def test_retries(self):
+        self.assertEqual(self.check("/unavailable"), 420)
+        self.assertEqual(
+            [path for method, path, _ in self.requests if method == "HEAD"],
+            ["/unavailable"] * 4,
+        )
+
+    def test_connection_error(self):
+        checker = AsyncLinkChecker(retries=0)
+        url = "http://127.0.0.1:1/"
+
+        self.assertEqual(checker.check_urls([url])[url]["status_code"], 420)
+
+    def test_special_schemes(self):
+        urls = ["mailto:info@example.com", "tel:0123456789", "geo:52.1,5.1"]
+
+        statuses = self.checker.check_urls(urls)
+
+        self.assertEqual(
+            {url: status["status_code"] for url, status in statuses.items()},
+            {
+                "mailto:info@example.com": 200,
+                "tel:0123456789": 200,
+                "geo:52.1,5.1": 420,
+            },
+        )
+        self.assertEqual(self.requests, [])
+
+    def test_concurrency_per_host(self):
+        checker = AsyncLinkChecker(concurrency=10, concurrency_per_host=2)
+        urls = [f"{self.base_url}/slow?page={page}" for page in range(20)]
+
+        statuses = checker.check_urls(urls)
+
+        self.assertEqual({status["status_code"] for status in statuses.values()}, {200})
+        self.assertEqual(self.in_flight["max"], 2)
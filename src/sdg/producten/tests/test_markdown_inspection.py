@@ -0,0 +1,85 @@
+from html.parser import HTMLParser
+
+from django.core.exceptions import ValidationError
+from django.test import SimpleTestCase
+
+import markdown
+from bs4 import BeautifulSoup
+
+from ..markdown_inspection import inspect_markdown
+from ..models.validators import validate_markdown
+
+SAMPLES = [
+    "",
+    "Plain text.",
+    "Dummy text with a <a href='https://example.com/specifieke_tekst'>valid url</a>.",
+    '[a **b** &amp; c](https://example.com/?a=1&b=2 "Title")  \n<https://example.com/>',
+    "# Kop 1\n\n## Kop 2\n\n---\n\n![image](image.png)\n\n`code & <x>`\n\n    code",
+    '<div>\n<a href="https://example.com/block">in block</a>\n</div>\n\ntext',
+    "<a href=https://example.com/>unclosed\n\nnext paragraph",
+    "&copy; &foo; &#169; a & b <b>bold</b> \\* [x](y) <!-- comment --> <hr/>",
+    "* one [l](https://example.com/l)\n* two\n\n1. a\n2. b\n\n> [q](https://q.nl)",
+    "[reference][1]\n\n[1]: https://example.com/reference 'Title'",
+    "<p>raw <a href='https://a.nl'>a <b>b</b></a></p>\n\n<a href=\"https://c.nl\">c</a>",
+    "text <a href='https://a.nl'>x<a href='https://b.nl'>y</a>z</a> end",
+    "<a>no href</a> <a href>empty href</a> <a href='https://e.nl'/>",
+]
+
+
+class TagParser(HTMLParser):
+    def __init__(self):
+        super().__init__()
+        self.tags = []
+
+    def handle_starttag(self, tag, attrs):
+        self.tags.append(tag)
+
+
+class InspectMarkdownTests(SimpleTestCase):
+    def test_links_are_the_same_as_the_links_in_the_html(self):
+        for value in SAMPLES:
+            with self.subTest(value=value):
+                soup = BeautifulSoup(markdown.markdown(value), "html.parser")
+                expected = [
+                    (link.get("href", ""), link.get_text())
+                    for link in soup.find_all("a")
+                ]
+
+                links = inspect_markdown(value).links
+
+                self.assertEqual([(link.href, link.label) for link in links], expected)
+
+    def test_tags_are_the_same_as_the_tags_in_the_html(self):
+        for value in SAMPLES:
+            with self.subTest(value=value):
+                parser = TagParser()
+                parser.feed(markdown.markdown(value))
+
+                self.assertEqual(inspect_markdown(value).tags, parser.tags)
+
+    def test_links(self):
+        links = inspect_markdown(
+            "[Website](https://example.com) and <a href='https://example.nl'>"
+            "an *other* website</a>."
+        ).links
+
+        self.assertEqual(
+            [(link.href, link.label) for link in links],
+            [
+                ("https://example.com", "Website"),
+                ("https://example.nl", "an other website"),
+            ],
+        )
+
+    def test_validate_markdown(self):
+        validate_markdown("### Kop 3\n\n* [link](https://example.com)")
+
+        for value, message in [
+            ("# Kop", "Kop 1"),
+            ("Text\n\n---", "Horizontale lijn"),
+            ("<img src='image.png'>", "Afbeelding"),
+            ("# Kop\n\n`code`", "Code"),
+        ]:
+            with self.subTest(value=value):
+                with self.assertRaisesMessage(ValidationError, message):
+                    validate_markdown(value)
@@ -4,8 +4,9 @@ from django.test import TestCase
 
 from freezegun import freeze_time
 
-from sdg.core.constants import GenericProductStatus
+from sdg.core.constants import GenericProductStatus, TaalChoices
 from sdg.core.tests.factories.logius import UniformeProductnaamFactory
+from sdg.producten.models import LocalizedProduct, Product
 from sdg.producten.tests.constants import FUTURE_DATE, NOW_DATE
 from sdg.producten.tests.factories.localized import (
     LocalizedGeneriekProductFactory,
@@ -265,6 +266,90 @@ class ProductTests(TestCase):
         self.assertEqual(p2.product.active_version, p2)
         self.assertEqual(p3.product.active_version, p3)
 
+    @freeze_time(NOW_DATE)
+    def test_versions_are_prefetched_in_a_single_query(self):
+        versions = SpecifiekProductVersieFactory.create_batch(
+            3, publicatie_datum=NOW_DATE
+        )
+        future_versions = [
+            ProductVersieFactory.create(
+                product=version.product,
+                versie=version.versie + 1,
+                publicatie_datum=FUTURE_DATE,
+            )
+            for version in versions
+        ]
+        queryset = Product.objects.filter(
+            pk__in=[version.product_id for version in versions]
+        ).order_by("pk")
+
+        # The products, their versions and the translations of the versions.
+        with self.assertNumQueries(3):
+            products = list(queryset.active())
+            self.assertEqual([product.active_version for product in products], versions)
+
+        # The translations of the generic products are prefetched as well.
+        with self.assertNumQueries(6):
+            products = list(queryset.most_recent())
+            self.assertEqual(
+                [product.most_recent_version for product in products],
+                future_versions,
+            )
+
+
+class ProductSearchTests(TestCase):
+    def setUp(self):
+        super().setUp()
+
+        self.product_versie = ReferentieProductVersieFactory.create()
+        self.nl = LocalizedReferentieProductFactory.create(
+            product_versie=self.product_versie,
+            taal=TaalChoices.nl,
+            product_titel_decentraal="Parkeervergunning",
+            vereisten="U heeft een auto die op uw naam staat.",
+        )
+        self.en = LocalizedReferentieProductFactory.create(
+            product_versie=self.product_versie,
+            taal=TaalChoices.en,
+            product_titel_decentraal="Parking permit",
+            vereisten="You own a motorcycle that is registered in your name.",
+        )
+        LocalizedReferentieProductFactory.create_batch(2)
+
+    def test_search_uses_the_language_of_the_translation(self):
+        # Both are stemmed with the configuration of their language.
+        self.assertQuerySetEqual(LocalizedProduct.objects.search("auto"), [self.nl])
+        self.assertQuerySetEqual(
+            LocalizedProduct.objects.search("motorcycles"), [self.en]
+        )
+
+    def test_search_in_a_single_language(self):
+        self.assertQuerySetEqual(
+            LocalizedProduct.objects.search("parkeervergunning", taal="en"), []
+        )
+        self.assertQuerySetEqual(
+            LocalizedProduct.objects.search("parkeervergunning", taal="nl"),
+            [self.nl],
+        )
+
+    def test_search_products(self):
+        self.assertQuerySetEqual(
+            Product.objects.search('"parking permit"'), [self.product_versie.product]
+        )
+        self.assertQuerySetEqual(
+            Product.objects.search('"parking permit" -motorcycle'), []
+        )
+
+    def test_search_vector_is_updated_on_bulk_updates(self):
+        LocalizedProduct.objects.filter(pk=self.nl.pk).update(
+            vereisten="U heeft een paspoort nodig."
+        )
+
+        self.assertQuerySetEqual(LocalizedProduct.objects.search("auto"), [])
+        self.assertQuerySetEqual(
+            LocalizedProduct.objects.search("paspoorten"), [self.nl]
+        )
+
 
 class LocalizedProductTests(TestCase):
     def setUp(self):
@@ -3,6 +3,8 @@ from datetime import datetime
 
 from django.core.management import BaseCommand
 
+from sdg.api.cache import bump_response_cache_generation
+from sdg.core.metrics import MeasuredCommandMixin
 from sdg.core.models import Overheidsorganisatie
 from sdg.producten.models import LocalizedGeneriekProduct
 from sdg.services.models import ServiceConfiguration
@@ -10,7 +12,7 @@ from sdg.services.models import ServiceConfiguration
 logger = logging.getLogger(__name__)
 
 
-class Command(BaseCommand):
+class Command(MeasuredCommandMixin, BaseCommand):
     help = "Retrieve all configured APIs and fill generic products."
 
     def handle(self, **options):
@@ -101,6 +103,9 @@ class Command(BaseCommand):
                         org_obj, through_defaults={"rol": org["rol"]}
                     )
 
+        # The texts are (partly) updated in bulk, without sending any signals.
+        bump_response_cache_generation()
+
         self.stdout.write(
             self.style.SUCCESS("Successfully updated localized generic products.")
         )
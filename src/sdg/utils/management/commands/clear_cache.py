@@ -2,8 +2,10 @@ from django.core.cache import DEFAULT_CACHE_ALIAS, caches
 from django.core.management import BaseCommand
 from django.utils.translation import gettext as _
 
+from sdg.core.metrics import MeasuredCommandMixin
 
-class Command(BaseCommand):
+
+class Command(MeasuredCommandMixin, BaseCommand):
     help = "Clears the Django cache"
 
     def add_arguments(self, parser):